@@ -0,0 +1,171 @@
+"""Run a headless simulation: ``python -m project --rows 3 --cols 4 --animals 3 --days 10``."""
+import argparse
+import json
+import sys
+
+from project.core.carcass_store import CarcassStore
+from project.events.ring_buffer_event_sink import RingBufferEventSink
+from project.events.simulation_event import format_event
+from project.profiling.tick_profiler import TickProfiler
+from project.terrain import Terrain
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m project', description='Run a terrain simulation.')
+    parser.add_argument('--rows', type=int, default=3, help='terrain rows (Terrain x)')
+    parser.add_argument('--cols', type=int, default=4, help='terrain columns (Terrain y)')
+    parser.add_argument('--animals', type=int, default=3, help='number of animals to spawn')
+    parser.add_argument('--days', type=int, default=1, help='number of days to simulate')
+    parser.add_argument('--seed', type=int, default=None, help='seed for a reproducible run')
+    parser.add_argument('--grid', action='store_true', help='store the terrain as a NumPy grid')
+    parser.add_argument('--terrain-file', metavar='PATH',
+                        help='keep the map in a memory-mapped .npy file, generated on first use')
+    parser.add_argument('--terrain-generator', choices=('uniform', 'biomes'), default=None,
+                        help='build the map with NumPy: uniform cells, or contiguous biomes from smooth noise')
+    parser.add_argument('--terrain-weights', type=int, nargs=4, metavar=('WATER', 'DESERT', 'MOUNTAIN', 'GRASS'),
+                        help='draw cells independently with these whole-number weights')
+    parser.add_argument('--chunked', action='store_true',
+                        help='generate the map in chunks as animals reach them, so it can be huge')
+    parser.add_argument('--chunk-size', type=int, default=256, help='chunk side in cells (with --chunked)')
+    parser.add_argument('--chunk-memory', type=int, default=64, metavar='MIB',
+                        help='MiB of chunks kept before empty ones are dropped (with --chunked)')
+    parser.add_argument('--spawn-area', type=int, nargs=4, metavar=('ROW', 'COL', 'ROWS', 'COLS'),
+                        help='spawn animals only inside this rectangle')
+    parser.add_argument('--drown-on-spawn', action='store_true',
+                        help='spawn on any cell, water included, where the animal dies at once')
+    parser.add_argument('--flyweight-cells', action='store_true',
+                        help='share one immutable cell object per terrain type across the map')
+    parser.add_argument('--carcass-ttl', type=int, default=None, help='days a carcass lasts before it decomposes')
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+    parser.add_argument('--verbose', action='store_true',
+                        help='print every simulation event (deaths, border bumps) to stderr')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each phase of every tick and print a summary table to stderr')
+    parser.add_argument('--checkpoint', metavar='PATH', help='save a checkpoint here after the run')
+    parser.add_argument('--checkpoint-every', type=int, default=None, metavar='N',
+                        help='also save the checkpoint every N days')
+    parser.add_argument('--history', metavar='PATH',
+                        help='append per-day counts to this history file (read it with project.history.history_file)')
+    parser.add_argument('--history-snapshot-every', type=int, default=None, metavar='K',
+                        help='also store every animal position in the history every K days')
+    parser.add_argument('--resume', metavar='PATH',
+                        help='continue from a checkpoint for --days more days (map and animal options are ignored)')
+    return parser.parse_args(argv)
+
+
+def count_animals(terrain):
+    stats = terrain.stats()
+    return {animal_type: {'alive': stats['alive'][animal_type], 'dead': stats['dead'][animal_type],
+                          'eaten': stats['eaten'][animal_type]}
+            for animal_type in Terrain.animal_types.values()}
+
+
+def write_events(event_sink, stderr):
+    for event in event_sink.drain():
+        stderr.write(f'[day {event.day}] {format_event(event)}\n')
+
+
+def make_terrain_generator(args):
+    if args.terrain_weights is not None:
+        from project.generation.weighted_generator import WeightedGenerator
+
+        return WeightedGenerator(args.terrain_weights)
+    if args.terrain_generator == 'uniform':
+        from project.generation.uniform_generator import UniformGenerator
+
+        return UniformGenerator()
+    if args.terrain_generator == 'biomes':
+        from project.generation.biome_generator import BiomeGenerator
+
+        return BiomeGenerator()
+    return None
+
+
+def run(args, stderr):
+    event_sink = RingBufferEventSink() if args.verbose else None
+    profiler = TickProfiler() if args.profile else None
+    if args.checkpoint or args.resume:
+        # Checkpoints need NumPy; plain runs should not import it.
+        from project.checkpoint.checkpoint import Checkpoint, save_checkpoint
+
+    if args.resume:
+        terrain = Checkpoint.read(args.resume).to_terrain(event_sink=event_sink, profiler=profiler)
+    else:
+        terrain = Terrain(args.rows, args.cols, args.animals, event_sink=event_sink,
+                          carcass_store=CarcassStore(ttl=args.carcass_ttl), seed=args.seed, profiler=profiler,
+                          flyweight_cells=args.flyweight_cells)
+        if args.chunked:
+            terrain.create_terrain_chunked(make_terrain_generator(args), args.chunk_size, args.chunk_memory << 20)
+        else:
+            terrain.create_terrain(grid_mode=args.grid, terrain_file=args.terrain_file,
+                                   generator=make_terrain_generator(args))
+        terrain.fill_with_animals(area=args.spawn_area, drown_on_spawn=args.drown_on_spawn)
+
+    history = None
+    if args.history:
+        from project.history.history_recorder import HistoryRecorder
+
+        history = HistoryRecorder(args.history, snapshot_every=args.history_snapshot_every)
+        terrain.history_recorder = history
+
+    days = []
+    try:
+        # Only days that were simulated are reported: run() stops on the call that finds nobody alive.
+        for summary in terrain.run(args.days):
+            days.append({'day': summary.day, 'animals': count_animals(terrain)})
+
+            if args.checkpoint and args.checkpoint_every and summary.day % args.checkpoint_every == 0:
+                save_checkpoint(args.checkpoint, terrain)
+
+            if event_sink is not None:
+                write_events(event_sink, stderr)
+        if event_sink is not None:
+            write_events(event_sink, stderr)
+    finally:
+        # Also on an error or Ctrl-C, so the days buffered so far still reach the file.
+        if history is not None:
+            history.close()
+    if args.checkpoint:
+        save_checkpoint(args.checkpoint, terrain)
+
+    if profiler is not None:
+        stderr.write(profiler.summary_table() + '\n')
+
+    return {
+        'rows': terrain.x,
+        'cols': terrain.y,
+        'animals_count': terrain.animals_count,
+        'seed': args.seed,
+        'days_run': len(days),
+        'all_animals_dead': terrain.all_animals_dead,
+        'days': days,
+    }
+
+
+def format_text(result):
+    lines = [f"Terrain {result['rows']}x{result['cols']} with {result['animals_count']} animals"]
+    for day in result['days']:
+        counts = ', '.join(f"{animal_type} {status['alive']} alive/{status['dead']} dead/{status['eaten']} eaten"
+                           for animal_type, status in day['animals'].items())
+        lines.append(f"Day {day['day']}: {counts}")
+    if result['all_animals_dead']:
+        lines.append('There are no alive animals in the terrain.')
+    return '\n'.join(lines)
+
+
+def main(argv=None, stdout=None, stderr=None):
+    args = parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+
+    result = run(args, stderr)
+
+    if args.format == 'json':
+        stdout.write(json.dumps(result) + '\n')
+    else:
+        stdout.write(format_text(result) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+class Animal:
+    """State shared by every species.
+
+    Species identity lives on the subclass, and status, ``is_eaten`` and
+    ``has_eaten`` are packed as bits of one small int, so an animal is just
+    two slots.
+    """
+
+    __slots__ = ('hunger_rate', '_flags')
+
+    animal_type = None
+
+    DEAD = 1
+    EATEN = 2
+    HAS_EATEN = 4
+
+    def __init__(self):
+        self.hunger_rate = 10
+        self._flags = 0
+
+    @property
+    def status(self):
+        return 'dead' if self._flags & Animal.DEAD else 'alive'
+
+    @status.setter
+    def status(self, status):
+        if status == 'dead':
+            self._flags |= Animal.DEAD
+        elif status == 'alive':
+            self._flags &= ~Animal.DEAD
+        else:
+            raise ValueError(f'Unknown animal status {status!r}')
+
+    @property
+    def is_eaten(self):
+        return bool(self._flags & Animal.EATEN)
+
+    @is_eaten.setter
+    def is_eaten(self, is_eaten):
+        if is_eaten:
+            self._flags |= Animal.EATEN
+        else:
+            self._flags &= ~Animal.EATEN
+
+    @property
+    def has_eaten(self):
+        return bool(self._flags & Animal.HAS_EATEN)
+
+    @has_eaten.setter
+    def has_eaten(self, has_eaten):
+        if has_eaten:
+            self._flags |= Animal.HAS_EATEN
+        else:
+            self._flags &= ~Animal.HAS_EATEN
+
+    def animal_status(self):
+        return self.status
@@ -1,14 +1,8 @@
-class Scavenger:
+from project.animal.animal import Animal
 
-    def __init__(self):
-        self.animal_type = 'Scavenger'
-        # self.food_type = 'dead animals'
-        self.hunger_rate = 10
-        self.status = 'alive'
-        self.has_moved = False
-        self.has_eaten = False
-        self.is_eaten = False
 
-    def animal_status(self):
-        return self.status
+class Scavenger(Animal):
+    __slots__ = ()
 
+    animal_type = 'Scavenger'
+    # food_type = 'dead animals'
@@ -0,0 +1,83 @@
+"""Benchmark terrain creation, fill and ticks: ``python -m project.benchmark --quick --save baseline.json``.
+
+Run again with ``--baseline baseline.json`` after a change to compare against it.
+"""
+import argparse
+import json
+import sys
+
+from project.benchmark.benchmark_case import benchmark_cases, engines, species_mixes
+from project.benchmark.benchmark_report import compare_results, format_table, load_results, save_results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m project.benchmark',
+                                     description='Benchmark terrain creation, population fill and ticks.')
+    parser.add_argument('--sides', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help='map sides to run (square maps)')
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.01, 0.1, 1.0],
+                        help='animals per cell')
+    parser.add_argument('--mixes', choices=sorted(species_mixes), nargs='+',
+                        default=['balanced', 'herbivores', 'carnivores'], help='species mixes')
+    parser.add_argument('--engines', choices=engines, nargs='+', default=list(engines), help='tick engines')
+    parser.add_argument('--quick', action='store_true', help='small matrix: sides 10 and 100, balanced mix only')
+    parser.add_argument('--ticks', type=int, default=3, help='ticks timed per case')
+    parser.add_argument('--seed', type=int, default=0, help='seed of every case')
+    parser.add_argument('--max-animals', type=int, default=1_000_000, help='skip cases with more animals')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak memory run')
+    parser.add_argument('--load', metavar='PATH', help='report saved results instead of running the benchmark')
+    parser.add_argument('--save', metavar='PATH', help='save the results as a baseline file')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against a saved baseline file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative growth in tick time or peak memory that counts as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit with status 1 on any regression')
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.sides = [10, 100]
+        args.mixes = ['balanced']
+    return args
+
+
+def run(args, stderr):
+    cases = benchmark_cases(args.sides, args.densities, args.mixes, args.engines, args.seed)
+    results = []
+
+    for case in cases:
+        if case.animals_count > args.max_animals:
+            stderr.write(f'skipping {case.name}: {case.animals_count} animals is over --max-animals\n')
+            continue
+
+        stderr.write(f'running {case.name}\n')
+        results.append(case.run(args.ticks, measure_memory=not args.no_memory))
+
+    return results
+
+
+def main(argv=None, stdout=None, stderr=None):
+    args = parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+
+    results = load_results(args.load) if args.load else run(args, stderr)
+
+    if args.save:
+        save_results(args.save, results)
+
+    comparison = None
+    if args.baseline:
+        comparison = compare_results(load_results(args.baseline), results, args.threshold)
+
+    if args.format == 'json':
+        stdout.write(json.dumps({'results': results, 'comparison': comparison}) + '\n')
+    else:
+        stdout.write(format_table(results, comparison) + '\n')
+
+    if args.fail_on_regression and comparison and any(row['regression'] for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
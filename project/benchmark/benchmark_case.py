@@ -0,0 +1,145 @@
+import gc
+import time
+import tracemalloc
+
+from project.terrain import Terrain
+
+# Weights per animal type, in Terrain.animal_types order (Carnivore, Herbivore, Scavenger).
+species_mixes = {
+    'balanced': (1, 1, 1),
+    'herbivores': (1, 6, 1),
+    'carnivores': (6, 1, 1),
+    'scavengers': (1, 1, 6),
+}
+
+engines = ('objects', 'vectorized')
+
+
+class BenchmarkCase:
+    """One point of the benchmark matrix: engine, square map side, animals per cell and species mix.
+
+    ``run`` times ``create_terrain``, ``fill_with_animals`` and a few
+    ``activate_animals`` ticks (or the columnar equivalents for the
+    vectorized engine). Every animal starts the measured ticks with
+    ``start_hunger`` so that it feeds or moves instead of just digesting.
+    Peak memory is measured with tracemalloc in a second, identical run, so
+    that tracing does not slow down the timed one.
+    """
+
+    # Bigger object-engine maps are stored as a TerrainGrid; a million cell objects outweighs the ticks.
+    max_object_map_cells = 250_000
+
+    def __init__(self, engine, side, density, mix, seed=0):
+        if engine not in engines:
+            raise ValueError(f'unknown engine {engine!r}')
+        if mix not in species_mixes:
+            raise ValueError(f'unknown species mix {mix!r}')
+
+        self.engine = engine
+        self.side = side
+        self.density = density
+        self.mix = mix
+        self.seed = seed
+        self.animals_count = max(1, round(side * side * density))
+
+    @property
+    def name(self):
+        return f'{self.engine}-{self.side}x{self.side}-d{self.density:g}-{self.mix}'
+
+    @property
+    def grid_mode(self):
+        return self.engine == 'vectorized' or self.side * self.side > self.max_object_map_cells
+
+    def run(self, ticks=3, start_hunger=4, measure_memory=True):
+        create_seconds, fill_seconds, tick_seconds, processed = self._measure(ticks, start_hunger)
+
+        peak_bytes = None
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                self._measure(ticks, start_hunger)
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        total_tick_seconds = sum(tick_seconds)
+        return {
+            'name': self.name,
+            'engine': self.engine,
+            'side': self.side,
+            'density': self.density,
+            'mix': self.mix,
+            'animals': self.animals_count,
+            'grid_mode': self.grid_mode,
+            'ticks': ticks,
+            'create_seconds': create_seconds,
+            'fill_seconds': fill_seconds,
+            'tick_seconds': total_tick_seconds / ticks if ticks else 0.0,
+            'animals_per_second': sum(processed) / total_tick_seconds if total_tick_seconds else 0.0,
+            'peak_bytes': peak_bytes,
+        }
+
+    def _measure(self, ticks, start_hunger):
+        gc.collect()
+        if self.engine == 'objects':
+            return self._measure_objects(ticks, start_hunger)
+        return self._measure_vectorized(ticks, start_hunger)
+
+    def _measure_objects(self, ticks, start_hunger):
+        terrain = Terrain(self.side, self.side, self.animals_count, seed=self.seed)
+
+        start = time.perf_counter()
+        terrain.create_terrain(grid_mode=self.grid_mode)
+        create_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        terrain.fill_with_animals(species_weights=species_mixes[self.mix])
+        fill_seconds = time.perf_counter() - start
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = start_hunger
+
+        tick_seconds = []
+        processed = []
+        for _ in range(ticks):
+            processed.append(terrain.counters.alive_total)
+            start = time.perf_counter()
+            terrain.activate_animals()
+            tick_seconds.append(time.perf_counter() - start)
+
+        return create_seconds, fill_seconds, tick_seconds, processed
+
+    def _measure_vectorized(self, ticks, start_hunger):
+        from project.columnar.columnar_population import ColumnarPopulation
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+        from project.core.simulation_random import SimulationRandom
+        from project.grid.terrain_grid import TerrainGrid
+
+        rng = SimulationRandom(self.seed)
+
+        start = time.perf_counter()
+        grid = TerrainGrid.random(self.side, self.side, rng)
+        create_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        population = ColumnarPopulation.random(self.side, self.side, self.animals_count, grid, rng,
+                                               species_weights=species_mixes[self.mix])
+        fill_seconds = time.perf_counter() - start
+
+        population.hunger[population.status == ColumnarPopulation.ALIVE] = start_hunger
+        engine = VectorizedTickEngine(population, grid, rng)
+
+        tick_seconds = []
+        processed = []
+        for _ in range(ticks):
+            processed.append(int(engine.alive_counts.sum()))
+            start = time.perf_counter()
+            engine.tick()
+            tick_seconds.append(time.perf_counter() - start)
+
+        return create_seconds, fill_seconds, tick_seconds, processed
+
+
+def benchmark_cases(sides, densities, mixes, engine_names=engines, seed=0):
+    return [BenchmarkCase(engine, side, density, mix, seed)
+            for engine in engine_names for side in sides for density in densities for mix in mixes]
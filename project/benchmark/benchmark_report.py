@@ -0,0 +1,84 @@
+import json
+import platform
+
+format_version = 1
+
+
+def save_results(path, results):
+    document = {
+        'version': format_version,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=2)
+        file.write('\n')
+
+
+def load_results(path):
+    with open(path) as file:
+        document = json.load(file)
+    if document.get('version') != format_version:
+        raise ValueError(f'{path}: unsupported benchmark file version {document.get("version")!r}')
+    return document['results']
+
+
+def _ratio(new, old):
+    if new is None or not old:
+        return None
+    return new / old
+
+
+def compare_results(baseline, results, threshold=0.1):
+    """Match cases by name; a case regresses when its tick time or peak memory grew by more than ``threshold``."""
+    baseline_by_name = {result['name']: result for result in baseline}
+    rows = []
+
+    for result in results:
+        old = baseline_by_name.get(result['name'])
+        if old is None:
+            continue
+
+        tick_ratio = _ratio(result['tick_seconds'], old['tick_seconds'])
+        peak_ratio = _ratio(result['peak_bytes'], old['peak_bytes'])
+        regression = any(ratio is not None and ratio > 1 + threshold for ratio in (tick_ratio, peak_ratio))
+        rows.append({'name': result['name'], 'tick_ratio': tick_ratio, 'peak_ratio': peak_ratio,
+                     'regression': regression})
+
+    return rows
+
+
+def _format_ratio(ratio):
+    return '-' if ratio is None else f'{ratio:.2f}x'
+
+
+def format_table(results, comparison=None):
+    comparison_by_name = {row['name']: row for row in comparison or ()}
+    header = ['case', 'animals', 'create ms', 'fill ms', 'tick ms', 'animals/s', 'peak MiB']
+    if comparison is not None:
+        header += ['tick vs base', 'peak vs base', '']
+
+    lines = [header]
+    for result in results:
+        peak = result['peak_bytes']
+        line = [
+            result['name'],
+            str(result['animals']),
+            f"{result['create_seconds'] * 1000:.2f}",
+            f"{result['fill_seconds'] * 1000:.2f}",
+            f"{result['tick_seconds'] * 1000:.2f}",
+            f"{result['animals_per_second']:,.0f}",
+            '-' if peak is None else f'{peak / 2 ** 20:.1f}',
+        ]
+        if comparison is not None:
+            row = comparison_by_name.get(result['name'])
+            if row is None:
+                line += ['new', '-', '']
+            else:
+                line += [_format_ratio(row['tick_ratio']), _format_ratio(row['peak_ratio']),
+                         'REGRESSION' if row['regression'] else '']
+        lines.append(line)
+
+    widths = [max(len(line[column]) for line in lines) for column in range(len(header))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines)
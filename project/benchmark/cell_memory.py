@@ -0,0 +1,79 @@
+"""Memory of an object terrain map, per-cell instances vs flyweights: ``python -m project.benchmark.cell_memory``.
+
+Each mode is built in a fresh interpreter and measured as the growth of its
+resident set, so one mode's freed memory never hides the other's.
+"""
+import argparse
+import gc
+import json
+import subprocess
+import sys
+
+from project.terrain import Terrain
+
+modes = ('instances', 'flyweight')
+
+
+def resident_bytes():
+    try:
+        with open('/proc/self/statm') as statm:
+            import os
+
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+
+        # Peak rather than current, but the map is the last thing built.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_map(side, mode):
+    """Build a ``side`` x ``side`` object map in this process; return the memory it holds on to."""
+    gc.collect()
+    before = resident_bytes()
+
+    terrain = Terrain(side, side, 0, seed=0, flyweight_cells=mode == 'flyweight')
+    terrain.create_terrain()
+    gc.collect()
+
+    retained = resident_bytes() - before
+    assert terrain.terrain_map[side - 1][side - 1].cell_type in Terrain.terrain_cell_types.values()
+    return {'side': side, 'mode': mode, 'bytes': retained, 'bytes_per_cell': retained / (side * side)}
+
+
+def measure_in_subprocess(side, mode):
+    completed = subprocess.run([sys.executable, '-m', 'project.benchmark.cell_memory', '--side', str(side),
+                                '--single', mode], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def main(argv=None, stdout=None):
+    parser = argparse.ArgumentParser(prog='python -m project.benchmark.cell_memory',
+                                     description='Memory of an object terrain map with and without flyweight cells.')
+    parser.add_argument('--side', type=int, default=5000, help='map side (the map is side x side)')
+    parser.add_argument('--single', choices=modes, help=argparse.SUPPRESS)
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+    args = parser.parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+
+    if args.single:
+        stdout.write(json.dumps(measure_map(args.side, args.single)) + '\n')
+        return 0
+
+    results = [measure_in_subprocess(args.side, mode) for mode in modes]
+    if args.format == 'json':
+        stdout.write(json.dumps(results) + '\n')
+        return 0
+
+    stdout.write(f'{args.side}x{args.side} object terrain map\n')
+    for result in results:
+        stdout.write(f"{result['mode']:<10} {result['bytes'] / 2 ** 20:10.1f} MiB  "
+                     f"{result['bytes_per_cell']:6.1f} bytes/cell\n")
+    if results[1]['bytes'] > 0:
+        stdout.write(f"flyweight cells use {results[0]['bytes'] / results[1]['bytes']:.1f}x less memory\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
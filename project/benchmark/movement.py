@@ -0,0 +1,138 @@
+"""Resolving movement steps, direction branches vs the move table: ``python -m project.benchmark.movement``."""
+import argparse
+import gc
+import json
+import sys
+from time import perf_counter
+
+from project.core.move_table import MoveTable
+from project.core.simulation_random import SimulationRandom
+from project.terrain import Terrain
+
+
+def resolve_with_branches(terrain, rows, cols, directions):
+    """The movement phase as it was before the move table: a branch per direction, checked cell by cell."""
+    moves = drowned = 0
+    for row, col, direction in zip(rows, cols, directions):
+        direction = Terrain.directions[direction]
+        if direction == 'up':
+            if row - 1 < 0:
+                continue
+            new_location = (row - 1, col)
+            if terrain.cell_type_at(row - 1, col) == 'WATER':
+                drowned += 1
+        elif direction == 'down':
+            if row + 1 >= terrain.x:
+                continue
+            new_location = (row + 1, col)
+            if terrain.cell_type_at(row + 1, col) == 'WATER':
+                drowned += 1
+        elif direction == 'left':
+            if col - 1 < 0:
+                continue
+            new_location = (row, col - 1)
+            if terrain.cell_type_at(row, col - 1) == 'WATER':
+                drowned += 1
+        else:
+            if col + 1 >= terrain.y:
+                continue
+            new_location = (row, col + 1)
+            if terrain.cell_type_at(row, col + 1) == 'WATER':
+                drowned += 1
+        moves += 1
+    return moves, drowned
+
+
+def resolve_with_table(terrain, rows, cols, directions):
+    """One lookup per step, as in ``Terrain.activate_animals``."""
+    move_flags = terrain.move_table.flags_at
+    blocked, drowns = MoveTable.BLOCKED, MoveTable.DROWNS
+    row_steps, col_steps = MoveTable.row_steps, MoveTable.col_steps
+    moves = drowned = 0
+    for row, col, direction in zip(rows, cols, directions):
+        flags = move_flags(row, col)
+        if flags & blocked[direction]:
+            continue
+        new_location = (row + row_steps[direction], col + col_steps[direction])
+        if flags & drowns[direction]:
+            drowned += 1
+        moves += 1
+    return moves, drowned
+
+
+def resolve_gathered(terrain, rows, cols, directions):
+    """One gather over every step at once, as in ``VectorizedTickEngine``."""
+    import numpy as np
+
+    flags = np.frombuffer(terrain.move_table.flags, dtype=np.uint8)[rows * terrain.y + cols]
+    inside = (flags & np.array(MoveTable.BLOCKED, dtype=np.uint8)[directions]) == 0
+    drowned = (flags[inside] & np.array(MoveTable.DROWNS, dtype=np.uint8)[directions[inside]]) != 0
+    return int(inside.sum()), int(drowned.sum())
+
+
+methods = {
+    'branches': resolve_with_branches,
+    'move table': resolve_with_table,
+    'move table, gathered': resolve_gathered,
+}
+
+# What the speed-up column is measured against.
+baseline_method = 'branches'
+
+
+def time_method(terrain, steps, method, repeats=1):
+    """Best of ``repeats`` passes over the same steps, in seconds, and the outcome counts."""
+    rows, cols, directions = steps
+    if method == 'move table, gathered':
+        import numpy as np
+
+        rows, cols, directions = (np.array(column, dtype=np.int64) for column in steps)
+    best = None
+    for _ in range(repeats):
+        gc.collect()
+        start = perf_counter()
+        moves, drowned = methods[method](terrain, rows, cols, directions)
+        seconds = perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return {'method': method, 'steps': len(steps[0]), 'moves': moves, 'drowned': drowned, 'seconds': best,
+            'ns_per_step': best * 1e9 / len(steps[0])}
+
+
+def main(argv=None, stdout=None):
+    parser = argparse.ArgumentParser(prog='python -m project.benchmark.movement',
+                                     description='Time resolving the steps of the movement phase.')
+    parser.add_argument('--side', type=int, default=1000, help='map side (the map is side x side)')
+    parser.add_argument('--steps', type=int, default=500_000, help='random steps resolved per pass')
+    parser.add_argument('--grid', action='store_true', help='store the map as a NumPy grid')
+    parser.add_argument('--methods', nargs='+', choices=tuple(methods), default=tuple(methods),
+                        help='what to time')
+    parser.add_argument('--repeats', type=int, default=3, help='passes per method; the fastest counts')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the map and the steps')
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+    args = parser.parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+
+    terrain = Terrain(args.side, args.side, 0, seed=args.seed, flyweight_cells=True)
+    terrain.create_terrain(grid_mode=args.grid)
+    terrain.move_table = terrain.build_move_table()
+    rng = SimulationRandom(args.seed)
+    steps = (rng.integers(args.side, args.steps), rng.integers(args.side, args.steps),
+             [direction + 1 for direction in rng.integers(4, args.steps)])
+
+    results = [time_method(terrain, steps, method, args.repeats) for method in args.methods]
+    if args.format == 'json':
+        stdout.write(json.dumps(results) + '\n')
+        return 0
+
+    baseline = next((result['seconds'] for result in results if result['method'] == baseline_method), None)
+    stdout.write(f"{args.side}x{args.side} {'grid' if args.grid else 'object'} map, {args.steps} steps, "
+                 f"best of {args.repeats}{'' if baseline is None else f', speed-up over {baseline_method}'}\n")
+    for result in results:
+        speed_up = '' if baseline is None else f"  {baseline / result['seconds']:6.1f}x"
+        stdout.write(f"{result['method']:<22} {result['seconds'] * 1000:9.1f} ms  {result['ns_per_step']:7.1f} ns/step"
+                     f"{speed_up}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Map generation time, the per-cell object loop vs the bulk generators: ``python -m project.benchmark.terrain_generation``."""
+import argparse
+import gc
+import json
+import sys
+from time import perf_counter
+
+from project.generation.biome_generator import BiomeGenerator
+from project.generation.uniform_generator import UniformGenerator
+from project.generation.weighted_generator import WeightedGenerator
+from project.terrain import Terrain
+
+methods = {
+    'object loop': lambda terrain: terrain.create_terrain(),
+    'uniform': lambda terrain: terrain.create_terrain(grid_mode=True, generator=UniformGenerator()),
+    'weighted': lambda terrain: terrain.create_terrain(grid_mode=True, generator=WeightedGenerator((1, 2, 2, 5))),
+    'biomes': lambda terrain: terrain.create_terrain(grid_mode=True, generator=BiomeGenerator()),
+    'biomes, object map': lambda terrain: terrain.create_terrain(generator=BiomeGenerator()),
+}
+
+# What the speed-up column is measured against.
+baseline_method = 'object loop'
+
+
+def time_method(side, method, repeats=1):
+    """Best of ``repeats`` builds of a ``side`` x ``side`` map, in seconds."""
+    best = None
+    for repeat in range(repeats):
+        terrain = Terrain(side, side, 0, seed=repeat)
+        gc.collect()
+        start = perf_counter()
+        methods[method](terrain)
+        seconds = perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return {'side': side, 'method': method, 'seconds': best, 'ns_per_cell': best * 1e9 / (side * side)}
+
+
+def main(argv=None, stdout=None):
+    parser = argparse.ArgumentParser(prog='python -m project.benchmark.terrain_generation',
+                                     description='Time building a map with each terrain generator.')
+    parser.add_argument('--side', type=int, default=2000, help='map side (the map is side x side)')
+    parser.add_argument('--methods', nargs='+', choices=tuple(methods), default=tuple(methods),
+                        help='what to time')
+    parser.add_argument('--repeats', type=int, default=3, help='builds per method; the fastest counts')
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+    args = parser.parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+
+    results = [time_method(args.side, method, args.repeats) for method in args.methods]
+    if args.format == 'json':
+        stdout.write(json.dumps(results) + '\n')
+        return 0
+
+    baseline = next((result['seconds'] for result in results if result['method'] == baseline_method), None)
+    stdout.write(f'{args.side}x{args.side} map, best of {args.repeats}'
+                 f"{'' if baseline is None else f', speed-up over {baseline_method}'}\n")
+    for result in results:
+        speed_up = '' if baseline is None else f"  {baseline / result['seconds']:7.1f}x"
+        stdout.write(f"{result['method']:<20} {result['seconds'] * 1000:10.1f} ms  {result['ns_per_cell']:8.1f} ns/cell"
+                     f"{speed_up}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import base64
+import gc
+import json
+import os
+import struct
+
+import numpy as np
+
+from project.columnar.columnar_population import ColumnarPopulation
+from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+from project.core.carcass_store import CarcassStore
+from project.core.simulation_random import SimulationRandom
+from project.grid.terrain_grid import TerrainGrid
+from project.grid.terrain_map_view import TerrainMapView
+from project.terrain import Terrain
+
+
+class Checkpoint:
+    """Versioned binary snapshot of a Terrain or a VectorizedTickEngine.
+
+    File layout:
+    - the magic bytes, then the format version and header length as
+      little-endian ``uint32``;
+    - a JSON header with sizes, day, counters, carcass policy and RNG state;
+    - the arrays: the grid's cell codes and the ColumnarPopulation columns.
+
+    Each array is stored raw, little-endian, at a 64-byte aligned offset
+    listed in the header. ``read(path, mmap=True)`` maps the arrays
+    copy-on-write instead of reading them. A resumed engine can then start
+    on a huge world without rebuilding anything, and the file is never
+    written back.
+    """
+
+    magic = b'TSIMCKPT'
+    version = 1
+    alignment = 64
+    write_chunk = 1 << 24
+
+    columns = {
+        'cells': '<u1',
+        'species': '<u1',
+        'hunger': '<i2',
+        'status': '<u1',
+        'rows': '<i4',
+        'cols': '<i4',
+        'died_on': '<i4',
+    }
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.arrays = arrays
+
+    @classmethod
+    def from_terrain(cls, terrain):
+        """Snapshot a Terrain: live animals in dict order, then carcasses oldest first."""
+        grid = terrain.to_grid()
+
+        carcass_store = terrain.carcass_store
+        counters = terrain.counters
+        header = {
+            'engine': 'objects',
+            'x': terrain.x,
+            'y': terrain.y,
+            'animals_count': terrain.animals_count,
+            'day': terrain.day,
+            'all_animals_dead': terrain.all_animals_dead,
+            'grid_mode': terrain.grid is not None,
+            'flyweight_cells': terrain.terrain_cell_factory.flyweight,
+            'live_count': len(terrain.animals_locations),
+            'counters': {'alive': counters.alive, 'dead': counters.dead, 'eaten': counters.eaten,
+                         'deaths': counters.deaths},
+            'track_cell_counts': counters.track_cells,
+            'carcass_store': {'ttl': carcass_store.ttl, 'max_carcasses': carcass_store.max_carcasses,
+                              'decomposed_count': carcass_store.decomposed_count},
+            'rng': cls._rng_state(terrain.rng),
+        }
+        return cls(header, cls._population_arrays(grid, ColumnarPopulation.from_terrain(terrain)))
+
+    @classmethod
+    def from_engine(cls, engine):
+        species_codes = ColumnarPopulation.species_codes
+        header = {
+            'engine': 'vectorized',
+            'x': engine.grid.x,
+            'y': engine.grid.y,
+            'day': engine.day,
+            'all_animals_dead': engine.all_animals_dead,
+            'counters': {
+                name: {animal_type: int(counts[code]) for animal_type, code in species_codes.items()}
+                for name, counts in (('alive', engine.alive_counts), ('dead', engine.dead_counts),
+                                     ('eaten', engine.eaten_counts))
+            },
+            'carcass_store': {'ttl': engine.carcass_ttl, 'max_carcasses': engine.max_carcasses},
+            'rng': cls._rng_state(engine.rng),
+        }
+        return cls(header, cls._population_arrays(engine.grid, engine.population))
+
+    @staticmethod
+    def _rng_state(rng):
+        source_state, buffered = rng.getstate()
+        version, words, gauss_next = source_state
+        return {'seed': rng.seed, 'source': [version, list(words), gauss_next],
+                'buffered': base64.b64encode(buffered).decode('ascii')}
+
+    @staticmethod
+    def _restore_rng(state):
+        rng = SimulationRandom(state['seed'])
+        version, words, gauss_next = state['source']
+        rng.setstate(((version, tuple(words), gauss_next), base64.b64decode(state['buffered'])))
+        return rng
+
+    @classmethod
+    def _population_arrays(cls, grid, population):
+        arrays = {'cells': grid.cells}
+        for column in ('species', 'hunger', 'status', 'rows', 'cols', 'died_on'):
+            arrays[column] = getattr(population, column)
+        return arrays
+
+    def write(self, path):
+        layout = []
+        offset = 0
+        for name, dtype in self.columns.items():
+            array = self.arrays[name]
+            layout.append({'name': name, 'dtype': dtype, 'count': int(array.size), 'offset': offset})
+            offset += -(-array.size * np.dtype(dtype).itemsize // self.alignment) * self.alignment
+
+        header = dict(self.header, arrays=layout)
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        preamble_size = len(self.magic) + 8 + len(header_bytes)
+        data_start = -(-preamble_size // self.alignment) * self.alignment
+
+        # Written next to the target and renamed over it, so a crash mid-write never leaves a torn checkpoint.
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(self.magic)
+            file.write(struct.pack('<II', self.version, len(header_bytes)))
+            file.write(header_bytes)
+            file.write(bytes(data_start - preamble_size))
+            for entry in layout:
+                array = self.arrays[entry['name']].reshape(-1)
+                file.seek(data_start + entry['offset'])
+                # In slices, so a memory-mapped map bigger than RAM is streamed rather than copied whole.
+                for start in range(0, array.size, self.write_chunk):
+                    chunk = array[start:start + self.write_chunk]
+                    file.write(np.ascontiguousarray(chunk, dtype=entry['dtype']).tobytes())
+            file.truncate(data_start + offset)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def read(cls, path, mmap=False):
+        with open(path, 'rb') as file:
+            if file.read(len(cls.magic)) != cls.magic:
+                raise ValueError(f'{path} is not a simulation checkpoint')
+            version, header_size = struct.unpack('<II', file.read(8))
+            if version != cls.version:
+                raise ValueError(f'{path}: unsupported checkpoint version {version}')
+            header = json.loads(file.read(header_size).decode('utf-8'))
+            data_start = -(-(len(cls.magic) + 8 + header_size) // cls.alignment) * cls.alignment
+
+            arrays = {}
+            for entry in header.pop('arrays'):
+                dtype = np.dtype(entry['dtype'])
+                if mmap:
+                    offset = data_start + entry['offset']
+                    if entry['count']:
+                        arrays[entry['name']] = np.memmap(path, dtype, 'c', offset, (entry['count'],))
+                    else:
+                        arrays[entry['name']] = np.empty(0, dtype=dtype)
+                else:
+                    file.seek(data_start + entry['offset'])
+                    arrays[entry['name']] = np.fromfile(file, dtype=dtype, count=entry['count'])
+
+        return cls(header, arrays)
+
+    def grid(self):
+        return TerrainGrid(self.arrays['cells'].reshape(self.header['x'], self.header['y']))
+
+    def population(self):
+        arrays = self.arrays
+        return ColumnarPopulation(arrays['species'], arrays['hunger'], arrays['status'], arrays['rows'],
+                                  arrays['cols'], arrays['died_on'])
+
+    def to_engine(self, direction_source=None):
+        header = self.header
+        counters = header['counters']
+        counts = tuple(np.zeros(4, dtype=np.int64) for _ in range(3))
+        for animal_type, code in ColumnarPopulation.species_codes.items():
+            for counts_by_code, name in zip(counts, ('alive', 'dead', 'eaten')):
+                counts_by_code[code] = counters[name][animal_type]
+
+        carcass_policy = header['carcass_store']
+        engine = VectorizedTickEngine(self.population(), self.grid(), self._restore_rng(header['rng']),
+                                      direction_source, carcass_policy['ttl'], header['day'], counts,
+                                      carcass_policy.get('max_carcasses'))
+        engine.all_animals_dead = header['all_animals_dead']
+        return engine
+
+    def to_terrain(self, event_sink=None, profiler=None):
+        header = self.header
+        if header['engine'] != 'objects':
+            raise ValueError('only checkpoints of a Terrain can be resumed as a Terrain')
+
+        carcass_policy = header['carcass_store']
+        carcass_store = CarcassStore(ttl=carcass_policy['ttl'], max_carcasses=carcass_policy['max_carcasses'])
+        carcass_store.decomposed_count = carcass_policy['decomposed_count']
+        terrain = Terrain(header['x'], header['y'], header['animals_count'], event_sink=event_sink,
+                          carcass_store=carcass_store, track_cell_counts=header['track_cell_counts'],
+                          profiler=profiler, flyweight_cells=header.get('flyweight_cells', False))
+        terrain.day = header['day']
+        terrain.all_animals_dead = header['all_animals_dead']
+        terrain.rng = self._restore_rng(header['rng'])
+
+        grid = self.grid()
+        if header['grid_mode']:
+            terrain.terrain_map = TerrainMapView(grid, terrain.terrain_cell_factory)
+            terrain.grid = grid
+        else:
+            terrain.terrain_map = terrain.terrain_map_from_codes(grid.cells.tolist())
+
+        factory_types = terrain.animal_factory.animal_types
+        animal_classes = {code: factory_types[animal_type] for code, animal_type in Terrain.animal_types.items()}
+        live_count = header['live_count']
+        animals_locations = terrain.animals_locations
+        occupancy_index = terrain.occupancy_index
+        arrays = self.arrays
+        columns = zip(arrays['species'].tolist(), arrays['hunger'].tolist(), arrays['status'].tolist(),
+                      arrays['rows'].tolist(), arrays['cols'].tolist(), arrays['died_on'].tolist())
+
+        # Millions of new, acyclic objects would otherwise trigger full collections over and over.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for i, (species, hunger, status, row, col, died_on) in enumerate(columns):
+                animal = animal_classes[species]()
+                animal.hunger_rate = hunger
+                position = (row, col)
+                if status != ColumnarPopulation.ALIVE:
+                    animal.status = 'dead'
+                    animal.is_eaten = status == ColumnarPopulation.EATEN
+                if i < live_count:
+                    animals_locations[animal] = position
+                    occupancy_index.add(animal, position)
+                else:
+                    carcass_store.add(animal, position, died_on)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        saved_counters = header['counters']
+        terrain.counters.restore(saved_counters['alive'], saved_counters['dead'], saved_counters['eaten'],
+                                 animals_locations, saved_counters.get('deaths'))
+
+        return terrain
+
+
+def save_checkpoint(path, simulation):
+    """Write a Terrain or VectorizedTickEngine to ``path``."""
+    if isinstance(simulation, Terrain):
+        Checkpoint.from_terrain(simulation).write(path)
+    else:
+        Checkpoint.from_engine(simulation).write(path)
+
+
+def load_checkpoint(path, mmap=False):
+    """Resume whatever ``save_checkpoint`` wrote: a Terrain, or a VectorizedTickEngine."""
+    checkpoint = Checkpoint.read(path, mmap=mmap)
+    if checkpoint.header['engine'] == 'objects':
+        return checkpoint.to_terrain()
+    return checkpoint.to_engine()
@@ -0,0 +1,131 @@
+from itertools import chain
+
+import numpy as np
+
+from project.core.simulation_random import SimulationRandom
+
+
+class ColumnarPopulation:
+    """Structure-of-arrays population: one NumPy column per animal field.
+
+    Species codes match ``Terrain.animal_types``. A dead animal is a carcass
+    until it is eaten (``EATEN``) or decomposes (``DECOMPOSED``); either way
+    it keeps its slot so indices stay stable until ``compact`` is called.
+    """
+
+    CARNIVORE = 1
+    HERBIVORE = 2
+    SCAVENGER = 3
+
+    ALIVE = 0
+    DEAD = 1
+    EATEN = 2
+    DECOMPOSED = 3
+
+    species_codes = {
+        'Carnivore': CARNIVORE,
+        'Herbivore': HERBIVORE,
+        'Scavenger': SCAVENGER,
+    }
+
+    status_codes = {
+        'alive': ALIVE,
+        'dead': DEAD,
+    }
+
+    def __init__(self, species, hunger, status, rows, cols, died_on):
+        self.species = species
+        self.hunger = hunger
+        self.status = status
+        self.rows = rows
+        self.cols = cols
+        self.died_on = died_on
+
+    def __len__(self):
+        return len(self.species)
+
+    @classmethod
+    def empty(cls, count):
+        return cls(
+            np.zeros(count, dtype=np.uint8),
+            np.full(count, 10, dtype=np.int16),
+            np.zeros(count, dtype=np.uint8),
+            np.zeros(count, dtype=np.int32),
+            np.zeros(count, dtype=np.int32),
+            np.full(count, -1, dtype=np.int32),
+        )
+
+    @classmethod
+    def random(cls, x, y, count, grid, rng=None, species_weights=None, drown_on_spawn=False):
+        """Fill like ``Terrain.fill_with_animals``, from the same draws.
+
+        Animals are placed on land cells only; with ``drown_on_spawn``, or on a map without land, on any cell,
+        and those landing on water start dead.
+        """
+        if rng is None:
+            rng = SimulationRandom()
+
+        population = cls.empty(count)
+        if species_weights is None:
+            population.species[:] = rng.integers_array(3, count) + 1
+        else:
+            population.species[:] = rng.weighted_array(species_weights, count) + 1
+        land = None if drown_on_spawn else np.flatnonzero(~grid.water_mask())
+        if land is not None and (len(land) or not count):
+            population.rows[:], population.cols[:] = np.divmod(land[rng.integers_array(len(land), count)], y)
+            return population
+        population.rows[:] = rng.integers_array(x, count)
+        population.cols[:] = rng.integers_array(y, count)
+        drowned = grid.water_mask()[population.rows, population.cols]
+        population.status[drowned] = cls.DEAD
+        population.died_on[drowned] = 0
+        return population
+
+    @classmethod
+    def from_terrain(cls, terrain):
+        """Copy the live animals in dict order, then the carcasses.
+
+        Index i is the i-th animal of ``terrain.animals_locations``.
+        """
+        animals_locations = terrain.animals_locations
+        carcass_store = terrain.carcass_store
+        population = cls.empty(len(animals_locations) + len(carcass_store))
+
+        animals = chain(animals_locations.items(), carcass_store.items())
+        for i, (animal, (row, col)) in enumerate(animals):
+            population.species[i] = cls.species_codes[animal.animal_type]
+            population.hunger[i] = animal.hunger_rate
+            population.status[i] = cls.EATEN if animal.is_eaten else cls.status_codes[animal.status]
+            population.rows[i] = row
+            population.cols[i] = col
+            if animal in carcass_store:
+                population.died_on[i] = carcass_store.died_on[animal]
+
+        return population
+
+    def take(self, indices):
+        """A new population holding the animals at ``indices``, in that order."""
+        return ColumnarPopulation(self.species[indices], self.hunger[indices], self.status[indices],
+                                  self.rows[indices], self.cols[indices], self.died_on[indices])
+
+    @classmethod
+    def concatenate(cls, populations):
+        return cls(*(np.concatenate([getattr(population, column) for population in populations])
+                     for column in ('species', 'hunger', 'status', 'rows', 'cols', 'died_on')))
+
+    def compact(self):
+        """Drop eaten and decomposed slots. Returns the old indices of the kept animals."""
+        kept = np.flatnonzero(self.status <= self.DEAD)
+        self.species = self.species[kept]
+        self.hunger = self.hunger[kept]
+        self.status = self.status[kept]
+        self.rows = self.rows[kept]
+        self.cols = self.cols[kept]
+        self.died_on = self.died_on[kept]
+        return kept
+
+    def count(self, status, species=None):
+        mask = self.status == status
+        if species is not None:
+            mask &= self.species == species
+        return int(np.count_nonzero(mask))
@@ -0,0 +1,292 @@
+import numpy as np
+
+from project.columnar.columnar_population import ColumnarPopulation
+from project.core.move_table import MoveTable
+from project.core.simulation_random import SimulationRandom
+from project.grid.terrain_grid import TerrainGrid
+
+
+class VectorizedTickEngine:
+    """Runs ``Terrain.activate_animals`` days over a ColumnarPopulation.
+
+    The object engine walks animals one by one, and an animal's turn can
+    depend on what animals earlier in the dict did in the *same* cell
+    (a carnivore eats a herbivore before it feeds, a scavenger eats a body
+    that just starved). Cells never affect each other within a day, because
+    every lookup uses start-of-day positions. So the engine sorts acting
+    animals by cell and processes them in rounds: round ``r`` handles the
+    ``r``-th acting animal of every cell at once. Everything inside a round is
+    a whole-array operation, and the number of rounds is the largest number
+    of acting animals sharing one cell.
+
+    Dead animals are carcasses: they never act, but they stay in their cell
+    for predators and scavengers until eaten or, with ``carcass_ttl`` or
+    ``max_carcasses``, until they decompose, mirroring ``Terrain.carcass_store``.
+
+    Directions are drawn once per day, in one block, for every animal that
+    would draw one in the object engine, in the same order. Given the same
+    SimulationRandom state (``from_terrain`` copies the terrain's) both
+    engines produce identical runs.
+    """
+
+    max_hunger_rate = 10
+    hungry_below = 5
+
+    # Indexed by Terrain.directions codes: 1 up, 2 down, 3 left, 4 right.
+    row_steps = np.array(MoveTable.row_steps, dtype=np.int32)
+    col_steps = np.array(MoveTable.col_steps, dtype=np.int32)
+    blocked_bits = np.array(MoveTable.BLOCKED, dtype=np.uint8)
+    drown_bits = np.array(MoveTable.DROWNS, dtype=np.uint8)
+
+    def __init__(self, population, grid, rng=None, direction_source=None, carcass_ttl=None, day=0,
+                 counts=None, max_carcasses=None):
+        self.population = population
+        self.grid = grid
+        self.all_animals_dead = False
+        self.carcass_ttl = carcass_ttl
+        self.max_carcasses = max_carcasses
+        self.day = day
+
+        if rng is None:
+            rng = SimulationRandom()
+        self.rng = rng
+
+        if direction_source is None:
+            direction_source = self.draw_directions
+        self.direction_source = direction_source
+
+        self.flat_cells = np.ascontiguousarray(grid.cells).ravel()
+        self.move_flags = np.frombuffer(MoveTable.from_grid(grid).flags, dtype=np.uint8)
+
+        # Per-species counters indexed by species code, same meaning as PopulationCounters.
+        if counts is None:
+            counts = self.count_population(population)
+        self.alive_counts, self.dead_counts, self.eaten_counts = counts
+
+    @staticmethod
+    def count_population(population):
+        species = population.species
+        status = population.status
+        return (
+            np.bincount(species[status == ColumnarPopulation.ALIVE], minlength=4),
+            np.bincount(species[status != ColumnarPopulation.ALIVE], minlength=4),
+            np.bincount(species[status == ColumnarPopulation.EATEN], minlength=4),
+        )
+
+    @staticmethod
+    def counts_from_counters(counters):
+        counts = tuple(np.zeros(4, dtype=np.int64) for _ in range(3))
+        for animal_type, code in ColumnarPopulation.species_codes.items():
+            counts[0][code] = counters.alive[animal_type]
+            counts[1][code] = counters.dead[animal_type]
+            counts[2][code] = counters.eaten[animal_type]
+        return counts
+
+    @property
+    def dead_animals_count(self):
+        return int(self.dead_counts.sum())
+
+    def stats(self):
+        species_codes = ColumnarPopulation.species_codes
+        return {
+            'day': self.day,
+            'alive': {animal_type: int(self.alive_counts[code]) for animal_type, code in species_codes.items()},
+            'dead': {animal_type: int(self.dead_counts[code]) for animal_type, code in species_codes.items()},
+            'eaten': {animal_type: int(self.eaten_counts[code]) for animal_type, code in species_codes.items()},
+            'alive_total': int(self.alive_counts.sum()),
+            'dead_total': int(self.dead_counts.sum()),
+            'eaten_total': int(self.eaten_counts.sum()),
+            'carcasses': self.population.count(ColumnarPopulation.DEAD),
+        }
+
+    @classmethod
+    def from_terrain(cls, terrain, rng=None, direction_source=None):
+        grid = terrain.to_grid()
+
+        if rng is None:
+            rng = SimulationRandom()
+            rng.setstate(terrain.rng.getstate())
+
+        carcass_store = terrain.carcass_store
+        return cls(ColumnarPopulation.from_terrain(terrain), grid, rng, direction_source, carcass_store.ttl,
+                   terrain.day, cls.counts_from_counters(terrain.counters), carcass_store.max_carcasses)
+
+    def draw_directions(self, count):
+        return (self.rng.integers_array(4, count) + 1).astype(np.int8)
+
+    def tick(self):
+        if not self.alive_counts.any():
+            self.all_animals_dead = True
+            return
+
+        self.day += 1
+        population = self.population
+        hunger = population.hunger
+        status = population.status
+
+        present = status <= ColumnarPopulation.DEAD
+        alive = status == ColumnarPopulation.ALIVE
+        hungry = alive & (hunger < self.hungry_below)
+
+        if hungry.any():
+            self._activate_hungry(hungry, present)
+
+        hunger[alive & ~hungry] -= 1
+
+        self.expire_carcasses()
+
+    def expire_carcasses(self):
+        population = self.population
+        status = population.status
+        if self.carcass_ttl is not None:
+            expired = (status == ColumnarPopulation.DEAD) & (self.day - population.died_on >= self.carcass_ttl)
+            status[expired] = ColumnarPopulation.DECOMPOSED
+
+        if self.max_carcasses is not None:
+            carcasses = np.flatnonzero(status == ColumnarPopulation.DEAD)
+            excess = len(carcasses) - self.max_carcasses
+            if excess > 0:
+                # Oldest first, like CarcassStore: by day of death, then by slot, which is the order of death
+                # within a day.
+                oldest = carcasses[np.argsort(population.died_on[carcasses], kind='stable')[:excess]]
+                status[oldest] = ColumnarPopulation.DECOMPOSED
+
+    def _activate_hungry(self, hungry, present):
+        population = self.population
+        species = population.species
+        hunger = population.hunger
+        status = population.status
+        rows = population.rows
+        cols = population.cols
+        y = self.grid.y
+        size = len(population)
+
+        cell = rows.astype(np.int64) * y + cols
+
+        # Present animals sorted by cell, then by dict order; each cell is one segment.
+        # Sorting a combined (cell, index) key is much cheaper than a stable argsort of the cells.
+        index_bits = max(size.bit_length(), 1)
+        present_index = np.flatnonzero(present)
+        cell_keys = np.sort((cell[present_index] << index_bits) | present_index)
+        by_cell = cell_keys & ((1 << index_bits) - 1)
+        sorted_cells = cell_keys >> index_bits
+        segment_starts_mask = np.empty(len(by_cell), dtype=bool)
+        segment_starts_mask[:1] = True
+        segment_starts_mask[1:] = sorted_cells[1:] != sorted_cells[:-1]
+        segment_of_sorted = np.cumsum(segment_starts_mask) - 1
+        segment_starts = np.flatnonzero(segment_starts_mask)
+        segment_ends = np.append(segment_starts[1:], len(by_cell))
+
+        segment = np.full(size, -1, dtype=np.int64)
+        segment[by_cell] = segment_of_sorted
+
+        acting = hungry
+
+        # A hungry herbivore eaten by an earlier carnivore in its cell no longer skips the direction draw.
+        is_acting_carnivore = acting & (species == ColumnarPopulation.CARNIVORE)
+        first_carnivore = np.full(len(segment_starts), size, dtype=np.int64)
+        carnivore_sorted = np.flatnonzero(is_acting_carnivore[by_cell])
+        carnivore_segments = segment_of_sorted[carnivore_sorted]
+        first_in_segment = np.empty(len(carnivore_sorted), dtype=bool)
+        first_in_segment[:1] = True
+        first_in_segment[1:] = carnivore_segments[1:] != carnivore_segments[:-1]
+        first_carnivore[carnivore_segments[first_in_segment]] = by_cell[carnivore_sorted[first_in_segment]]
+
+        herbivores = np.flatnonzero(acting & (species == ColumnarPopulation.HERBIVORE))
+        on_grass = self.flat_cells[cell[herbivores]] == TerrainGrid.cell_codes['GRASS']
+        grazing_skip = herbivores[(first_carnivore[segment[herbivores]] > herbivores) & ~on_grass]
+        drawing = hungry.copy()
+        drawing[grazing_skip] = False
+        drawers = np.flatnonzero(drawing)
+        directions = np.zeros(size, dtype=np.int8)
+        directions[drawers] = self.direction_source(len(drawers))
+
+        # Split acting animals into rounds by their rank inside their cell.
+        acting_sorted = np.flatnonzero(acting[by_cell])
+        acting_animals = by_cell[acting_sorted]
+        acting_segments = segment_of_sorted[acting_sorted]
+        acting_count = len(acting_animals)
+        new_group = np.empty(acting_count, dtype=bool)
+        new_group[:1] = True
+        new_group[1:] = acting_segments[1:] != acting_segments[:-1]
+        positions = np.arange(acting_count)
+        rank = positions - np.maximum.accumulate(np.where(new_group, positions, 0))
+        round_keys = np.sort((rank << index_bits) | positions)
+        round_animals = acting_animals[round_keys & ((1 << index_bits) - 1)]
+        rounds = rank.max() + 1 if acting_count else 0
+        round_bounds = np.searchsorted(round_keys >> index_bits, np.arange(rounds + 1))
+
+        eaten = np.zeros(size, dtype=bool)
+
+        for r in range(len(round_bounds) - 1):
+            animals = round_animals[round_bounds[r]:round_bounds[r + 1]]
+            animals = animals[status[animals] == ColumnarPopulation.ALIVE]
+            animal_species = species[animals]
+
+            herbivores = animals[animal_species == ColumnarPopulation.HERBIVORE]
+            grazing = self.flat_cells[cell[herbivores]] == TerrainGrid.cell_codes['GRASS']
+            hunger[herbivores[grazing]] += 1
+            starving = herbivores[~grazing]
+            hunger[starving] -= 1
+            self._kill(starving[hunger[starving] <= 0])
+
+            carnivores = animals[animal_species == ColumnarPopulation.CARNIVORE]
+            members, owners = self._cell_members(carnivores, segment, segment_starts, segment_ends, by_cell)
+            victims_mask = (species[members] != ColumnarPopulation.CARNIVORE) & ~eaten[members]
+            victims = members[victims_mask]
+            eaten[victims] = True
+            self._kill(victims[status[victims] == ColumnarPopulation.ALIVE])
+            self.eaten_counts += np.bincount(species[victims], minlength=4)
+            meals = np.bincount(owners[victims_mask], minlength=len(carnivores))
+            fed = meals > 0
+            hunger[carnivores[fed]] = np.minimum(hunger[carnivores[fed]] + meals[fed], self.max_hunger_rate)
+
+            scavengers = animals[animal_species == ColumnarPopulation.SCAVENGER]
+            members, owners = self._cell_members(scavengers, segment, segment_starts, segment_ends, by_cell)
+            victims_mask = (species[members] != ColumnarPopulation.SCAVENGER) & (status[members] == ColumnarPopulation.DEAD)
+            victims = members[victims_mask]
+            self.eaten_counts += np.bincount(species[victims[~eaten[victims]]], minlength=4)
+            eaten[victims] = True
+            scraps = np.bincount(owners[victims_mask], minlength=len(scavengers))
+            hunger[scavengers] = np.minimum(hunger[scavengers] + scraps, self.max_hunger_rate)
+
+            self._move(np.concatenate((carnivores[~fed], scavengers[scraps == 0])), directions, cell)
+
+        status[eaten] = ColumnarPopulation.EATEN
+
+    def _cell_members(self, animals, segment, segment_starts, segment_ends, by_cell):
+        """All present animals sharing a cell with each of ``animals``, plus the owner's local index."""
+        animal_segments = segment[animals]
+        starts = segment_starts[animal_segments]
+        lengths = segment_ends[animal_segments] - starts
+        owners = np.repeat(np.arange(len(animals)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return by_cell[starts[owners] + offsets], owners
+
+    def _kill(self, animals):
+        self.population.status[animals] = ColumnarPopulation.DEAD
+        self.population.died_on[animals] = self.day
+        deaths = np.bincount(self.population.species[animals], minlength=4)
+        self.alive_counts -= deaths
+        self.dead_counts += deaths
+
+    def _move(self, animals, directions, cell):
+        population = self.population
+        population.hunger[animals] -= 1
+        starved = population.hunger[animals] <= 0
+        self._kill(animals[starved])
+
+        animals = animals[~starved]
+        animal_directions = directions[animals]
+        # One gather from the move table settles both the border and the water for every step.
+        flags = self.move_flags[cell[animals]]
+        inside = (flags & self.blocked_bits[animal_directions]) == 0
+
+        animals = animals[inside]
+        animal_directions = animal_directions[inside]
+        flags = flags[inside]
+        population.rows[animals] += self.row_steps[animal_directions]
+        population.cols[animals] += self.col_steps[animal_directions]
+
+        drowned = (flags & self.drown_bits[animal_directions]) != 0
+        self._kill(animals[drowned])
@@ -13,3 +13,8 @@ class AnimalFactory:
     def create_animal(self, animal_type):
         # print(animal_type)
         return self.__class__.animal_types[animal_type]()
+
+    def create_many(self, animal_types):
+        """One new animal per name in ``animal_types``, in order."""
+        classes = self.__class__.animal_types
+        return [classes[animal_type]() for animal_type in animal_types]
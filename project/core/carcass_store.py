@@ -0,0 +1,81 @@
+class CarcassStore:
+    """Dead, uneaten animals, kept out of the live animals_locations dict.
+
+    Bodies are indexed by cell for scavengers and carnivores. ``expire``
+    applies the retention policy. ``ttl`` is how many days a body stays
+    after the day it died. ``max_carcasses`` caps how many are kept, and the
+    oldest go first. Either limit may be None (keep forever / no cap).
+    """
+
+    def __init__(self, ttl=None, max_carcasses=None):
+        self.ttl = ttl
+        self.max_carcasses = max_carcasses
+        self.clear()
+
+    def clear(self):
+        """Drop every body and the decomposed count; the retention policy stays."""
+        self.cells = {}
+        self.positions = {}
+        # Insertion order is death order, so the oldest body is always first.
+        self.died_on = {}
+        self.decomposed_count = 0
+
+    def __len__(self):
+        return len(self.died_on)
+
+    def __contains__(self, animal):
+        return animal in self.died_on
+
+    def __iter__(self):
+        return iter(self.died_on)
+
+    def add(self, animal, position, day):
+        bucket = self.cells.get(position)
+        if bucket is None:
+            bucket = self.cells[position] = {}
+        bucket[animal] = None
+        self.positions[animal] = position
+        self.died_on[animal] = day
+
+    def remove(self, animal):
+        position = self.positions.pop(animal, None)
+        if position is None:
+            return None
+
+        del self.died_on[animal]
+        bucket = self.cells[position]
+        del bucket[animal]
+        if not bucket:
+            del self.cells[position]
+        return position
+
+    def carcasses_at(self, position):
+        return self.cells.get(position, ())
+
+    def position_of(self, animal):
+        return self.positions.get(animal)
+
+    def items(self):
+        return self.positions.items()
+
+    def expire(self, day, on_decompose=None):
+        """Apply the retention policy; ``on_decompose(animal, position)`` is called for each body dropped."""
+        died_on = self.died_on
+
+        if self.ttl is not None:
+            while died_on:
+                oldest = next(iter(died_on))
+                if day - died_on[oldest] < self.ttl:
+                    break
+                position = self.remove(oldest)
+                self.decomposed_count += 1
+                if on_decompose is not None:
+                    on_decompose(oldest, position)
+
+        if self.max_carcasses is not None:
+            while len(died_on) > self.max_carcasses:
+                oldest = next(iter(died_on))
+                position = self.remove(oldest)
+                self.decomposed_count += 1
+                if on_decompose is not None:
+                    on_decompose(oldest, position)
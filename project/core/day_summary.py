@@ -0,0 +1,20 @@
+from collections import namedtuple
+
+from project.core.population_counters import PopulationCounters
+
+# Counts for one day. alive, dead and eaten are running totals by species, as in Terrain.stats();
+# deaths counts only that day's deaths, by cause.
+DaySummary = namedtuple('DaySummary', ['day', 'alive', 'dead', 'eaten', 'deaths', 'carcasses'])
+
+DeathCauses = namedtuple('DeathCauses', PopulationCounters.death_causes)
+
+SpeciesCounts = namedtuple('SpeciesCounts', ['Carnivore', 'Herbivore', 'Scavenger'])
+
+
+def day_summary(day, counters, deaths_before, carcasses):
+    """Freeze ``counters`` into a DaySummary; ``deaths_before`` is ``counters.deaths`` as it was at dawn."""
+    deaths = counters.deaths
+    return DaySummary(day, SpeciesCounts(**counters.alive), SpeciesCounts(**counters.dead),
+                      SpeciesCounts(**counters.eaten),
+                      DeathCauses(*[deaths[cause] - deaths_before[cause] for cause in DeathCauses._fields]),
+                      carcasses)
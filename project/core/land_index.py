@@ -0,0 +1,72 @@
+from array import array
+from bisect import bisect_right
+
+
+class LandIndex:
+    """Numbers the land cells of a block of map rows, row-major, without storing them.
+
+    Only the running count of land cells before each band of ``band_rows``
+    rows is kept, so the index is a few bytes per band, however big the
+    map, plus the last band read. ``positions`` finds the band holding each
+    wanted land cell and reads that band again to pick the cell out.
+
+    ``land_in_rows(row, rows)`` gives the land cells in ``rows`` rows from
+    ``row``, row-major: as a list of ``(row, col)`` for ``positions``, or as
+    a NumPy array of flat positions, ``row * y + col``, for
+    ``position_arrays``.
+    """
+
+    def __init__(self, y, top, height, band_rows, land_in_rows):
+        self.y = y
+        self.top = top
+        self.height = height
+        self.band_rows = band_rows
+        self.land_in_rows = land_in_rows
+        self._last_band = (None, None)
+        self.starts = array('q', [0])
+        for row in range(top, top + height, band_rows):
+            self.starts.append(self.starts[-1] + len(self._band(row)))
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def _band(self, row):
+        # The last band read is kept, so a map of one band is not read again to resolve its draws.
+        if self._last_band[0] != row:
+            self._last_band = (row, self.land_in_rows(row, min(self.band_rows, self.top + self.height - row)))
+        return self._last_band[1]
+
+    def positions(self, picks):
+        """``(row, col)`` of the ``k``-th land cell for each ``k`` in ``picks``, in the order of ``picks``."""
+        starts = self.starts
+        if len(starts) == 2:
+            return list(map(self._band(self.top).__getitem__, picks))
+        by_band = {}
+        for i, pick in enumerate(picks):
+            by_band.setdefault(bisect_right(starts, pick) - 1, []).append(i)
+        positions = [None] * len(picks)
+        for band, indices in by_band.items():
+            land = self._band(self.top + band * self.band_rows)
+            start = starts[band]
+            for i in indices:
+                positions[i] = land[picks[i] - start]
+        return positions
+
+    def position_arrays(self, picks):
+        """Like ``positions`` for a NumPy array of picks, but as an array of rows and an array of columns."""
+        import numpy as np
+
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        if len(starts) == 2:
+            return np.divmod(self._band(self.top)[picks], self.y)
+        bands = np.searchsorted(starts, picks, side='right') - 1
+        # Sorted by band, so each band is read once and its picks are one slice of ``order``.
+        order = np.argsort(bands, kind='stable')
+        bounds = np.searchsorted(bands[order], np.arange(len(starts)))
+        flats = np.empty(len(picks), dtype=np.int64)
+        for band in range(len(starts) - 1):
+            chosen = order[bounds[band]:bounds[band + 1]]
+            if len(chosen):
+                land = self._band(self.top + band * self.band_rows)
+                flats[chosen] = land[picks[chosen] - starts[band]]
+        return np.divmod(flats, self.y)
@@ -0,0 +1,78 @@
+class MoveTable:
+    """What a one-cell step in each direction does from each cell of a map, worked out once for the whole map.
+
+    One byte per cell, row-major, in ``flags``. For a direction code ``d``
+    (``Terrain.directions``), bit ``BLOCKED[d]`` is set when the step would
+    leave the map, and bit ``DROWNS[d]`` when it lands on water. The target
+    cell is ``(row + row_steps[d], col + col_steps[d])``. It is not stored,
+    so the whole table costs one byte per cell.
+    """
+
+    # Indexed by Terrain.directions codes: 1 up, 2 down, 3 left, 4 right.
+    row_steps = (0, -1, 1, 0, 0)
+    col_steps = (0, 0, 0, -1, 1)
+    BLOCKED = (0, 1, 2, 4, 8)
+    DROWNS = (0, 16, 32, 64, 128)
+
+    def __init__(self, x, y, flags):
+        self.x = x
+        self.y = y
+        self.flags = flags
+
+    @classmethod
+    def from_water_rows(cls, x, y, water_rows, flags=None):
+        """Build from ``x`` rows of ``y`` bytes each, 1 on water and 0 elsewhere.
+
+        Rows are read one at a time, so a memory-mapped map is never loaded
+        whole. ``flags`` is a writable buffer of ``x * y`` bytes to fill; it
+        defaults to a new bytearray.
+        """
+        if flags is None:
+            flags = bytearray(x * y)
+        if not x or not y:
+            return cls(x, y, flags)
+
+        # Each row is handled as one big integer, one byte per cell. Neighbours are then byte shifts, and
+        # weighting the 0/1 bytes by the bit they set never carries into the next cell, so a whole row of
+        # flags is a handful of integer operations instead of a Python loop over cells.
+        mask = (1 << 8 * y) - 1
+        up, down, left, right = cls.DROWNS[1:]
+        edges = int.from_bytes(bytes([cls.BLOCKED[3]]) + bytes(y - 1), 'little')
+        edges += cls.BLOCKED[4] << 8 * (y - 1)
+        water_rows = iter(water_rows)
+        above = 0
+        here = int.from_bytes(next(water_rows), 'little')
+        for row in range(x):
+            below = int.from_bytes(next(water_rows), 'little') if row + 1 < x else 0
+            row_flags = (up * above + down * below + left * ((here << 8) & mask) + right * (here >> 8)
+                         + edges)
+            if row == 0:
+                row_flags += cls.BLOCKED[1] * int.from_bytes(b'\1' * y, 'little')
+            if row == x - 1:
+                row_flags += cls.BLOCKED[2] * int.from_bytes(b'\1' * y, 'little')
+            flags[row * y:(row + 1) * y] = row_flags.to_bytes(y, 'little')
+            above, here = here, below
+        return cls(x, y, flags)
+
+    @classmethod
+    def from_terrain_map(cls, terrain_map):
+        x = len(terrain_map)
+        y = len(terrain_map[0]) if x else 0
+        return cls.from_water_rows(x, y, (bytes([cell.cell_type == 'WATER' for cell in row]) for row in terrain_map))
+
+    @classmethod
+    def from_grid(cls, grid, flags=None):
+        """Build from a TerrainGrid, reading its cells a row at a time."""
+        water = grid.cell_codes['WATER']
+        return cls.from_water_rows(grid.x, grid.y, ((row == water).tobytes() for row in grid.cells), flags)
+
+    def flags_at(self, row, col):
+        return self.flags[row * self.y + col]
+
+    def move(self, row, col, direction):
+        """``(target, blocked, drowns)`` for a step from ``(row, col)``; the target is None when blocked."""
+        flags = self.flags[row * self.y + col]
+        if flags & self.BLOCKED[direction]:
+            return None, True, False
+        return ((row + self.row_steps[direction], col + self.col_steps[direction]), False,
+                bool(flags & self.DROWNS[direction]))
@@ -0,0 +1,75 @@
+class OccupancyIndex:
+    """Maps every occupied cell to the animals standing on it.
+
+    Buckets are plain dicts used as insertion-ordered sets, so adding,
+    removing and moving an animal are all O(1) and a same-cell lookup
+    costs O(animals in that cell) instead of a scan of the population.
+
+    ``add_many`` only keeps its batch, which the caller must not change
+    afterwards; the batches are bucketed, in the order they came, on the
+    next use of the index. So a large fill hands
+    that cost to the first day instead of paying it while spawning.
+    """
+
+    def __init__(self):
+        self._cells = {}
+        self.pending = []
+
+    @property
+    def cells(self):
+        if self.pending:
+            self._add_pending()
+        return self._cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, animal, position):
+        if self.pending:
+            self._add_pending()
+        bucket = self._cells.get(position)
+        if bucket is None:
+            bucket = self._cells[position] = {}
+        bucket[animal] = None
+
+    def add_many(self, animals, positions):
+        self.pending.append((animals, positions))
+
+    def _add_pending(self):
+        cells = self._cells
+        get = cells.get
+        for animals, positions in self.pending:
+            for animal, position in zip(animals, positions):
+                bucket = get(position)
+                if bucket is None:
+                    cells[position] = {animal: None}
+                else:
+                    bucket[animal] = None
+        self.pending = []
+
+    def remove(self, animal, position):
+        if self.pending:
+            self._add_pending()
+        bucket = self._cells.get(position)
+        if bucket is None:
+            return
+        bucket.pop(animal, None)
+        if not bucket:
+            del self._cells[position]
+
+    def move(self, animal, old_position, new_position):
+        if old_position == new_position:
+            return
+        self.remove(animal, old_position)
+        self.add(animal, new_position)
+
+    def animals_at(self, position):
+        if self.pending:
+            self._add_pending()
+        return self._cells.get(position, ())
+
+    def rebuild(self, animals_locations):
+        self._cells = {}
+        self.pending = []
+        # Copied: the batch is read later, after the caller's dict has moved on.
+        self.add_many(list(animals_locations), list(animals_locations.values()))
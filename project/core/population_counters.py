@@ -0,0 +1,108 @@
+from collections import Counter
+
+
+class PopulationCounters:
+    """Exact per-species counts, updated on every state change instead of recounted.
+
+    ``alive`` counts living animals, ``dead`` counts every animal that ever
+    died (each one once, eaten or not), and ``eaten`` counts the dead
+    animals that were eaten. So ``alive + dead`` is everything ever
+    spawned. ``deaths`` splits ``dead_total`` by cause. With
+    ``track_cells`` the living animals of each species are also counted
+    per cell.
+    """
+
+    death_causes = ('water', 'hunger', 'predation', 'external')
+
+    def __init__(self, animal_types, track_cells=False):
+        self.animal_types = tuple(animal_types)
+        self.track_cells = track_cells
+        self.reset()
+
+    def reset(self):
+        self.alive = dict.fromkeys(self.animal_types, 0)
+        self.dead = dict.fromkeys(self.animal_types, 0)
+        self.eaten = dict.fromkeys(self.animal_types, 0)
+        self.deaths = dict.fromkeys(self.death_causes, 0)
+        self.alive_total = 0
+        self.dead_total = 0
+        self.eaten_total = 0
+        self.cells = {}
+
+    def restore(self, alive, dead, eaten, animals_locations=(), deaths=None):
+        """Load saved counts; per-cell counts are rebuilt from the living animals in ``animals_locations``."""
+        self.reset()
+        self.alive.update(alive)
+        self.dead.update(dead)
+        self.eaten.update(eaten)
+        if deaths is not None:
+            self.deaths.update(deaths)
+        self.alive_total = sum(self.alive.values())
+        self.dead_total = sum(self.dead.values())
+        self.eaten_total = sum(self.eaten.values())
+        if self.track_cells:
+            for animal, position in animals_locations.items():
+                if animal.status == 'alive':
+                    self._add_to_cell(animal.animal_type, position, 1)
+
+    def spawn(self, animal_type, position):
+        self.alive[animal_type] += 1
+        self.alive_total += 1
+        if self.track_cells:
+            self._add_to_cell(animal_type, position, 1)
+
+    def spawn_many(self, animal_types, positions):
+        """``spawn`` for each pair of ``animal_types`` and ``positions``, counting the species in one pass."""
+        for animal_type, count in Counter(animal_types).items():
+            self.alive[animal_type] += count
+            self.alive_total += count
+        if self.track_cells:
+            for animal_type, position in zip(animal_types, positions):
+                self._add_to_cell(animal_type, position, 1)
+
+    def die(self, animal_type, position, cause):
+        self.alive[animal_type] -= 1
+        self.alive_total -= 1
+        self.dead[animal_type] += 1
+        self.dead_total += 1
+        self.deaths[cause] += 1
+        if self.track_cells:
+            self._add_to_cell(animal_type, position, -1)
+
+    def add_dead(self, animal_type):
+        """Count an animal that is already dead when it enters the terrain."""
+        self.dead[animal_type] += 1
+        self.dead_total += 1
+        self.deaths['external'] += 1
+
+    def eat(self, animal_type):
+        self.eaten[animal_type] += 1
+        self.eaten_total += 1
+
+    def move(self, animal_type, old_position, new_position):
+        if self.track_cells and old_position != new_position:
+            self._add_to_cell(animal_type, old_position, -1)
+            self._add_to_cell(animal_type, new_position, 1)
+
+    def cell(self, position):
+        """Living animals per species in one cell (needs ``track_cells``)."""
+        counts = self.cells.get(position)
+        return dict(counts) if counts is not None else dict.fromkeys(self.animal_types, 0)
+
+    def _add_to_cell(self, animal_type, position, delta):
+        counts = self.cells.get(position)
+        if counts is None:
+            counts = self.cells[position] = dict.fromkeys(self.animal_types, 0)
+        counts[animal_type] += delta
+        if delta < 0 and not any(counts.values()):
+            del self.cells[position]
+
+    def snapshot(self):
+        return {
+            'alive': dict(self.alive),
+            'dead': dict(self.dead),
+            'eaten': dict(self.eaten),
+            'alive_total': self.alive_total,
+            'dead_total': self.dead_total,
+            'eaten_total': self.eaten_total,
+        }
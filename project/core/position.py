@@ -0,0 +1,10 @@
+def position_to_str(position):
+    """Format a (row, col) position the way Terrain used to store it: 'row:col'."""
+    row, col = position
+    return f'{row}:{col}'
+
+
+def position_from_str(text):
+    """Parse a 'row:col' string into a (row, col) position."""
+    row, col = text.split(':')
+    return int(row), int(col)
@@ -0,0 +1,42 @@
+class PositionBuffer:
+    """Positions written during a tick, applied to the live locations when it ends.
+
+    The two lists are reused from tick to tick. They grow to the most
+    moves seen in one tick and never shrink, so after warm-up a tick
+    allocates nothing for them. ``drain`` clears each slot as it yields,
+    so the buffer does not keep removed animals alive.
+    """
+
+    __slots__ = ('animals', 'positions', 'count')
+
+    def __init__(self):
+        self.animals = []
+        self.positions = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def write(self, animal, position):
+        count = self.count
+        if count < len(self.animals):
+            self.animals[count] = animal
+            self.positions[count] = position
+        else:
+            self.animals.append(animal)
+            self.positions.append(position)
+        self.count = count + 1
+
+    def drain(self):
+        """Yield the writes in order and leave the buffer empty, keeping its capacity."""
+        animals = self.animals
+        positions = self.positions
+        for i in range(self.count):
+            yield animals[i], positions[i]
+            animals[i] = positions[i] = None
+        self.count = 0
+
+    def clear(self):
+        for i in range(self.count):
+            self.animals[i] = self.positions[i] = None
+        self.count = 0
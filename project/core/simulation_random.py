@@ -0,0 +1,92 @@
+import random
+import sys
+from array import array
+
+
+class SimulationRandom:
+    """Seedable random source owned by one Terrain.
+
+    Everything is drawn from a single stream of 32-bit words produced in
+    bulk by ``random.Random.getrandbits``. A word ``w`` becomes an integer
+    in ``[0, n)`` as ``(w * n) >> 32``. Scalar draws (``below``,
+    ``randint``) consume words from a pre-drawn block. Bulk draws
+    (``integers``, ``integers_array``) take the next words of the same
+    stream. So a run is bit-for-bit reproducible from its seed, however the
+    draws are batched, and the pure Python and NumPy paths give identical
+    values.
+    """
+
+    array_chunk = 1 << 20
+
+    def __init__(self, seed=None, block_size=4096):
+        self.seed = seed
+        self.block_size = block_size
+        self.source = random.Random(seed)
+        self.buffer = array('I')
+        self.index = 0
+
+    def _fresh_words(self, count):
+        words = array('I', self.source.getrandbits(32 * count).to_bytes(4 * count, 'little') if count else b'')
+        if sys.byteorder == 'big':
+            words.byteswap()
+        return words
+
+    def take_words(self, count):
+        """The next ``count`` words of the stream, buffered ones first."""
+        buffered = len(self.buffer) - self.index
+        if count <= buffered:
+            words = self.buffer[self.index:self.index + count]
+            self.index += count
+            return words
+
+        words = self.buffer[self.index:]
+        words.extend(self._fresh_words(count - buffered))
+        self.buffer = array('I')
+        self.index = 0
+        return words
+
+    def below(self, n):
+        if self.index == len(self.buffer):
+            self.buffer = self._fresh_words(self.block_size)
+            self.index = 0
+        word = self.buffer[self.index]
+        self.index += 1
+        return (word * n) >> 32
+
+    def randint(self, a, b):
+        return a + self.below(b - a + 1)
+
+    def integers(self, n, count):
+        return [(word * n) >> 32 for word in self.take_words(count)]
+
+    def integers_array(self, n, count, dtype=None):
+        """Like ``integers`` but as a NumPy array, ``uint32`` unless ``dtype`` says otherwise."""
+        import numpy as np
+
+        # Converted chunk by chunk so a whole-map draw never holds the 64-bit intermediates at once.
+        values = np.empty(count, dtype=np.uint32 if dtype is None else dtype)
+        for start in range(0, count, self.array_chunk):
+            words = np.frombuffer(self.take_words(min(self.array_chunk, count - start)), dtype=np.uint32)
+            values[start:start + len(words)] = (words.astype(np.uint64) * n) >> 32
+        return values
+
+    def weighted(self, weights, count):
+        """``count`` indices into ``weights`` (whole numbers), each picked with probability weight / total."""
+        table = [index for index, weight in enumerate(weights) for _ in range(weight)]
+        return [table[value] for value in self.integers(len(table), count)]
+
+    def weighted_array(self, weights, count):
+        import numpy as np
+
+        table = np.repeat(np.arange(len(weights)), weights)
+        return table[self.integers_array(len(table), count)]
+
+    def getstate(self):
+        return self.source.getstate(), self.buffer[self.index:].tobytes()
+
+    def setstate(self, state):
+        source_state, buffered = state
+        self.source.setstate(source_state)
+        self.buffer = array('I')
+        self.buffer.frombytes(buffered)
+        self.index = 0
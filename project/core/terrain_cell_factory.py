@@ -1,6 +1,3 @@
-from project.animal.carnivore import Carnivore
-from project.animal.herbivore import Herbivore
-from project.animal.scavenger import Scavenger
 from project.terrain_cell.desert import Desert
 from project.terrain_cell.grass import Grass
 from project.terrain_cell.mountain import Mountain
@@ -15,6 +12,18 @@ class TerrainCellFactory:
         'GRASS': Grass,
     }
 
+    # Flyweights: one immutable cell per type, shared by every map of every flyweight factory.
+    shared_cells = {}
+
+    def __init__(self, flyweight=False):
+        self.flyweight = flyweight
+
     def create_terrain_cell(self, cell_type):
         # print(cell_type)
-        return self.__class__.terrain_cell_types[cell_type](cell_type)
+        cell_class = self.__class__.terrain_cell_types[cell_type]
+        if self.flyweight:
+            cell = TerrainCellFactory.shared_cells.get((cell_class, cell_type))
+            if cell is None:
+                cell = TerrainCellFactory.shared_cells[(cell_class, cell_type)] = cell_class(cell_type)
+            return cell
+        return cell_class(cell_type)
@@ -0,0 +1,49 @@
+from collections import deque
+
+
+class CountingEventSink:
+    """Aggregates events into per-day counters instead of keeping each one.
+
+    Closed days are kept as ``(day, {kind: count})`` pairs, at most ``max_days`` of them.
+    Events recorded between days, such as ALL_ANIMALS_DEAD or drownings at
+    spawn, are counted at once, under the day that last ended (0 before the
+    first day).
+    """
+
+    def __init__(self, max_days=None):
+        self.current = {}
+        self.days = deque(maxlen=max_days)
+        self.totals = {}
+        self.day = 0
+        self.in_day = False
+
+    def record(self, kind, animal_type, position, detail=None):
+        if self.in_day:
+            current = self.current
+            current[kind] = current.get(kind, 0) + 1
+            return
+
+        self.totals[kind] = self.totals.get(kind, 0) + 1
+        if self.days and self.days[-1][0] == self.day:
+            counts = self.days[-1][1]
+        else:
+            counts = {}
+            self.days.append((self.day, counts))
+        counts[kind] = counts.get(kind, 0) + 1
+
+    def start_day(self, day):
+        self.day = day
+        self.in_day = True
+
+    def end_day(self, day):
+        for kind, count in self.current.items():
+            self.totals[kind] = self.totals.get(kind, 0) + count
+        self.days.append((day, self.current))
+        self.current = {}
+        self.day = day
+        self.in_day = False
+
+    def drain(self):
+        days = list(self.days)
+        self.days.clear()
+        return days
@@ -0,0 +1,44 @@
+from project.events.simulation_event import SimulationEvent
+
+
+class RingBufferEventSink:
+    """Keeps the last ``capacity`` events; older ones are overwritten and counted as dropped.
+
+    ``record`` only stores a plain tuple. Events become SimulationEvent
+    tuples when they are drained.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self.start = 0
+        self.size = 0
+        self.dropped = 0
+        self.day = 0
+
+    def __len__(self):
+        return self.size
+
+    def record(self, kind, animal_type, position, detail=None):
+        end = self.start + self.size
+        if end >= self.capacity:
+            end -= self.capacity
+        self.buffer[end] = (self.day, kind, animal_type, position, detail)
+
+        if self.size == self.capacity:
+            self.start = end + 1 if end + 1 < self.capacity else 0
+            self.dropped += 1
+        else:
+            self.size += 1
+
+    def start_day(self, day):
+        self.day = day
+
+    def end_day(self, day):
+        pass
+
+    def drain(self):
+        events = [SimulationEvent._make(self.buffer[(self.start + i) % self.capacity]) for i in range(self.size)]
+        self.start = 0
+        self.size = 0
+        return events
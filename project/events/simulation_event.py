@@ -0,0 +1,26 @@
+from collections import namedtuple
+
+WATER_DEATH = 1
+HUNGER_DEATH = 2
+BORDER_BLOCKED = 3
+ALL_ANIMALS_DEAD = 4
+
+event_kinds = {
+    WATER_DEATH: 'water_death',
+    HUNGER_DEATH: 'hunger_death',
+    BORDER_BLOCKED: 'border_blocked',
+    ALL_ANIMALS_DEAD: 'all_animals_dead',
+}
+
+SimulationEvent = namedtuple('SimulationEvent', ['day', 'kind', 'animal_type', 'position', 'detail'])
+
+
+def format_event(event):
+    """Render an event the way the simulation used to print it."""
+    if event.kind == WATER_DEATH:
+        return f'Animal {event.animal_type} stepped on water.'
+    if event.kind == HUNGER_DEATH:
+        return f'Animal {event.animal_type} died of hunger.'
+    if event.kind == BORDER_BLOCKED:
+        return f'{event.animal_type} cannot go to this direction. There is a border {event.detail}!'
+    return 'There are no alive animals in the terrain.'
@@ -0,0 +1,93 @@
+import numpy as np
+
+from project.generation.terrain_generator import TerrainGenerator
+
+_mask = (1 << 64) - 1
+
+
+def lattice_values(key, layer, row, col, rows, cols):
+    """Pseudo-random values in ``[0, 1)`` at lattice points, a pure function of key, layer and coordinates."""
+    i = np.arange(row, row + rows, dtype=np.int64).astype(np.uint64)
+    j = np.arange(col, col + cols, dtype=np.int64).astype(np.uint64)
+    salt = np.uint64((key ^ (layer * 0x9E3779B97F4A7C15)) & _mask)
+    z = (i[:, None] * np.uint64(0xBF58476D1CE4E5B9)) ^ (j[None, :] * np.uint64(0x94D049BB133111EB)) ^ salt
+    # SplitMix64 finaliser: neighbouring coordinates give unrelated values.
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+
+
+class BiomeGenerator(TerrainGenerator):
+    """Contiguous lakes, deserts, grasslands and mountain ranges from smooth value noise.
+
+    Two noise fields are layered over ``octaves`` scales, starting at
+    ``scale`` cells between lattice points: elevation and moisture. Low
+    ground is water and high ground is mountain. The rest is desert where
+    it is dry and grass where it is wet. Levels are on the noise's 0..1
+    range. Lattice values are hashed from a key and their coordinates, so
+    any region is computed on its own and lines up with its neighbours.
+    """
+
+    def __init__(self, scale=24, octaves=3, water_level=0.4, mountain_level=0.62, desert_level=0.5):
+        if scale < 1 or octaves < 1:
+            raise ValueError('scale and octaves must be at least 1')
+        self.scale = scale
+        self.octaves = octaves
+        self.water_level = water_level
+        self.mountain_level = mountain_level
+        self.desert_level = desert_level
+
+    def bands(self, x, y, rng, band_rows):
+        key = self.draw_key(rng)
+        for start in range(0, x, band_rows):
+            yield self.region(key, start, 0, min(band_rows, x - start), y)
+
+    def region(self, key, row, col, rows, cols):
+        """Codes of the ``rows`` by ``cols`` block whose top-left cell is (``row``, ``col``)."""
+        elevation = self.noise(key, 0, row, col, rows, cols)
+        moisture = self.noise(key, 1, row, col, rows, cols)
+
+        codes = np.full((rows, cols), 4, dtype=np.uint8)
+        codes[moisture < self.desert_level] = 2
+        codes[elevation > self.mountain_level] = 3
+        codes[elevation < self.water_level] = 1
+        return codes
+
+    def noise(self, key, field, row, col, rows, cols):
+        total = np.zeros((rows, cols), dtype=np.float32)
+        amplitude = 1.0
+        amplitudes = 0.0
+        scale = float(self.scale)
+        for octave in range(self.octaves):
+            total += np.float32(amplitude) * self.value_noise(key, field * self.octaves + octave, row, col,
+                                                              rows, cols, scale)
+            amplitudes += amplitude
+            amplitude /= 2
+            scale = max(scale / 2, 1.0)
+        total /= np.float32(amplitudes)
+        return total
+
+    @staticmethod
+    def value_noise(key, layer, row, col, rows, cols, scale):
+        """Lattice values every ``scale`` cells, smoothly interpolated in between."""
+        def axis(start, count):
+            points = (np.arange(start, start + count, dtype=np.float64) + 0.5) / scale
+            index = np.floor(points).astype(np.int64)
+            t = (points - index).astype(np.float32)
+            return index, t * t * (3 - 2 * t)
+
+        i, t = axis(row, rows)
+        j, u = axis(col, cols)
+        lattice = lattice_values(key, layer, i[0], j[0], i[-1] - i[0] + 2, j[-1] - j[0] + 2)
+        i -= i[0]
+        j -= j[0]
+
+        # Separable: interpolate along the few lattice rows first, then down the cell rows.
+        across = lattice[:, j]
+        across += (lattice[:, j + 1] - across) * u
+        values = across[i]
+        values += (across[i + 1] - values) * t[:, None]
+        return values
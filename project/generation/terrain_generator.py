@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from project.core.simulation_random import SimulationRandom
+
+
+class TerrainGenerator(ABC):
+    """Builds a map as ``uint8`` cell codes (``TerrainGrid.cell_types``), whole arrays at a time.
+
+    Subclasses implement ``bands``, which yields the map top to bottom in
+    bands of at most ``band_rows`` rows. A file-backed map can then be
+    written band by band without ever holding the whole map in memory.
+    ``region`` builds any block of an unbounded map from a key alone, for
+    chunked worlds.
+    """
+
+    # Bands ``generate`` asks for, in cells; bounds the temporaries of the noise generators.
+    band_cells = 1 << 22
+
+    @staticmethod
+    def draw_key(rng):
+        high, low = rng.take_words(2)
+        return (high << 32) | low
+
+    @abstractmethod
+    def bands(self, x, y, rng, band_rows):
+        """Yield the ``x`` by ``y`` map top to bottom, in arrays of at most ``band_rows`` rows."""
+
+    def region(self, key, row, col, rows, cols):
+        """Codes of the ``rows`` by ``cols`` block whose top-left cell is (``row``, ``col``).
+
+        A pure function of its arguments. By default the block is generated from its own stream, seeded by
+        the key and its corner, so blocks do not line up with each other.
+        """
+        return self.generate(rows, cols, SimulationRandom(f'{key}:{row}:{col}'))
+
+    def generate(self, x, y, rng=None):
+        """The whole ``x`` by ``y`` map as one array."""
+        if rng is None:
+            rng = SimulationRandom()
+        cells = np.empty((x, y), dtype=np.uint8)
+        start = 0
+        for band in self.bands(x, y, rng, max(1, self.band_cells // max(y, 1))):
+            cells[start:start + len(band)] = band
+            start += len(band)
+        return cells
@@ -0,0 +1,17 @@
+import numpy as np
+
+from project.generation.terrain_generator import TerrainGenerator
+
+
+class UniformGenerator(TerrainGenerator):
+    """Every cell drawn independently, each type equally likely.
+
+    Same draws as ``Terrain.create_terrain`` without a generator, so a seed gives the same map.
+    """
+
+    def bands(self, x, y, rng, band_rows):
+        for start in range(0, x, band_rows):
+            rows = min(band_rows, x - start)
+            codes = rng.integers_array(4, rows * y, dtype=np.uint8)
+            codes += 1
+            yield codes.reshape(rows, y)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from project.generation.terrain_generator import TerrainGenerator
+
+
+class WeightedGenerator(TerrainGenerator):
+    """Every cell drawn independently, with one whole-number weight per type.
+
+    Weights are in ``TerrainGrid.cell_types`` order: water, desert, mountain, grass.
+    """
+
+    def __init__(self, weights):
+        if len(weights) != 4 or any(weight < 0 for weight in weights) or not sum(weights):
+            raise ValueError('need four non-negative terrain weights, not all zero')
+        self.weights = tuple(weights)
+        self.table = np.repeat(np.arange(1, 5, dtype=np.uint8), self.weights)
+
+    def bands(self, x, y, rng, band_rows):
+        for start in range(0, x, band_rows):
+            rows = min(band_rows, x - start)
+            yield self.table[rng.integers_array(len(self.table), rows * y)].reshape(rows, y)
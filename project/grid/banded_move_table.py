@@ -0,0 +1,46 @@
+from collections import OrderedDict
+
+from project.core.move_table import MoveTable
+
+
+class BandedMoveTable:
+    """The MoveTable of a TerrainGrid, built one band of rows at a time, on first use.
+
+    Meant for maps kept in a file, which may be bigger than memory, as a
+    whole table would be too. ``flags_at`` answers like a MoveTable's. A
+    band's flags are built from its rows plus the row on either side, the
+    first time an animal moves from it. Beyond ``max_bytes`` of flags the
+    band built first is dropped, and it is built again from the map if it
+    is needed later.
+    """
+
+    def __init__(self, grid, band_rows=None, max_bytes=1 << 26):
+        self.grid = grid
+        self.x = grid.x
+        self.y = grid.y
+        # Bands of about a million cells, like a LandIndex's.
+        self.band_rows = max(1, (1 << 20) // max(self.y, 1)) if band_rows is None else band_rows
+        self.max_bands = max(1, max_bytes // (self.band_rows * max(self.y, 1)))
+        self.bands = OrderedDict()
+
+    def flags_at(self, row, col):
+        band, local_row = divmod(row, self.band_rows)
+        flags = self.bands.get(band)
+        if flags is None:
+            flags = self._build_band(band)
+        return flags[local_row * self.y + col]
+
+    def _build_band(self, band):
+        top = band * self.band_rows
+        bottom = min(top + self.band_rows, self.x)
+        # The rows just outside the band, where there are any, so steps out of it see the right terrain.
+        first, last = max(top - 1, 0), min(bottom + 1, self.x)
+        water = self.grid.cell_codes['WATER']
+        window = MoveTable.from_water_rows(last - first, self.y,
+                                           ((row == water).tobytes() for row in self.grid.cells[first:last]))
+        flags = bytes(window.flags[(top - first) * self.y:(bottom - first) * self.y])
+
+        if len(self.bands) == self.max_bands:
+            self.bands.popitem(last=False)
+        self.bands[band] = flags
+        return flags
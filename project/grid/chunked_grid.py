@@ -0,0 +1,144 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from project.core.move_table import MoveTable
+from project.grid.terrain_grid import TerrainGrid
+
+
+class ChunkedGrid:
+    """A map of nominal size ``x`` by ``y``, generated in square chunks on first use.
+
+    Only ``cell_type``, ``cell_code``, ``x`` and ``y`` of TerrainGrid are
+    offered, so nothing can ask for the whole map at once. A chunk is built
+    from ``generator.region`` the first time one of its cells is read. So
+    its contents depend only on ``key`` and the chunk's coordinates, and a
+    chunk that was dropped is rebuilt identically when it is visited again.
+    Chunks are kept in least-recently-used order. Once they exceed
+    ``max_bytes``, ``evict`` drops the least recently used ones that hold
+    no animal or carcass, which keeps memory in line with the occupied
+    area rather than the nominal size.
+
+    ``flags_at`` answers like a MoveTable's. Move flags are built per chunk,
+    the first time an animal moves from it, and are dropped with the chunk.
+    A chunk can hold twice its cell count in bytes, and the budget allows
+    for that.
+    """
+
+    _cell_type_names = TerrainGrid._cell_type_names
+
+    def __init__(self, x, y, generator, key, chunk_size=256, max_bytes=1 << 26):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self.shape = (x, y)
+        self.generator = generator
+        self.key = key
+        self.chunk_size = chunk_size
+        self.max_chunks = max(1, max_bytes // (2 * chunk_size * chunk_size))
+        # Chunk coordinates to the chunk's codes, row-major, as bytes: indexing bytes is much cheaper than NumPy.
+        self.chunks = OrderedDict()
+        # Chunk coordinates to the chunk's MoveTable flags, for chunks in self.chunks only.
+        self.move_flags = {}
+        self.generated_count = 0
+        self.evicted_count = 0
+
+    @property
+    def x(self):
+        return self.shape[0]
+
+    @property
+    def y(self):
+        return self.shape[1]
+
+    @property
+    def nbytes(self):
+        return sum(len(chunk) for chunk in self.chunks.values()) + sum(len(flags) for flags in self.move_flags.values())
+
+    def chunk_of(self, row, col):
+        return row // self.chunk_size, col // self.chunk_size
+
+    def chunk(self, chunk_row, chunk_col):
+        """Codes of one chunk, generated if it is not loaded; marks it as the most recently used."""
+        chunk_key = (chunk_row, chunk_col)
+        codes = self.chunks.get(chunk_key)
+        if codes is None:
+            size = self.chunk_size
+            row, col = chunk_row * size, chunk_col * size
+            # Edge chunks are generated at full size too, so a chunk never depends on the map's size.
+            codes = self.generator.region(self.key, row, col, size, size).tobytes()
+            self.chunks[chunk_key] = codes
+            self.generated_count += 1
+        else:
+            self.chunks.move_to_end(chunk_key)
+        return codes
+
+    def cell_code(self, row, col):
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row, size)
+        chunk_col, local_col = divmod(col, size)
+        return self.chunk(chunk_row, chunk_col)[local_row * size + local_col]
+
+    def cell_type(self, row, col):
+        return self._cell_type_names[self.cell_code(row, col)]
+
+    def flags_at(self, row, col):
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row, size)
+        chunk_col, local_col = divmod(col, size)
+        flags = self.move_flags.get((chunk_row, chunk_col))
+        if flags is None:
+            flags = self.move_flags[chunk_row, chunk_col] = self._chunk_move_flags(chunk_row, chunk_col)
+        # Through chunk(), so a chunk only moved through still counts as recently used.
+        self.chunk(chunk_row, chunk_col)
+        return flags[local_row * size + local_col]
+
+    def _chunk_move_flags(self, chunk_row, chunk_col):
+        size = self.chunk_size
+        top, left = chunk_row * size, chunk_col * size
+        water_code = TerrainGrid.cell_codes['WATER']
+
+        def codes(chunk_row, chunk_col):
+            return np.frombuffer(self.chunk(chunk_row, chunk_col), dtype=np.uint8).reshape(size, size)
+
+        # The chunk and the facing edges of its four neighbours, which are loaded for it.
+        water = np.zeros((size + 2, size + 2), dtype=bool)
+        water[1:-1, 1:-1] = codes(chunk_row, chunk_col) == water_code
+        if top > 0:
+            water[0, 1:-1] = codes(chunk_row - 1, chunk_col)[-1] == water_code
+        if top + size < self.x:
+            water[-1, 1:-1] = codes(chunk_row + 1, chunk_col)[0] == water_code
+        if left > 0:
+            water[1:-1, 0] = codes(chunk_row, chunk_col - 1)[:, -1] == water_code
+        if left + size < self.y:
+            water[1:-1, -1] = codes(chunk_row, chunk_col + 1)[:, 0] == water_code
+
+        neighbours = {1: water[:-2, 1:-1], 2: water[2:, 1:-1], 3: water[1:-1, :-2], 4: water[1:-1, 2:]}
+        rows = np.arange(top, top + size)[:, None]
+        cols = np.arange(left, left + size)[None, :]
+        leaves_map = {1: rows == 0, 2: rows >= self.x - 1, 3: cols == 0, 4: cols >= self.y - 1}
+
+        flags = np.zeros((size, size), dtype=np.uint8)
+        for direction in (1, 2, 3, 4):
+            flags |= np.where(leaves_map[direction], MoveTable.BLOCKED[direction],
+                              neighbours[direction] * MoveTable.DROWNS[direction]).astype(np.uint8)
+        return flags.tobytes()
+
+    def evict(self, occupied_positions):
+        """Drop unoccupied chunks, least recently used first, until within budget.
+
+        ``occupied_positions`` is a callable giving every (row, col) with an
+        animal or carcass on it. It is only called when over budget. Returns
+        the number of chunks dropped.
+        """
+        if len(self.chunks) <= self.max_chunks:
+            return 0
+
+        chunk_size = self.chunk_size
+        occupied = {(row // chunk_size, col // chunk_size) for row, col in occupied_positions()}
+        excess = len(self.chunks) - self.max_chunks
+        evictable = [chunk_key for chunk_key in self.chunks if chunk_key not in occupied][:excess]
+        for chunk_key in evictable:
+            del self.chunks[chunk_key]
+            self.move_flags.pop(chunk_key, None)
+        self.evicted_count += len(evictable)
+        return len(evictable)
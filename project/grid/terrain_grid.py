@@ -0,0 +1,95 @@
+import numpy as np
+
+from project.core.simulation_random import SimulationRandom
+from project.generation.uniform_generator import UniformGenerator
+
+
+class TerrainGrid:
+    """Cell types of a whole map stored as one ``uint8`` array.
+
+    Codes match ``Terrain.terrain_cell_types``; code 0 is never used.
+    """
+
+    cell_types = {
+        1: 'WATER',
+        2: 'DESERT',
+        3: 'MOUNTAIN',
+        4: 'GRASS',
+    }
+
+    cell_codes = {cell_type: code for code, cell_type in cell_types.items()}
+
+    _cell_type_names = (None, 'WATER', 'DESERT', 'MOUNTAIN', 'GRASS')
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def random(cls, x, y, rng=None):
+        """Random map drawn from a SimulationRandom, cell for cell the same as ``Terrain.create_terrain``."""
+        if rng is None:
+            rng = SimulationRandom()
+        codes = rng.integers_array(len(cls.cell_types), x * y, dtype=np.uint8)
+        codes += 1
+        return cls(codes.reshape(x, y))
+
+    @classmethod
+    def generate(cls, x, y, generator, rng=None):
+        """Map built by a TerrainGenerator (see ``project.generation``)."""
+        return cls(generator.generate(x, y, rng))
+
+    @classmethod
+    def create_file(cls, path, x, y, rng=None, chunk_cells=1 << 24, generator=None):
+        """Generate a map straight into a ``.npy`` file, a band of rows at a time, and open it.
+
+        Without a ``generator`` cells are drawn uniformly in the same order as ``random``, so a given rng
+        state gives the same map either way.
+        """
+        if rng is None:
+            rng = SimulationRandom()
+        if generator is None:
+            generator = UniformGenerator()
+
+        cells = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(x, y))
+        start = 0
+        for band in generator.bands(x, y, rng, max(1, chunk_cells // max(y, 1))):
+            cells[start:start + len(band)] = band
+            start += len(band)
+        cells.flush()
+        del cells
+
+        return cls.open_file(path)
+
+    @classmethod
+    def open_file(cls, path, writable=False):
+        """Memory-map a map saved as ``.npy``; the OS pages in only the rows that are read."""
+        cells = np.load(path, mmap_mode='r+' if writable else 'r')
+        if cells.dtype != np.uint8 or cells.ndim != 2:
+            raise ValueError(f'{path} does not hold a 2-D uint8 terrain grid')
+        # A plain ndarray view of the mapping: memmap's Python-level indexing hooks are slow per cell.
+        return cls(np.asarray(cells))
+
+    @classmethod
+    def from_terrain_map(cls, terrain_map):
+        codes = [[cls.cell_codes[cell.cell_type] for cell in row] for row in terrain_map]
+        return cls(np.array(codes, dtype=np.uint8))
+
+    @property
+    def x(self):
+        return self.cells.shape[0]
+
+    @property
+    def y(self):
+        return self.cells.shape[1]
+
+    def cell_code(self, row, col):
+        return int(self.cells[row, col])
+
+    def cell_type(self, row, col):
+        return self._cell_type_names[self.cells[row, col]]
+
+    def mask(self, cell_type):
+        return self.cells == self.cell_codes[cell_type]
+
+    def water_mask(self):
+        return self.mask('WATER')
@@ -0,0 +1,46 @@
+class TerrainMapView:
+    """Read-only ``terrain_map[row][col]`` view over a TerrainGrid.
+
+    Cell objects are only built when a cell is actually indexed.
+    """
+
+    def __init__(self, grid, terrain_cell_factory):
+        self.grid = grid
+        self.terrain_cell_factory = terrain_cell_factory
+
+    def __len__(self):
+        return self.grid.x
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.grid.x:
+            if -self.grid.x <= row < 0:
+                row += self.grid.x
+            else:
+                raise IndexError('terrain map row out of range')
+        return TerrainMapRowView(self, row)
+
+    def __iter__(self):
+        for row in range(self.grid.x):
+            yield TerrainMapRowView(self, row)
+
+
+class TerrainMapRowView:
+    def __init__(self, terrain_map, row):
+        self.terrain_map = terrain_map
+        self.row = row
+
+    def __len__(self):
+        return self.terrain_map.grid.y
+
+    def __getitem__(self, col):
+        grid = self.terrain_map.grid
+        if not 0 <= col < grid.y:
+            if -grid.y <= col < 0:
+                col += grid.y
+            else:
+                raise IndexError('terrain map column out of range')
+        return self.terrain_map.terrain_cell_factory.create_terrain_cell(grid.cell_type(self.row, col))
+
+    def __iter__(self):
+        for col in range(len(self)):
+            yield self[col]
@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+import numpy as np
+
+from project.history.history_recorder import HistoryRecorder
+
+# One block of a history file; columns are views into the mapped file.
+HistoryBlock = namedtuple('HistoryBlock', ['kind', 'day', 'count', 'columns'])
+
+
+class HistoryFile:
+    """A file written by HistoryRecorder, memory-mapped read-only.
+
+    Opening it reads only the block headers. Every column is a view into
+    the mapping, so no row is parsed or copied until it is used. Blocks
+    that are still incomplete, because the run is still going or crashed
+    mid-write, are ignored.
+    """
+
+    def __init__(self, path):
+        header, _ = HistoryRecorder.read_header(path)
+        self.path = path
+        self.day_columns = dict(header['day_columns'])
+        self.snapshot_columns = dict(header['snapshot_columns'])
+        self.blocks = []
+
+        blocks = list(HistoryRecorder.blocks(path))
+        if not blocks:
+            return
+        # Viewed as a plain ndarray, so the columns sliced from it are plain arrays rather than memmap objects.
+        mapping = np.asarray(np.memmap(path, np.uint8, 'r'))
+        for kind, count, day, offset, _ in blocks:
+            columns = self.day_columns if kind == b'DAYS' else self.snapshot_columns
+            arrays = {}
+            for name, dtype in columns.items():
+                arrays[name] = mapping[offset:offset + count * np.dtype(dtype).itemsize].view(dtype)
+                offset += HistoryRecorder.body_size({name: dtype}, count)
+            self.blocks.append(HistoryBlock(kind.decode('ascii'), day, count, arrays))
+
+    def days(self):
+        """Each day column over the whole run: a view if it was written as one block, else concatenated."""
+        blocks = [block.columns for block in self.blocks if block.kind == 'DAYS']
+        if len(blocks) == 1:
+            return dict(blocks[0])
+        return {name: np.concatenate([block[name] for block in blocks]) if blocks else np.empty(0, dtype)
+                for name, dtype in self.day_columns.items()}
+
+    def snapshot_days(self):
+        return [block.day for block in self.blocks if block.kind == 'SNAP']
+
+    def snapshot(self, day):
+        """Columns of the position snapshot taken on ``day``."""
+        for block in self.blocks:
+            if block.kind == 'SNAP' and block.day == day:
+                return block.columns
+        raise KeyError(f'no snapshot for day {day}')
@@ -0,0 +1,203 @@
+import json
+import os
+import struct
+from array import array
+
+import numpy as np
+
+from project.core.population_counters import PopulationCounters
+from project.terrain import Terrain
+
+
+def _aligned(size, alignment):
+    return -(-size // alignment) * alignment
+
+
+class HistoryRecorder:
+    """Per-day time series of a Terrain, appended to a file in fixed-width column blocks.
+
+    Attach it as ``Terrain(..., history_recorder=...)`` and ``activate_animals``
+    calls ``record_day`` at the end of every day. A day is one row of
+    ``day_columns``: running totals alive, dead and eaten by species, running
+    deaths by cause, and the number of carcasses. Rows wait in a buffer of
+    ``buffer_days`` and are written as one block when it fills, so memory
+    stays the same however long the run. With ``snapshot_every`` K, every
+    K-th day also writes a block with the species, status and position of
+    every animal and carcass.
+
+    File layout:
+    - the magic bytes, then the format version and header length as
+      little-endian ``uint32``;
+    - a JSON header with both column schemas;
+    - blocks, each at a 64-byte aligned offset: a ``block_header`` giving
+      its kind (``DAYS`` or ``SNAP``), row count, day and body size, then
+      one raw little-endian column after another, each 64-byte aligned.
+
+    The file is only ever appended to. Opening an existing history continues
+    it, after a checkpoint resume for example. ``HistoryFile`` maps it back
+    as arrays.
+    """
+
+    magic = b'TSIMHIST'
+    version = 1
+    alignment = 64
+    block_header = struct.Struct('<4sIiIQ')
+
+    day_columns = {
+        'day': '<i4',
+        **{f'{status}_{animal_type}': '<i8' for status in ('alive', 'dead', 'eaten')
+           for animal_type in Terrain.animal_types.values()},
+        **{f'deaths_{cause}': '<i8' for cause in PopulationCounters.death_causes},
+        'carcasses': '<i8',
+    }
+
+    # species holds Terrain.animal_types codes; alive is 0 for carcasses.
+    snapshot_columns = {'species': '<u1', 'alive': '<u1', 'rows': '<i4', 'cols': '<i4'}
+
+    animal_types = tuple(Terrain.animal_types.values())
+
+    species_codes = {animal_type: code for code, animal_type in Terrain.animal_types.items()}
+
+    def __init__(self, path, buffer_days=256, snapshot_every=None):
+        if buffer_days < 1:
+            raise ValueError('buffer_days must be at least 1')
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.buffer_days = buffer_days
+        # Rows of day_columns back to back, preallocated: memory does not grow with the run.
+        self.buffer = array('q', bytes(8 * len(self.day_columns) * buffer_days))
+        self.buffered = 0
+        self.blocks_written = 0
+
+        header = {'day_columns': [[name, dtype] for name, dtype in self.day_columns.items()],
+                  'snapshot_columns': [[name, dtype] for name, dtype in self.snapshot_columns.items()]}
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+            preamble_size = len(self.magic) + 8 + len(header_bytes)
+            self.file.write(self.magic)
+            self.file.write(struct.pack('<II', self.version, len(header_bytes)))
+            self.file.write(header_bytes)
+            self.file.write(bytes(_aligned(preamble_size, self.alignment) - preamble_size))
+            self.file.flush()
+        else:
+            self.file.close()
+            existing, end = self.read_header(path)
+            if existing != header:
+                raise ValueError(f'{path} holds a history with different columns')
+            for *_, body_offset, body_size in self.blocks(path):
+                end = body_offset + body_size
+            # A block cut short by a crash is dropped, so new blocks start where the reader expects them.
+            self.file = open(path, 'ab')
+            if end != self.file.tell():
+                self.file.truncate(end)
+
+    @classmethod
+    def read_header(cls, path):
+        """The JSON header of a history file, and the offset of its first block."""
+        with open(path, 'rb') as file:
+            if file.read(len(cls.magic)) != cls.magic:
+                raise ValueError(f'{path} is not a simulation history')
+            version, header_size = struct.unpack('<II', file.read(8))
+            if version != cls.version:
+                raise ValueError(f'{path}: unsupported history version {version}')
+            header = json.loads(file.read(header_size).decode('utf-8'))
+        return header, _aligned(len(cls.magic) + 8 + header_size, cls.alignment)
+
+    @classmethod
+    def blocks(cls, path):
+        """``(kind, count, day, body_offset, body_size)`` of every complete block, in file order.
+
+        A block still being written, or cut short by a crash, is left out.
+        """
+        _, offset = cls.read_header(path)
+        size = os.path.getsize(path)
+        header_size = _aligned(cls.block_header.size, cls.alignment)
+        with open(path, 'rb') as file:
+            while offset + header_size <= size:
+                file.seek(offset)
+                kind, count, day, _, body_size = cls.block_header.unpack(file.read(cls.block_header.size))
+                body_offset = offset + header_size
+                if body_offset + body_size > size:
+                    break
+                yield kind, count, day, body_offset, body_size
+                offset = body_offset + body_size
+
+    @classmethod
+    def body_size(cls, columns, count):
+        return sum(_aligned(count * np.dtype(dtype).itemsize, cls.alignment) for dtype in columns.values())
+
+    def __len__(self):
+        """Days waiting in the buffer."""
+        return self.buffered
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_day(self, terrain):
+        counters = terrain.counters
+        alive, dead, eaten, deaths = counters.alive, counters.dead, counters.eaten, counters.deaths
+        row = [terrain.day]
+        row += [alive[animal_type] for animal_type in self.animal_types]
+        row += [dead[animal_type] for animal_type in self.animal_types]
+        row += [eaten[animal_type] for animal_type in self.animal_types]
+        row += [deaths[cause] for cause in PopulationCounters.death_causes]
+        row.append(len(terrain.carcass_store))
+        start = self.buffered * len(row)
+        self.buffer[start:start + len(row)] = array('q', row)
+        self.buffered += 1
+        if self.buffered == self.buffer_days:
+            self.flush()
+
+        if self.snapshot_every and terrain.day % self.snapshot_every == 0:
+            self.record_snapshot(terrain)
+
+    def record_snapshot(self, terrain):
+        """Write every animal and carcass of ``terrain`` as one block, straight away."""
+        live = terrain.animals_locations
+        carcasses = terrain.carcass_store
+        count = len(live) + len(carcasses)
+        species_codes = self.species_codes
+
+        def animals():
+            yield from live.items()
+            yield from carcasses.items()
+
+        species = np.fromiter((species_codes[animal.animal_type] for animal, _ in animals()), np.uint8, count)
+        alive = np.zeros(count, dtype=np.uint8)
+        alive[:len(live)] = 1
+        rows = np.fromiter((position[0] for _, position in animals()), np.int32, count)
+        cols = np.fromiter((position[1] for _, position in animals()), np.int32, count)
+        self._write_block(b'SNAP', terrain.day, self.snapshot_columns,
+                          {'species': species, 'alive': alive, 'rows': rows, 'cols': cols})
+
+    def flush(self):
+        """Write the buffered days as one block."""
+        if not self.buffered:
+            return
+        count = self.buffered
+        rows = np.frombuffer(self.buffer, dtype=np.int64, count=count * len(self.day_columns)).reshape(count, -1)
+        arrays = {name: rows[:, index] for index, name in enumerate(self.day_columns)}
+        self._write_block(b'DAYS', int(rows[0, 0]), self.day_columns, arrays)
+        self.buffered = 0
+
+    def _write_block(self, kind, day, columns, arrays):
+        count = len(next(iter(arrays.values())))
+        file = self.file
+        header = self.block_header.pack(kind, count, day, 0, self.body_size(columns, count))
+        file.write(header)
+        file.write(bytes(_aligned(len(header), self.alignment) - len(header)))
+        for name, dtype in columns.items():
+            data = np.ascontiguousarray(arrays[name], dtype=dtype).tobytes()
+            file.write(data)
+            file.write(bytes(_aligned(len(data), self.alignment) - len(data)))
+        file.flush()
+        self.blocks_written += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -0,0 +1,52 @@
+"""Estimate species survival over many seeded runs: ``python -m project.montecarlo --runs 1000 --days 20``."""
+import argparse
+import json
+import sys
+
+from project.montecarlo.monte_carlo_runner import MonteCarloRunner
+from project.montecarlo.run_summary import SimulationParameters
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m project.montecarlo',
+                                     description='Run replicate simulations across a process pool.')
+    parser.add_argument('--rows', type=int, default=10, help='terrain rows (Terrain x)')
+    parser.add_argument('--cols', type=int, default=10, help='terrain columns (Terrain y)')
+    parser.add_argument('--animals', type=int, default=50, help='animals per run')
+    parser.add_argument('--days', type=int, default=20, help='days per run')
+    parser.add_argument('--runs', type=int, default=100, help='number of replicates')
+    parser.add_argument('--first-seed', type=int, default=0, help='replicates use seeds first-seed, first-seed + 1, ...')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--grid', action='store_true', help='store each terrain as a NumPy grid')
+    parser.add_argument('--carcass-ttl', type=int, default=None, help='days a carcass lasts before it decomposes')
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help='output format')
+    return parser.parse_args(argv)
+
+
+def format_text(curves):
+    animal_types = curves.animal_types
+    lines = [f'{curves.runs} runs, survival rate and mean alive per species',
+             'day  ' + '  '.join(f'{animal_type:>18}' for animal_type in animal_types)]
+    for day in range(curves.days + 1):
+        cells = [f'{curves.survival_rate(animal_type)[day]:>8.1%} {curves.mean_alive(animal_type)[day]:>9.2f}'
+                 for animal_type in animal_types]
+        lines.append(f'{day:<4} ' + '  '.join(cells))
+    return '\n'.join(lines)
+
+
+def main(argv=None, stdout=None):
+    args = parse_args(argv)
+    stdout = sys.stdout if stdout is None else stdout
+
+    parameters = SimulationParameters(args.rows, args.cols, args.animals, args.days, args.carcass_ttl, args.grid)
+    curves = MonteCarloRunner(parameters, args.workers).run(range(args.first_seed, args.first_seed + args.runs))
+
+    if args.format == 'json':
+        stdout.write(json.dumps(curves.snapshot()) + '\n')
+    else:
+        stdout.write(format_text(curves) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
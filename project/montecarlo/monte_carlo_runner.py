@@ -0,0 +1,49 @@
+import os
+from functools import partial
+from multiprocessing import Pool
+
+from project.montecarlo.run_summary import run_replicate
+from project.montecarlo.survival_curves import SurvivalCurves
+from project.terrain import Terrain
+
+
+class MonteCarloRunner:
+    """Runs replicates of one SimulationParameters set, one per seed, across a process pool.
+
+    Workers send back a RunSummary per run (a few hundred bytes), never the
+    Terrain itself. Replicates go to the pool in chunks, which keeps the
+    inter-process traffic small next to the simulation work, and
+    ``imap_unordered`` hands summaries back as soon as they finish. Every
+    summary is added to ``curves`` on arrival. ``workers=1`` runs in this
+    process without a pool.
+    """
+
+    def __init__(self, parameters, workers=None, chunksize=None):
+        self.parameters = parameters
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunksize = chunksize
+        self.curves = SurvivalCurves(Terrain.animal_types.values(), parameters.days)
+
+    def summaries(self, seeds):
+        """Yield RunSummary records in completion order, adding each one to ``curves``."""
+        seeds = list(seeds)
+        replicate = partial(run_replicate, self.parameters)
+
+        if self.workers <= 1 or len(seeds) <= 1:
+            for seed in seeds:
+                summary = replicate(seed)
+                self.curves.add(summary)
+                yield summary
+            return
+
+        workers = min(self.workers, len(seeds))
+        chunksize = self.chunksize or max(1, len(seeds) // (workers * 4))
+        with Pool(workers) as pool:
+            for summary in pool.imap_unordered(replicate, seeds, chunksize):
+                self.curves.add(summary)
+                yield summary
+
+    def run(self, seeds):
+        for _ in self.summaries(seeds):
+            pass
+        return self.curves
@@ -0,0 +1,31 @@
+from collections import namedtuple
+
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+
+SimulationParameters = namedtuple('SimulationParameters',
+                                  ['x', 'y', 'animals_count', 'days', 'carcass_ttl', 'grid_mode'],
+                                  defaults=(None, False))
+
+# ``alive`` maps each animal type to its living count on days 0..days; days after extinction count 0.
+RunSummary = namedtuple('RunSummary', ['seed', 'days_run', 'alive', 'dead_total', 'eaten_total'])
+
+
+def run_replicate(parameters, seed):
+    """Run one seeded simulation and keep only what the survival curves need."""
+    terrain = Terrain(parameters.x, parameters.y, parameters.animals_count,
+                      carcass_store=CarcassStore(ttl=parameters.carcass_ttl), seed=seed)
+    terrain.create_terrain(grid_mode=parameters.grid_mode)
+    terrain.fill_with_animals()
+
+    counters = terrain.counters
+    alive = {animal_type: [count] for animal_type, count in counters.alive.items()}
+
+    for summary in terrain.run(parameters.days):
+        for animal_type, count in summary.alive._asdict().items():
+            alive[animal_type].append(count)
+
+    days_run = terrain.day
+    padding = [0] * (parameters.days - days_run)
+    return RunSummary(seed, days_run, {animal_type: tuple(counts + padding) for animal_type, counts in alive.items()},
+                      counters.dead_total, counters.eaten_total)
@@ -0,0 +1,42 @@
+class SurvivalCurves:
+    """Per-species survival aggregated over replicate runs, one RunSummary at a time.
+
+    For every day 0..days it keeps the number of runs in which the species
+    still had a living animal, and the sum of its living counts. So
+    summaries can be added in any order as they arrive from workers, and the
+    result does not depend on that order.
+    """
+
+    def __init__(self, animal_types, days):
+        self.animal_types = tuple(animal_types)
+        self.days = days
+        self.runs = 0
+        self.surviving_runs = {animal_type: [0] * (days + 1) for animal_type in self.animal_types}
+        self.alive_sums = {animal_type: [0] * (days + 1) for animal_type in self.animal_types}
+
+    def add(self, summary):
+        self.runs += 1
+        for animal_type in self.animal_types:
+            surviving = self.surviving_runs[animal_type]
+            sums = self.alive_sums[animal_type]
+            for day, count in enumerate(summary.alive[animal_type]):
+                sums[day] += count
+                if count:
+                    surviving[day] += 1
+
+    def survival_rate(self, animal_type):
+        """Fraction of runs in which ``animal_type`` is still alive, per day."""
+        runs = self.runs or 1
+        return [surviving / runs for surviving in self.surviving_runs[animal_type]]
+
+    def mean_alive(self, animal_type):
+        runs = self.runs or 1
+        return [total / runs for total in self.alive_sums[animal_type]]
+
+    def snapshot(self):
+        return {
+            'runs': self.runs,
+            'days': self.days,
+            'survival_rate': {animal_type: self.survival_rate(animal_type) for animal_type in self.animal_types},
+            'mean_alive': {animal_type: self.mean_alive(animal_type) for animal_type in self.animal_types},
+        }
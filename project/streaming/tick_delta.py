@@ -0,0 +1,103 @@
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+# One frame per tick: a fixed header, then one column per field of each section, little-endian.
+#   spawned:    ids u32, rows u32, cols u32, species u8 (Terrain.animal_types codes)
+#   moved:      ids u32, rows u32, cols u32 (the new position)
+#   died:       ids u32, rows u32, cols u32 (where the carcass lies)
+#   eaten:      ids u32
+#   decomposed: ids u32
+# Sections are applied in that order. A keyframe holds the whole map as spawned (and died, for carcasses)
+# and replaces whatever state the reader had.
+MAGIC = b'TDLT'
+VERSION = 1
+KEYFRAME = 1
+
+frame_header = struct.Struct('<4sBBxxI5I')
+
+TickDelta = namedtuple('TickDelta', ['day', 'keyframe', 'spawned', 'moved', 'died', 'eaten', 'decomposed'])
+
+
+def _column(typecode, values=()):
+    column = array(typecode, values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_frame(day, spawned, moved, died, eaten, decomposed, flags=0):
+    """Encode one tick. ``spawned`` is ``(ids, rows, cols, species)``, ``moved`` and ``died`` are ``(ids, rows,
+    cols)``, and ``eaten`` and ``decomposed`` are id sequences; each sequence is an array or list."""
+    parts = [frame_header.pack(MAGIC, VERSION, flags, day, len(spawned[0]), len(moved[0]), len(died[0]),
+                               len(eaten), len(decomposed))]
+    for column in spawned[:3]:
+        parts.append(_column('I', column))
+    parts.append(bytes(spawned[3]))
+    for section in (moved, died):
+        for column in section:
+            parts.append(_column('I', column))
+    parts.append(_column('I', eaten))
+    parts.append(_column('I', decomposed))
+    return b''.join(parts)
+
+
+def decode_frame(frame):
+    """A TickDelta of lists of tuples: spawned ``(id, row, col, species)``, moved and died ``(id, row, col)``."""
+    magic, version, flags, day, *counts = frame_header.unpack_from(frame)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a tick delta frame')
+    offset = frame_header.size
+
+    def take(typecode, count):
+        nonlocal offset
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(frame[offset:offset + size])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        offset += size
+        return column.tolist()
+
+    spawned_count, moved_count, died_count, eaten_count, decomposed_count = counts
+    spawned = list(zip(take('I', spawned_count), take('I', spawned_count), take('I', spawned_count),
+                       take('B', spawned_count)))
+    moved = list(zip(take('I', moved_count), take('I', moved_count), take('I', moved_count)))
+    died = list(zip(take('I', died_count), take('I', died_count), take('I', died_count)))
+    eaten = take('I', eaten_count)
+    decomposed = take('I', decomposed_count)
+    if offset != len(frame):
+        raise ValueError('tick delta frame has trailing bytes')
+    return TickDelta(day, bool(flags & KEYFRAME), spawned, moved, died, eaten, decomposed)
+
+
+class DeltaMirror:
+    """Rebuilds the map's animals from a stream of frames, the way an observer would.
+
+    ``animals`` maps each id to ``[species code, (row, col), alive]``.
+    """
+
+    def __init__(self):
+        self.animals = {}
+        self.day = None
+
+    def apply(self, frame):
+        delta = decode_frame(frame)
+        if delta.keyframe:
+            self.animals = {}
+        animals = self.animals
+        for animal_id, row, col, species in delta.spawned:
+            animals[animal_id] = [species, (row, col), True]
+        for animal_id, row, col in delta.moved:
+            animals[animal_id][1] = (row, col)
+        for animal_id, row, col in delta.died:
+            animal = animals[animal_id]
+            animal[1] = (row, col)
+            animal[2] = False
+        for animal_id in delta.eaten:
+            del animals[animal_id]
+        for animal_id in delta.decomposed:
+            del animals[animal_id]
+        self.day = delta.day
+        return delta
@@ -0,0 +1,211 @@
+import asyncio
+import struct
+
+from project.streaming.tick_delta_recorder import TickDeltaRecorder
+
+# Frames on a socket are prefixed with their length.
+frame_length = struct.Struct('<I')
+
+policies = ('drop', 'sample')
+
+
+class QueueSubscriber:
+    """An in-process subscriber: frames wait in a queue until read with ``async for`` or ``drain``.
+
+    When ``max_frames`` frames are already waiting, the ``drop`` policy
+    disconnects the subscriber. Its backlog is discarded and iteration
+    ends with ``dropped`` set. The ``sample`` policy skips frames instead.
+    The next frame that fits is then replaced by a keyframe of the whole
+    map, so the reader's state stays correct, only coarser.
+    """
+
+    def __init__(self, max_frames=64, policy='drop'):
+        if policy not in policies:
+            raise ValueError(f'policy must be one of {policies}, not {policy!r}')
+        self.max_frames = max_frames
+        self.policy = policy
+        self.queue = asyncio.Queue()
+        self.closed = False
+        self.dropped = False
+        self.stale = False
+        self.skipped = 0
+
+    def offer(self, frame, keyframe):
+        """Queue ``frame`` without waiting; ``keyframe()`` builds a catch-up frame. False once disconnected."""
+        if self.closed:
+            return False
+        if self.queue.qsize() >= self.max_frames:
+            if self.policy == 'drop':
+                self.dropped = True
+                self.close()
+                return False
+            self.skipped += 1
+            self.stale = True
+            return True
+        if self.stale:
+            frame = keyframe()
+            self.stale = False
+        self.queue.put_nowait(frame)
+        return True
+
+    def close(self, keyframe=None):
+        """End the stream; a sampled subscriber that is behind first gets ``keyframe()`` to finish in sync."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.dropped:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        elif self.stale and keyframe is not None:
+            self.queue.put_nowait(keyframe())
+        self.queue.put_nowait(None)
+
+    def drain(self):
+        """Every frame waiting right now, without blocking."""
+        frames = []
+        while not self.queue.empty():
+            frame = self.queue.get_nowait()
+            if frame is None:
+                self.queue.put_nowait(None)
+                break
+            frames.append(frame)
+        return frames
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.queue.get()
+        if frame is None:
+            self.queue.put_nowait(None)
+            raise StopAsyncIteration
+        return frame
+
+
+class SocketSubscriber:
+    """A connection on the publisher's socket, with length-prefixed frames written straight to the transport.
+
+    Backpressure is measured as bytes the transport has not sent yet. Over
+    ``max_buffer`` the same ``drop`` / ``sample`` policies apply as for a
+    QueueSubscriber.
+    """
+
+    def __init__(self, writer, max_buffer=1 << 20, policy='drop'):
+        if policy not in policies:
+            raise ValueError(f'policy must be one of {policies}, not {policy!r}')
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.policy = policy
+        self.closed = False
+        self.dropped = False
+        self.stale = False
+        self.skipped = 0
+
+    def offer(self, frame, keyframe):
+        if self.closed or self.writer.is_closing():
+            self.closed = True
+            return False
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            if self.policy == 'drop':
+                self.dropped = True
+                self.close()
+                return False
+            self.skipped += 1
+            self.stale = True
+            return True
+        if self.stale:
+            frame = keyframe()
+            self.stale = False
+        self.writer.write(frame_length.pack(len(frame)))
+        self.writer.write(frame)
+        return True
+
+    def close(self, keyframe=None):
+        if self.closed:
+            return
+        self.closed = True
+        if self.stale and keyframe is not None and not self.writer.is_closing():
+            frame = keyframe()
+            self.writer.write(frame_length.pack(len(frame)))
+            self.writer.write(frame)
+        self.writer.close()
+
+
+async def read_frames(reader):
+    """Frames from a publisher's socket, until it closes the connection."""
+    while True:
+        try:
+            header = await reader.readexactly(frame_length.size)
+        except asyncio.IncompleteReadError:
+            return
+        yield await reader.readexactly(frame_length.unpack(header)[0])
+
+
+class TickDeltaPublisher:
+    """Runs a Terrain inside an event loop and sends each tick's changes to every subscriber.
+
+    Each tick becomes one binary frame (see ``project.streaming.tick_delta``)
+    built from the terrain's TickDeltaRecorder, one is attached if needed.
+    Frames go to in-process QueueSubscribers and to clients of a local Unix
+    socket. New subscribers start with a keyframe of the current map.
+    Publishing never waits for a subscriber, so a slow one is dropped or
+    sampled instead of holding up the simulation.
+    """
+
+    def __init__(self, terrain):
+        if terrain.delta_recorder is None:
+            terrain.delta_recorder = TickDeltaRecorder()
+        self.terrain = terrain
+        self.recorder = terrain.delta_recorder
+        self.subscribers = []
+        self.frames_published = 0
+        self._keyframe = None
+
+    def keyframe(self):
+        """The whole map as one frame, built at most once between ticks."""
+        if len(self.recorder):
+            # Changes made outside a tick, such as the initial spawn, go out first.
+            self.publish(self.recorder.flush(self.terrain.day))
+        if self._keyframe is None:
+            self._keyframe = self.recorder.keyframe(self.terrain)
+        return self._keyframe
+
+    def add_subscriber(self, subscriber):
+        if subscriber.offer(self.keyframe(), self.keyframe):
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def subscribe(self, max_frames=64, policy='drop'):
+        return self.add_subscriber(QueueSubscriber(max_frames, policy))
+
+    async def serve(self, path, max_buffer=1 << 20, policy='drop'):
+        """Listen on a Unix socket at ``path``; each connection is a SocketSubscriber. Returns the server."""
+        async def connected(reader, writer):
+            subscriber = self.add_subscriber(SocketSubscriber(writer, max_buffer, policy))
+            # Clients only listen; reading returns once they hang up.
+            await reader.read()
+            subscriber.close()
+
+        return await asyncio.start_unix_server(connected, path)
+
+    def publish(self, frame):
+        self._keyframe = None
+        self.frames_published += 1
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber.offer(frame, self.keyframe)]
+
+    async def run(self, days, interval=0.0):
+        """Simulate up to ``days`` days, publishing a frame after each and yielding to the loop in between."""
+        if len(self.recorder):
+            self.publish(self.recorder.flush(self.terrain.day))
+        days_run = 0
+        for summary in self.terrain.run(days):
+            self.publish(self.recorder.flush(summary.day))
+            days_run += 1
+            await asyncio.sleep(interval)
+        return days_run
+
+    def close(self):
+        """Disconnect every subscriber; queue readers still get what is waiting, and lagging ones a keyframe."""
+        for subscriber in self.subscribers:
+            subscriber.close(self.keyframe)
+        self.subscribers = []
@@ -0,0 +1,97 @@
+from array import array
+
+from project.streaming.tick_delta import KEYFRAME, encode_frame
+from project.terrain import Terrain
+
+
+class TickDeltaRecorder:
+    """Collects what changes on a Terrain between frames: spawns, moves, deaths, meals and decompositions.
+
+    Attach it as ``Terrain(..., delta_recorder=...)``; the terrain calls it
+    as things happen, so nobody has to diff ``animals_locations``. Animals
+    get integer ids on first sight, counting up from 0. An id is never
+    reused, so it names one animal for the whole stream. An animal leaves
+    the id table once it is eaten or decomposes, so the table holds the
+    living animals and carcasses, while ``next_id`` keeps growing.
+    """
+
+    species_codes = {animal_type: code for code, animal_type in Terrain.animal_types.items()}
+
+    def __init__(self):
+        self.ids = {}
+        self.next_id = 0
+        self.clear()
+
+    def clear(self):
+        self.spawned_columns = (array('I'), array('I'), array('I'), bytearray())
+        self.moved_columns = (array('I'), array('I'), array('I'))
+        self.died_columns = (array('I'), array('I'), array('I'))
+        self.eaten_ids = array('I')
+        self.decomposed_ids = array('I')
+
+    def __len__(self):
+        """Changes waiting for the next frame."""
+        return (len(self.spawned_columns[0]) + len(self.moved_columns[0]) + len(self.died_columns[0])
+                + len(self.eaten_ids) + len(self.decomposed_ids))
+
+    def _id(self, animal):
+        animal_id = self.ids.get(animal)
+        if animal_id is None:
+            animal_id = self.ids[animal] = self.next_id
+            self.next_id += 1
+        return animal_id
+
+    def spawned(self, animal, position):
+        ids, rows, cols, species = self.spawned_columns
+        ids.append(self._id(animal))
+        rows.append(position[0])
+        cols.append(position[1])
+        species.append(self.species_codes[animal.animal_type])
+
+    def moved(self, animal, position):
+        ids, rows, cols = self.moved_columns
+        ids.append(self._id(animal))
+        rows.append(position[0])
+        cols.append(position[1])
+
+    def died(self, animal, position):
+        ids, rows, cols = self.died_columns
+        ids.append(self._id(animal))
+        rows.append(position[0])
+        cols.append(position[1])
+
+    def eaten(self, animal):
+        animal_id = self.ids.pop(animal, None)
+        if animal_id is not None:
+            self.eaten_ids.append(animal_id)
+
+    def decomposed(self, animal, position):
+        animal_id = self.ids.pop(animal, None)
+        if animal_id is not None:
+            self.decomposed_ids.append(animal_id)
+
+    def flush(self, day):
+        """Encode everything recorded since the last flush as one frame and start a new one."""
+        frame = encode_frame(day, self.spawned_columns, self.moved_columns, self.died_columns, self.eaten_ids,
+                             self.decomposed_ids)
+        self.clear()
+        return frame
+
+    def keyframe(self, terrain):
+        """The whole population of ``terrain`` as one frame, for readers that join late or fell behind.
+
+        Walks every animal and carcass, so it is only built on demand.
+        """
+        spawned = (array('I'), array('I'), array('I'), bytearray())
+        died = (array('I'), array('I'), array('I'))
+        species_codes = self.species_codes
+        for animals, dead in ((terrain.animals_locations.items(), False), (terrain.carcass_store.items(), True)):
+            for animal, (row, col) in animals:
+                animal_id = self._id(animal)
+                for column, value in zip(spawned, (animal_id, row, col, species_codes[animal.animal_type])):
+                    column.append(value)
+                if dead:
+                    for column, value in zip(died, (animal_id, row, col)):
+                        column.append(value)
+        no_moves = (array('I'), array('I'), array('I'))
+        return encode_frame(terrain.day, spawned, no_moves, died, (), (), flags=KEYFRAME)
@@ -1,10 +1,19 @@
-import random
+import gc
+import os
+from itertools import chain, compress, repeat
+from operator import attrgetter
 
-from project.animal.carnivore import Carnivore
-from project.animal.herbivore import Herbivore
-from project.animal.scavenger import Scavenger
 from project.core.animal_factory import AnimalFactory
+from project.core.carcass_store import CarcassStore
+from project.core.day_summary import day_summary
+from project.core.land_index import LandIndex
+from project.core.move_table import MoveTable
+from project.core.occupancy_index import OccupancyIndex
+from project.core.population_counters import PopulationCounters
+from project.core.position_buffer import PositionBuffer
+from project.core.simulation_random import SimulationRandom
 from project.core.terrain_cell_factory import TerrainCellFactory
+from project.events.simulation_event import ALL_ANIMALS_DEAD, BORDER_BLOCKED, HUNGER_DEATH, WATER_DEATH
 
 
 class Terrain:
@@ -29,93 +38,445 @@ class Terrain:
         4: 'right'
     }
 
-    def __init__(self, x, y, animals_count):
+    # Water draws in a row after which a chunked world's spawn area is taken to have no land.
+    max_water_draws = 1 << 16
+
+    def __init__(self, x, y, animals_count, event_sink=None, carcass_store=None, track_cell_counts=False,
+                 seed=None, profiler=None, flyweight_cells=False, delta_recorder=None,
+                 history_recorder=None):
         self.x = x
         self.y = y
         self.animals_count = animals_count
-
-        self.terrain_map = []
-        self.animals_locations = {}
+        self.day = 0
+        self.event_sink = event_sink
+        self.profiler = profiler
+        # Told about every spawn, move, death, meal and decomposition, for streaming deltas to observers.
+        self.delta_recorder = delta_recorder
+        # Given the terrain at the end of every day, to keep a per-day time series (project.history).
+        self.history_recorder = history_recorder
+        # Every random draw of this terrain comes from here, so a seed reproduces the whole run.
+        self.rng = SimulationRandom(seed)
+
+        self.grid = None
+        self.chunked_grid = None
+        # Built at the first tick (the land index at the first fill) after the map is set; set them back to None
+        # after editing cells in place.
+        self.move_table = None
+        self.land_index = None
+        self._terrain_map = []
+        self.occupancy_index = OccupancyIndex()
+        self.carcass_store = CarcassStore() if carcass_store is None else carcass_store
+        self._animals_locations = {}
         self.animals_locations_after_hunger_games = []
-        self.res = {}
 
         self.animals_keys = []
-        self.dead_animals_count = 0
+        self.counters = PopulationCounters(Terrain.animal_types.values(), track_cells=track_cell_counts)
 
         self.all_animals_dead = False
-        self.animals_locations_after_one_iteration = {}
+        # Moves made during a tick, applied in place to animals_locations when it ends.
+        self.next_locations = PositionBuffer()
 
         self.animal_factory = AnimalFactory()
-        self.terrain_cell_factory = TerrainCellFactory()
-
-    def create_terrain(self):
-        # self.terrain_map = [[Terrain.terrain_cell_types[random.randint(1, 4)] for _ in range(self.y)] for _ in
-        #                        range(self.x)]
-        self.terrain_map = [
-            [self.terrain_cell_factory.create_terrain_cell(Terrain.terrain_cell_types[random.randint(1, 4)]) for _ in
-             range(self.y)] for _ in range(self.x)]
-        # print(self.terrain_map)
-
-    def fill_with_animals(self):
-        # size = self.x * self.y
-
-        for i in range(self.animals_count):
-            # rand_position = random.randint(0, size - 1)
-            rand_animal = Terrain.animal_types[random.randint(1, 3)]
+        # With flyweight_cells every square of one type shares a single immutable cell object.
+        self.terrain_cell_factory = TerrainCellFactory(flyweight=flyweight_cells)
+
+    @property
+    def terrain_map(self):
+        return self._terrain_map
+
+    @terrain_map.setter
+    def terrain_map(self, value):
+        self._terrain_map = value
+        self.grid = None
+        self.chunked_grid = None
+        self.move_table = None
+        self.land_index = None
+
+    @property
+    def dead_animals_count(self):
+        return self.counters.dead_total
+
+    def stats(self):
+        """Population counts by species without walking the population."""
+        stats = self.counters.snapshot()
+        stats['day'] = self.day
+        stats['carcasses'] = len(self.carcass_store)
+        return stats
+
+    @property
+    def animals_locations(self):
+        return self._animals_locations
+
+    @animals_locations.setter
+    def animals_locations(self, value):
+        # Only living animals are kept here; dead ones go to the carcass store. The new population replaces the
+        # old one whole, carcasses included, so the counters and the store agree.
+        self._animals_locations = {}
+        self.counters.reset()
+        self.carcass_store.clear()
+        delta_recorder = self.delta_recorder
+        for animal, position in value.items():
+            if delta_recorder is not None:
+                delta_recorder.spawned(animal, position)
+            if animal.status == 'alive':
+                self._animals_locations[animal] = position
+                self.counters.spawn(animal.animal_type, position)
+            else:
+                self.carcass_store.add(animal, position, self.day)
+                self.counters.add_dead(animal.animal_type)
+                if delta_recorder is not None:
+                    delta_recorder.died(animal, position)
+        self.occupancy_index.rebuild(self._animals_locations)
+
+    def create_terrain(self, grid_mode=False, terrain_file=None, generator=None, chunked=False):
+        # generator, a TerrainGenerator from project.generation, builds the map in bulk with NumPy.
+        if chunked:
+            self.create_terrain_chunked(generator)
+            return
+        if terrain_file is not None:
+            self.create_terrain_file(terrain_file, generator)
+            return
+        if grid_mode:
+            self.create_terrain_grid(generator)
+            return
+        if generator is not None:
+            from project.grid.terrain_grid import TerrainGrid
 
-            animal = self.animal_factory.create_animal(rand_animal)
+            self.terrain_map = self.terrain_map_from_codes(
+                TerrainGrid.generate(self.x, self.y, generator, self.rng).cells.tolist())
+            return
 
-            rand_row = random.randint(0, self.x - 1)
-            rand_col = random.randint(0, self.y - 1)
-            rand_position = f'{rand_row}:{rand_col}'
+        codes = self.rng.integers(4, self.x * self.y)
+        factory = self.terrain_cell_factory
+        if factory.flyweight:
+            # Four shared cells, so each row is just a list of references to them.
+            cells = [factory.create_terrain_cell(Terrain.terrain_cell_types[code + 1]) for code in range(4)]
+            self.terrain_map = [list(map(cells.__getitem__, codes[row * self.y:(row + 1) * self.y]))
+                                for row in range(self.x)]
+            return
 
-            self.animals_locations[animal] = rand_position
+        codes = iter(codes)
+        self.terrain_map = [
+            [factory.create_terrain_cell(Terrain.terrain_cell_types[next(codes) + 1]) for _ in
+             range(self.y)] for _ in range(self.x)]
 
-            if self.terrain_map[rand_row][rand_col].cell_type == 'WATER':
-                animal.status = 'dead'
-                self.dead_animals_count += 1
-                print(f'Animal {animal.animal_type} stepped on water.')
+    def terrain_map_from_codes(self, rows):
+        """Object map from rows of ``TerrainGrid`` cell codes."""
+        factory = self.terrain_cell_factory
+        cell_types = Terrain.terrain_cell_types
+        if factory.flyweight:
+            cells = [None] + [factory.create_terrain_cell(cell_types[code]) for code in range(1, 5)]
+            return [list(map(cells.__getitem__, row)) for row in rows]
+        return [[factory.create_terrain_cell(cell_types[code]) for code in row] for row in rows]
+
+    def create_terrain_grid(self, generator=None):
+        from project.grid.terrain_grid import TerrainGrid
+        from project.grid.terrain_map_view import TerrainMapView
+
+        if generator is None:
+            # Same draws as create_terrain, so a seed gives the same map in both modes.
+            grid = TerrainGrid.random(self.x, self.y, self.rng)
+        else:
+            grid = TerrainGrid.generate(self.x, self.y, generator, self.rng)
+        self.terrain_map = TerrainMapView(grid, self.terrain_cell_factory)
+        self.grid = grid
+
+    def create_terrain_file(self, path, generator=None):
+        """Keep the map in a memory-mapped ``.npy`` file: opened if it exists, otherwise generated into it once.
+
+        Only the pages under cells that are actually read get loaded, so the map may be larger than memory.
+        """
+        from project.grid.banded_move_table import BandedMoveTable
+        from project.grid.terrain_grid import TerrainGrid
+        from project.grid.terrain_map_view import TerrainMapView
+
+        if os.path.exists(path):
+            grid = TerrainGrid.open_file(path)
+            if (grid.x, grid.y) != (self.x, self.y):
+                raise ValueError(f'{path} holds a {grid.x}x{grid.y} map, not {self.x}x{self.y}')
+        else:
+            grid = TerrainGrid.create_file(path, self.x, self.y, self.rng, generator=generator)
+
+        self.terrain_map = TerrainMapView(grid, self.terrain_cell_factory)
+        self.grid = grid
+        # A whole table would be as big as the map, so only the bands animals move in get one.
+        self.move_table = BandedMoveTable(grid)
+
+    def create_terrain_chunked(self, generator=None, chunk_size=256, max_bytes=1 << 26):
+        """Generate the map lazily, ``chunk_size`` square chunks at a time, as animals reach them.
+
+        Chunks are a pure function of the seed and their coordinates. Beyond ``max_bytes`` of chunks, those
+        with no animal or carcass are dropped at the end of a tick and rebuilt identically when revisited.
+        """
+        from project.generation.uniform_generator import UniformGenerator
+        from project.grid.chunked_grid import ChunkedGrid
+        from project.grid.terrain_map_view import TerrainMapView
+
+        if generator is None:
+            generator = UniformGenerator()
+        grid = ChunkedGrid(self.x, self.y, generator, generator.draw_key(self.rng), chunk_size, max_bytes)
+        self.terrain_map = TerrainMapView(grid, self.terrain_cell_factory)
+        self.grid = grid
+        self.chunked_grid = grid
+
+    def to_grid(self):
+        """The map as a TerrainGrid: the grid itself for grid maps, a copy of an object map.
+
+        A chunked world has none; it is never generated whole.
+        """
+        if self.chunked_grid is not None:
+            raise ValueError('a chunked world is never generated whole, so it has no TerrainGrid')
+        if self.grid is not None:
+            return self.grid
+
+        from project.grid.terrain_grid import TerrainGrid
+
+        return TerrainGrid.from_terrain_map(self._terrain_map)
+
+    def build_move_table(self):
+        """The MoveTable of the current map; a chunked world builds its own, chunk by chunk."""
+        if self.chunked_grid is not None:
+            return self.chunked_grid
+        if self.grid is not None:
+            return MoveTable.from_grid(self.grid)
+        return MoveTable.from_terrain_map(self._terrain_map)
+
+    def build_land_index(self, area=None):
+        """LandIndex of the cells of ``area`` that are not water; ``area``, (row, col, rows, cols), defaults to the map.
+
+        A chunked world has none: it is too big to read through, so ``draw_land_cells`` samples it instead.
+        """
+        if self.chunked_grid is not None:
+            raise ValueError('a chunked world cannot be indexed; draw its land cells with draw_land_cells')
+        top, left, height, width = (0, 0, self.x, self.y) if area is None else area
+        y = self.y
+        # Bands of about a million cells: one is read at a time, so a memory-mapped map is never loaded whole.
+        band_rows = max(1, (1 << 20) // max(width, 1))
+
+        if self.grid is None:
+            terrain_map = self._terrain_map
+            cell_type = attrgetter('cell_type')
+
+            def land_in_rows(first, rows):
+                land = []
+                for row in range(first, first + rows):
+                    on_land = map('WATER'.__ne__, map(cell_type, terrain_map[row][left:left + width]))
+                    land.extend(zip(repeat(row), compress(range(left, left + width), on_land)))
+                return land
+
+            return LandIndex(y, top, height, band_rows, land_in_rows)
+
+        import numpy as np
+        from project.grid.terrain_grid import TerrainGrid
+
+        cells = self.grid.cells
+        water = TerrainGrid.cell_codes['WATER']
+
+        def land_in_rows(row, rows):
+            land_rows, land_cols = np.nonzero(cells[row:row + rows, left:left + width] != water)
+            return (land_rows + row).astype(np.int64) * y + (land_cols + left)
+
+        return LandIndex(y, top, height, band_rows, land_in_rows)
+
+    def draw_land_cells(self, count, area=None):
+        """``count`` positions drawn uniformly from the land cells of ``area`` (default: the whole map).
+
+        None when the area has no land, or a chunked world finds none in ``max_water_draws`` draws in a row.
+        """
+        if self.chunked_grid is None:
+            land = self.land_index if area is None else None
+            if land is None:
+                land = self.build_land_index(area)
+                if area is None:
+                    self.land_index = land
+            if count and not len(land):
+                return None
+            if self.grid is None:
+                return land.positions(self.rng.integers(len(land), count))
+            rows, cols = land.position_arrays(self.rng.integers_array(len(land), count))
+            return list(zip(rows.tolist(), cols.tolist()))
+
+        # Cell by cell: a draw that hits water is thrown away and drawn again, so only the chunks under the
+        # animals get generated.
+        top, left, height, width = (0, 0, self.x, self.y) if area is None else area
+        cell_type_at = self.cell_type_at
+        below = self.rng.below
+        positions = []
+        misses = 0
+        while len(positions) < count:
+            row, col = top + below(height), left + below(width)
+            if cell_type_at(row, col) != 'WATER':
+                positions.append((row, col))
+                misses = 0
                 continue
-
-            # self.animals_locations[animal] = rand_position
+            misses += 1
+            if misses == Terrain.max_water_draws:
+                return None
+        return positions
+
+    def occupied_positions(self):
+        """Every cell with a living animal or a carcass on it."""
+        return chain(self.occupancy_index.cells, self.carcass_store.cells)
+
+    def cell_type_at(self, row, col):
+        if self.grid is not None:
+            return self.grid.cell_type(row, col)
+        return self._terrain_map[row][col].cell_type
+
+    def fill_with_animals(self, species_weights=None, area=None, drown_on_spawn=False):
+        # Species and positions are drawn in bulk blocks, like ColumnarPopulation.random, and the animals are
+        # created and placed as one batch.
+        # species_weights, one whole number per animal type in order, skews the species mix.
+        # area, (row, col, rows, cols), confines spawning to one rectangle of the map.
+        # Positions are drawn from the land cells only. With drown_on_spawn they are drawn from every cell, and
+        # an animal that lands on water dies there at once.
+        count = self.animals_count
+        if area is not None:
+            top, left, height, width = area
+            if top < 0 or left < 0 or height < 1 or width < 1 or top + height > self.x or left + width > self.y:
+                raise ValueError(f'spawn area {area} is not inside the {self.x}x{self.y} map')
+        # A grid has NumPy loaded already, and the same draws come out of it as whole arrays.
+        if self.grid is None:
+            species = self.rng.integers(3, count) if species_weights is None else self.rng.weighted(species_weights, count)
+        elif species_weights is None:
+            species = self.rng.integers_array(3, count).tolist()
+        else:
+            species = self.rng.weighted_array(species_weights, count).tolist()
+
+        # A map without land is still a valid start: everybody drowns, as with drown_on_spawn.
+        positions = None if drown_on_spawn else self.draw_land_cells(count, area)
+        drown_on_spawn = positions is None
+        if drown_on_spawn and area is None:
+            positions = list(zip(self.rng.integers(self.x, count), self.rng.integers(self.y, count)))
+        elif drown_on_spawn:
+            positions = list(zip([top + row for row in self.rng.integers(height, count)],
+                                 [left + col for col in self.rng.integers(width, count)]))
+        animal_types = list(map(tuple(Terrain.animal_types.values()).__getitem__, species))
+
+        delta_recorder = self.delta_recorder
+        # Every animal is a container object the collector tracks; paused, a large fill is not interrupted by
+        # collections that rescan the population built so far.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            animals = self.animal_factory.create_many(animal_types)
+            self.counters.spawn_many(animal_types, positions)
+            if delta_recorder is not None:
+                for animal, position in zip(animals, positions):
+                    delta_recorder.spawned(animal, position)
+
+            if drown_on_spawn:
+                cell_type_at = self.cell_type_at
+                on_land = [cell_type_at(row, col) != 'WATER' for row, col in positions]
+                for animal, position, survives in zip(animals, positions, on_land):
+                    if survives:
+                        continue
+                    animal.status = 'dead'
+                    self.counters.die(animal.animal_type, position, 'water')
+                    self.carcass_store.add(animal, position, self.day)
+                    if self.event_sink is not None:
+                        self.event_sink.record(WATER_DEATH, animal.animal_type, position)
+                    if delta_recorder is not None:
+                        delta_recorder.died(animal, position)
+                animals = list(compress(animals, on_land))
+                positions = list(compress(positions, on_land))
+
+            self._animals_locations.update(zip(animals, positions))
+            self.occupancy_index.add_many(animals, positions)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def run(self, days):
+        """Simulate up to ``days`` days, yielding a DaySummary after each one.
+
+        Stops early once every animal is dead. Nothing is kept between days, so
+        the caller decides what to store; closing the generator stops the run.
+        """
+        counters = self.counters
+        for _ in range(days):
+            if self.all_animals_dead:
+                return
+            day = self.day
+            deaths_before = dict(counters.deaths)
+            self.activate_animals()
+            if self.day == day:
+                return
+            yield day_summary(self.day, counters, deaths_before, len(self.carcass_store))
 
     def activate_animals(self):
 
-        if self.dead_animals_count == self.animals_count:
+        event_sink = self.event_sink
+        profiler = self.profiler
+
+        counters = self.counters
+
+        if counters.alive_total == 0:
             self.all_animals_dead = True
-            print('There are no alive animals in the terrain.')
+            if event_sink is not None:
+                event_sink.record(ALL_ANIMALS_DEAD, None, None)
             return
 
+        self.day += 1
+        if event_sink is not None:
+            event_sink.start_day(self.day)
+        if profiler is not None:
+            profiler.start_tick(self.day)
+
         animals_position = self.animals_locations.items()
+        carcass_store = self.carcass_store
+        delta_recorder = self.delta_recorder
+        rng = self.rng
+        next_locations = self.next_locations
+        if self.move_table is None:
+            self.move_table = self.build_move_table()
+        move_flags = self.move_table.flags_at
+        blocked, drowns = MoveTable.BLOCKED, MoveTable.DROWNS
+        row_steps, col_steps = MoveTable.row_steps, MoveTable.col_steps
+        # Ordered set of the animals that died today.
+        died = {}
 
-        # [print(f'{x}:{y}') for x, y in list(animals_position)]
         for animal, position in animals_position:
+            if animal.status != 'alive' and animal not in died:
+                # Killed outside the simulation; it becomes a carcass at the end of the day.
+                counters.die(animal.animal_type, position, 'external')
+                died[animal] = None
+                continue
+
             if animal.hunger_rate < 5:
                 different_type_animals_in_same_cell = []
 
                 if animal.animal_type == 'Herbivore' and animal.status == 'alive':
-                    row, col = position.split(':')
-                    row, col = int(row), int(col)
+                    if profiler is not None:
+                        profiler.enter('herbivore_feeding')
+                    row, col = position
 
-                    if self.terrain_map[row][col].cell_type != 'GRASS':
+                    if self.cell_type_at(row, col) != 'GRASS':
                         animal.hunger_rate -= 1
                         if animal.hunger_rate <= 0:
                             animal.status = 'dead'
-                            print(f'Animal {animal.animal_type} died of hunger.')
-                            self.dead_animals_count += 1
+                            counters.die(animal.animal_type, position, 'hunger')
+                            died[animal] = None
+                            if event_sink is not None:
+                                event_sink.record(HUNGER_DEATH, animal.animal_type, position)
                         continue
                     else:
                         animal.hunger_rate += 1
                         animal.has_eaten = True
 
                 if animal.animal_type == 'Carnivore' and animal.status == 'alive':
-                    for x, y in list(animals_position):
-                        if y == position and x.animal_type != animal.animal_type and x.is_eaten == False:
-
-                            different_type_animals_in_same_cell.append({x: y})
+                    if profiler is not None:
+                        profiler.enter('predation')
+                    for x in chain(self.occupancy_index.animals_at(position), carcass_store.carcasses_at(position)):
+                        if x.animal_type != animal.animal_type and x.is_eaten == False:
+
+                            different_type_animals_in_same_cell.append({x: position})
+                            if x.status == 'alive':
+                                x.status = 'dead'
+                                counters.die(x.animal_type, position, 'predation')
+                                died[x] = None
                             x.is_eaten = True
-                            x.status = 'dead'
-                            self.dead_animals_count += 1
+                            counters.eat(x.animal_type)
                             animal.has_eaten = True
 
                     for animal_key_value in different_type_animals_in_same_cell:
@@ -134,12 +495,15 @@ class Terrain:
                     # print(Terrain.animals_locations)
 
                 if animal.animal_type == 'Scavenger' and animal.status == 'alive':
-                    for x, y in list(animals_position):
-                        if y == position and x.animal_type != animal.animal_type and x.status == 'dead':
-                            different_type_animals_in_same_cell.append({x: y})
+                    if profiler is not None:
+                        profiler.enter('scavenging')
+                    for x in chain(self.occupancy_index.animals_at(position), carcass_store.carcasses_at(position)):
+                        if x.animal_type != animal.animal_type and x.status == 'dead':
+                            different_type_animals_in_same_cell.append({x: position})
                             animal.has_eaten = True
-                            x.is_eaten = True
-                            self.dead_animals_count += 1
+                            if not x.is_eaten:
+                                x.is_eaten = True
+                                counters.eat(x.animal_type)
 
                     # print(different_type_animals_in_same_cell)
 
@@ -156,107 +520,88 @@ class Terrain:
                     #     del Terrain.animals_locations[remove_animal]
                     # print(Terrain.animals_locations)
 
-                rand_num = random.randint(1, 4)
-                direction = Terrain.directions[rand_num]
+                if profiler is not None:
+                    profiler.enter('movement')
+                direction = rng.below(4) + 1
 
                 if animal.status == 'alive' and animal.has_eaten == False:
                     animal.hunger_rate -= 1
 
                     if animal.hunger_rate <= 0:
                         animal.status = 'dead'
-                        self.dead_animals_count += 1
+                        counters.die(animal.animal_type, position, 'hunger')
+                        died[animal] = None
+                        if event_sink is not None:
+                            event_sink.record(HUNGER_DEATH, animal.animal_type, position)
+                        continue
+
+                    row, col = position
+                    flags = move_flags(row, col)
+                    if flags & blocked[direction]:
+                        if event_sink is not None:
+                            event_sink.record(BORDER_BLOCKED, animal.animal_type, position,
+                                              Terrain.directions[direction])
                         continue
 
-                    row, col = position.split(':')
-                    row, col = int(row), int(col)
-
-                    if direction == 'up':
-                        if row - 1 < 0:
-                            print(f'{animal.animal_type} cannot go to this direction. There is a border up!')
-                            new_location = f'{row}:{col}'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                            continue
-                        else:
-                            new_location = f'{row - 1}:{col}'
-
-                            if self.terrain_map[row - 1][col].cell_type == 'WATER':
-                                self.dead_animals_count += 1
-                                print(f'Animal {animal.animal_type} stepped on water.')
-                                animal.status = 'dead'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                    elif direction == 'down':
-                        if row + 1 >= self.x:
-                            print(f'{animal.animal_type} cannot go to this direction. There is a border down!')
-                            new_location = f'{row}:{col}'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                            continue
-                        else:
-                            new_location = f'{row + 1}:{col}'
-
-                            if self.terrain_map[row + 1][col].cell_type == 'WATER':
-                                self.dead_animals_count += 1
-                                print(f'Animal {animal.animal_type} stepped on water.')
-                                animal.status = 'dead'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                    elif direction == 'left':
-                        if col - 1 < 0:
-                            print(f'{animal.animal_type} cannot go to this direction. There is a border left!')
-                            new_location = f'{row}:{col}'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                            continue
-                        else:
-
-                            new_location = f'{row}:{col - 1}'
-                            if self.terrain_map[row][col - 1].cell_type == 'WATER':
-                                self.dead_animals_count += 1
-                                print(f'Animal {animal.animal_type} stepped on water.')
-                                animal.status = 'dead'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                    elif direction == 'right':
-                        if col + 1 >= self.y:
-                            print(f'{animal.animal_type} cannot go to this direction. There is a border right!')
-                            new_location = f'{row}:{col}'
-                            self.animals_locations_after_one_iteration[animal] = new_location
-                            continue
-                        else:
-
-                            new_location = f'{row}:{col + 1}'
-                            if self.terrain_map[row][col + 1].cell_type == 'WATER':
-                                self.dead_animals_count += 1
-                                print(f'Animal {animal.animal_type} stepped on water.')
-                                animal.status = 'dead'
-                            self.animals_locations_after_one_iteration[animal] = new_location
+                    new_location = (row + row_steps[direction], col + col_steps[direction])
+                    if flags & drowns[direction]:
+                        counters.die(animal.animal_type, position, 'water')
+                        if event_sink is not None:
+                            event_sink.record(WATER_DEATH, animal.animal_type, new_location)
+                        animal.status = 'dead'
+                        died[animal] = None
+                    next_locations.write(animal, new_location)
 
                 animal.has_eaten = False
-                # self.res = self.animals_locations | self.animals_locations_after_one_iteration
-                # print(f'res: {self.res}')
 
             else:
+                if profiler is not None:
+                    profiler.enter('digestion')
                 animal.hunger_rate -= 1
-        self.res = self.animals_locations | self.animals_locations_after_one_iteration
-        # print(f'res: {self.res}')
-        self.animals_locations = self.res
 
+        if profiler is not None:
+            profiler.enter('commit', len(next_locations))
+        # Overwriting the value of a key already in a dict never resizes it, so this allocates nothing.
+        animals_locations = self._animals_locations
+        for animal, new_position in next_locations.drain():
+            old_position = animals_locations[animal]
+            animals_locations[animal] = new_position
+            self.occupancy_index.move(animal, old_position, new_position)
+            if counters.track_cells and animal.status == 'alive':
+                counters.move(animal.animal_type, old_position, new_position)
+            if delta_recorder is not None:
+                delta_recorder.moved(animal, new_position)
+
+        if profiler is not None:
+            profiler.enter('removal', len(self.animals_keys))
+        # A carcass can be eaten by several animals in one tick, so its key may be listed more than once.
         for remove_animal in self.animals_keys:
-            del self.animals_locations[remove_animal]
+            if remove_animal in self._animals_locations:
+                self.occupancy_index.remove(remove_animal, self._animals_locations.pop(remove_animal))
+            else:
+                carcass_store.remove(remove_animal)
+            if delta_recorder is not None:
+                delta_recorder.eaten(remove_animal)
         self.animals_keys = []
 
-        self.res = {}
-
-
-terrain = Terrain(3, 4, 3)
-
-# terrain = Terrain(1, 1, 1)
-terrain.create_terrain()
-# print(terrain.terrain_map)
-terrain.fill_with_animals()
-# print(terrain.terrain_map)
-
-# print(terrain.animals_locations)
-
-days = int(input("Enter days count: "))
-
-for day in range(days):
-    if not terrain.all_animals_dead:
-        terrain.activate_animals()
-
+        if profiler is not None:
+            profiler.enter('carcasses', len(died))
+        for dead_animal in died:
+            if dead_animal in self._animals_locations:
+                dead_position = self._animals_locations.pop(dead_animal)
+                self.occupancy_index.remove(dead_animal, dead_position)
+                carcass_store.add(dead_animal, dead_position, self.day)
+                if delta_recorder is not None:
+                    delta_recorder.died(dead_animal, dead_position)
+
+        carcass_store.expire(self.day, None if delta_recorder is None else delta_recorder.decomposed)
+
+        if self.chunked_grid is not None:
+            self.chunked_grid.evict(self.occupied_positions)
+
+        if profiler is not None:
+            profiler.end_tick()
+        if event_sink is not None:
+            event_sink.end_day(self.day)
+        if self.history_recorder is not None:
+            self.history_recorder.record_day(self)
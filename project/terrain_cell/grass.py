@@ -2,6 +2,8 @@ from project.terrain_cell.terrain_cell import TerrainCell
 
 
 class Grass(TerrainCell):
+    __slots__ = ()
+
     def __init__(self, cell_type):
         super().__init__(cell_type)
 
@@ -1,3 +1,10 @@
 class TerrainCell:
+    # No per-instance dict: a map holds one cell per square, so every byte counts.
+    __slots__ = ('_cell_type',)
+
     def __init__(self, cell_type):
-        self.cell_type = cell_type
\ No newline at end of file
+        self._cell_type = cell_type
+
+    @property
+    def cell_type(self):
+        return self._cell_type
@@ -2,5 +2,7 @@ from project.terrain_cell.terrain_cell import TerrainCell
 
 
 class Water(TerrainCell):
+    __slots__ = ()
+
     def __init__(self, cell_type):
         super().__init__(cell_type)
\ No newline at end of file
@@ -4,6 +4,7 @@ from unittest import TestCase, main
 from project.animal.carnivore import Carnivore
 from project.animal.herbivore import Herbivore
 from project.animal.scavenger import Scavenger
+from project.core.position import position_from_str, position_to_str
 from project.terrain import Terrain
 from project.terrain_cell.grass import Grass
 from project.terrain_cell.mountain import Mountain
@@ -31,11 +32,10 @@ class TerrainTests(TestCase):
         self.assertEqual([], terrain.terrain_map)
         self.assertEqual({}, terrain.animals_locations)
         self.assertEqual([], terrain.animals_locations_after_hunger_games)
-        self.assertEqual({}, terrain.res)
         self.assertEqual([], terrain.animals_keys)
         self.assertEqual(0, terrain.dead_animals_count)
         self.assertEqual(False, terrain.all_animals_dead)
-        self.assertEqual({}, terrain.animals_locations_after_one_iteration)
+        self.assertEqual(0, len(terrain.next_locations))
         self.assertEqual('AnimalFactory', terrain.animal_factory.__class__.__name__)
         self.assertEqual('TerrainCellFactory', terrain.terrain_cell_factory.__class__.__name__)
 
@@ -75,9 +75,23 @@ class TerrainTests(TestCase):
         total_count_animals = 0
         for animal in self.terrain.animals_locations:
             total_count_animals += 1
+        for animal in self.terrain.carcass_store:
+            total_count_animals += 1
 
         self.assertEqual(7, total_count_animals)
 
+    def test_terrain_fill_with_animals_positions_are_row_col_tuples(self):
+        self.terrain.create_terrain()
+        self.terrain.fill_with_animals()
+
+        for row, col in self.terrain.animals_locations.values():
+            self.assertTrue(0 <= row < self.x)
+            self.assertTrue(0 <= col < self.y)
+
+    def test_terrain_position_string_conversion_round_trip(self):
+        self.assertEqual('3:7', position_to_str((3, 7)))
+        self.assertEqual((3, 7), position_from_str('3:7'))
+
     def test_terrain_fill_with_animals_animal_dead_if_stepped_on_water(self):
 
         self.x = 1
@@ -89,9 +103,10 @@ class TerrainTests(TestCase):
         self.terrain.create_terrain()
         self.terrain.terrain_map[0][0] = Water('WATER')
 
-        self.terrain.fill_with_animals()
+        self.terrain.fill_with_animals(drown_on_spawn=True)
 
-        for animal in self.terrain.animals_locations:
+        self.assertEqual({}, self.terrain.animals_locations)
+        for animal in self.terrain.carcass_store:
             self.assertEqual('dead', animal.status)
 
     def test_terrain_activate_animals_check_all_animals_dead_returns_true(self):
@@ -117,7 +132,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_animal_type_herbivore_terrain_cell_different_than_grass_hunger_rate_decrement(self):
         self.terrain.terrain_map = [[Mountain('MOUNTAIN'), ], ]
-        self.terrain.animals_locations = {Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Herbivore(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 4
@@ -128,29 +143,27 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_animal_type_herbivore_animal_dies_when_hunger_rate_is_zero(self):
         self.terrain.terrain_map = [[Mountain('MOUNTAIN'), ], ]
-        self.terrain.animals_locations = {Herbivore(): '0:0'}
-
-        for animal in self.terrain.animals_locations:
-            animal.hunger_rate = 1
+        animal = Herbivore()
+        animal.hunger_rate = 1
+        self.terrain.animals_locations = {animal: (0, 0)}
 
-            self.terrain.activate_animals()
+        self.terrain.activate_animals()
 
-            self.assertEqual('dead', animal.status)
+        self.assertEqual('dead', animal.status)
 
     def test_terrain_activate_animals_animal_type_herbivore_animal_dies_dead_animals_count_increment(self):
         self.terrain.terrain_map = [[Mountain('MOUNTAIN'), ], ]
-        self.terrain.animals_locations = {Herbivore(): '0:0'}
-
-        for animal in self.terrain.animals_locations:
-            animal.hunger_rate = 1
+        animal = Herbivore()
+        animal.hunger_rate = 1
+        self.terrain.animals_locations = {animal: (0, 0)}
 
-            self.terrain.activate_animals()
+        self.terrain.activate_animals()
 
-            self.assertEqual(1, self.terrain.dead_animals_count)
+        self.assertEqual(1, self.terrain.dead_animals_count)
 
     def test_terrain_activate_animals_terrain_cell_type_equal_to_grass_herbivore_has_eaten_increment_hunger_rate(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Herbivore(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 2
@@ -163,7 +176,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_carnivore_in_same_cell_no_animal_is_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Carnivore(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Carnivore(): (0, 0)}
 
         self.terrain.activate_animals()
 
@@ -177,7 +190,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_herbivore_in_same_cell_herbivore_is_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Herbivore(): (0, 0)}
 
         for i in self.terrain.animals_locations:
             i.hunger_rate = 2
@@ -197,7 +210,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_more_than_one_herbivore_in_same_cell_herbivores_are_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0)}
 
         for i in self.terrain.animals_locations:
             i.hunger_rate = 2
@@ -218,7 +231,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_hunger_rate_cannot_be_more_than_ten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0)}
 
         for i in self.terrain.animals_locations:
             i.hunger_rate = 4
@@ -230,7 +243,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_scavenger_in_same_cell_scavenger_is_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Scavenger(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Scavenger(): (0, 0)}
 
         for i in self.terrain.animals_locations:
             i.hunger_rate = 2
@@ -250,7 +263,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_carnivore_more_than_one_scavenger_in_same_cell_scavengers_are_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Carnivore(): '0:0', Scavenger(): '0:0', Scavenger(): '0:0'}
+        self.terrain.animals_locations = {Carnivore(): (0, 0), Scavenger(): (0, 0), Scavenger(): (0, 0)}
 
         for i in self.terrain.animals_locations:
             i.hunger_rate = 2
@@ -271,7 +284,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_scavenger_scavenger_in_same_cell_no_animal_is_eaten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Scavenger(): '0:0', Scavenger(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0), Scavenger(): (0, 0)}
 
         self.terrain.activate_animals()
 
@@ -285,7 +298,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_scavenger_eats_dead_animal(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Scavenger(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0), Herbivore(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 4
@@ -312,7 +325,7 @@ class TerrainTests(TestCase):
             terrain_cell = Grass('GRASS')
             # print(terrain_cell)
 
-        self.terrain.animals_locations = {Scavenger(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0), Herbivore(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 2
@@ -325,7 +338,7 @@ class TerrainTests(TestCase):
 
     def test_terrain_activate_animals_scavenger_hunger_rate_cannot_be_more_than_ten(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Scavenger(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0', Herbivore(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
 
@@ -341,14 +354,15 @@ class TerrainTests(TestCase):
 
     def test_terrain_animal_hunger_rate_equal_to_zero_animal_dead(self):
         self.terrain.terrain_map = [[Grass('GRASS'), ], ]
-        self.terrain.animals_locations = {Scavenger(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 0
 
         self.terrain.activate_animals()
 
-        for assert_animal in self.terrain.animals_locations:
+        self.assertEqual({}, self.terrain.animals_locations)
+        for assert_animal in self.terrain.carcass_store:
             self.assertEqual('dead', assert_animal.status)
             self.assertEqual(1, self.terrain.dead_animals_count)
 
@@ -364,13 +378,13 @@ class TerrainTests(TestCase):
         for terrain_cell in self.terrain.terrain_map:
             terrain_cell = Grass('GRASS')
 
-        self.terrain.animals_locations = {Scavenger(): '0:0'}
+        self.terrain.animals_locations = {Scavenger(): (0, 0)}
 
         self.terrain.activate_animals()
 
         location = list(self.terrain.animals_locations.values())[0]
 
-        self.assertEqual('0:0', location)
+        self.assertEqual((0, 0), location)
 
     def test_terrain_animal_does_not_eat_makes_a_move(self):
         self.x = 3
@@ -386,16 +400,17 @@ class TerrainTests(TestCase):
             terrain_cell = Grass('GRASS')
 
         # print(self.terrain.terrain_map)
-        self.terrain.animals_locations = {Scavenger(): '1:1'}
+        self.terrain.animals_locations = {Scavenger(): (1, 1)}
 
         for animal in self.terrain.animals_locations:
             animal.hunger_rate = 3
 
         self.terrain.activate_animals()
 
-        location = list(self.terrain.animals_locations.values())[0]
+        # The cell it moved to may be water, in which case it is now a carcass there.
+        location = self.terrain.animals_locations.get(animal) or self.terrain.carcass_store.position_of(animal)
 
-        self.assertNotEqual('1:1', location)
+        self.assertNotEqual((1, 1), location)
 
 
 if __name__ == '__main__':
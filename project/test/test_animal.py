@@ -0,0 +1,69 @@
+import tracemalloc
+from unittest import TestCase, main
+
+from project.animal.animal import Animal
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.animal.scavenger import Scavenger
+from project.core.animal_factory import AnimalFactory
+
+
+class AnimalTests(TestCase):
+    def test_animal_species_lives_on_the_class(self):
+        for animal_class, animal_type in ((Carnivore, 'Carnivore'), (Herbivore, 'Herbivore'),
+                                          (Scavenger, 'Scavenger')):
+            animal = animal_class()
+
+            self.assertIsInstance(animal, Animal)
+            self.assertEqual(animal_type, animal.animal_type)
+            self.assertEqual(('hunger_rate', '_flags'), Animal.__slots__)
+            self.assertFalse(hasattr(animal, '__dict__'))
+            self.assertFalse(hasattr(animal, 'has_moved'))
+            with self.assertRaises(AttributeError):
+                animal.food_type = 'grass'
+
+    def test_animal_starts_alive_hungry_and_uneaten(self):
+        animal = Herbivore()
+
+        self.assertEqual(10, animal.hunger_rate)
+        self.assertEqual('alive', animal.status)
+        self.assertEqual('alive', animal.animal_status())
+        self.assertFalse(animal.has_eaten)
+        self.assertFalse(animal.is_eaten)
+
+    def test_animal_status_flags_are_independent(self):
+        animal = Carnivore()
+
+        animal.status = 'dead'
+        animal.is_eaten = True
+        self.assertEqual(('dead', True, False), (animal.status, animal.is_eaten, animal.has_eaten))
+
+        animal.has_eaten = True
+        animal.is_eaten = False
+        self.assertEqual(('dead', False, True), (animal.status, animal.is_eaten, animal.has_eaten))
+
+        animal.status = 'alive'
+        self.assertEqual(('alive', False, True), (animal.status, animal.is_eaten, animal.has_eaten))
+
+    def test_animal_rejects_unknown_status(self):
+        with self.assertRaises(ValueError):
+            Scavenger().status = 'asleep'
+
+    def test_animal_memory_per_instance_is_pinned(self):
+        factory = AnimalFactory()
+        count = 20000
+
+        tracemalloc.start()
+        try:
+            animals = [factory.create_animal('Herbivore') for _ in range(count)]
+            traced = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        # Object and GC headers plus two slots is 48 bytes; the rest is the list holding them.
+        # Animals with a per-instance dict took 128.
+        self.assertLessEqual(traced / len(animals), 48 + 16)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.benchmark.__main__ import main as benchmark_main
+from project.benchmark.benchmark_case import BenchmarkCase, benchmark_cases
+from project.benchmark.benchmark_report import compare_results, format_table, load_results, save_results
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_benchmark(self, *argv):
+        stdout = io.StringIO()
+        status = benchmark_main(list(argv), stdout=stdout, stderr=io.StringIO())
+        return status, stdout.getvalue()
+
+    def test_benchmark_case_reports_timings_throughput_and_memory(self):
+        result = BenchmarkCase('objects', 6, 0.5, 'herbivores', seed=1).run(ticks=2)
+
+        self.assertEqual('objects-6x6-d0.5-herbivores', result['name'])
+        self.assertEqual(18, result['animals'])
+        self.assertFalse(result['grid_mode'])
+        self.assertGreater(result['tick_seconds'], 0)
+        self.assertGreater(result['animals_per_second'], 0)
+        self.assertGreater(result['peak_bytes'], 0)
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_benchmark_case_runs_the_vectorized_engine(self):
+        result = BenchmarkCase('vectorized', 6, 0.5, 'carnivores').run(ticks=2, measure_memory=False)
+
+        self.assertTrue(result['grid_mode'])
+        self.assertIsNone(result['peak_bytes'])
+        self.assertGreater(result['animals_per_second'], 0)
+
+    def test_benchmark_cases_cover_the_whole_matrix(self):
+        cases = benchmark_cases([10, 100], [0.1, 1.0], ['balanced', 'scavengers'], ['objects'])
+
+        self.assertEqual(8, len(cases))
+        self.assertEqual(8, len({case.name for case in cases}))
+
+    def test_benchmark_baseline_round_trip_and_regressions(self):
+        result = BenchmarkCase('objects', 5, 1.0, 'balanced').run(ticks=1)
+        path = os.path.join(self.directory, 'baseline.json')
+        save_results(path, [result])
+
+        baseline = load_results(path)
+        slower = dict(result, tick_seconds=result['tick_seconds'] * 2)
+
+        self.assertEqual([result], baseline)
+        self.assertFalse(compare_results(baseline, [result])[0]['regression'])
+        self.assertTrue(compare_results(baseline, [slower])[0]['regression'])
+        self.assertIn('REGRESSION', format_table([slower], compare_results(baseline, [slower])))
+
+    def test_benchmark_cli_saves_and_compares_against_a_baseline(self):
+        path = os.path.join(self.directory, 'baseline.json')
+        argv = ('--sides', '5', '--densities', '0.5', '--mixes', 'balanced', '--engines', 'objects', '--ticks', '1')
+
+        status, output = self.run_benchmark(*argv, '--save', path)
+        self.assertEqual(0, status)
+        self.assertIn('objects-5x5-d0.5-balanced', output)
+
+        with open(path) as file:
+            document = json.load(file)
+        document['results'][0]['tick_seconds'] /= 100
+        with open(path, 'w') as file:
+            json.dump(document, file)
+
+        status, output = self.run_benchmark(*argv, '--baseline', path, '--fail-on-regression', '--format', 'json')
+        self.assertEqual(1, status)
+        self.assertTrue(json.loads(output)['comparison'][0]['regression'])
+
+    def test_benchmark_cli_skips_cases_over_the_animal_limit(self):
+        status, output = self.run_benchmark('--sides', '10', '--densities', '1', '--mixes', 'balanced',
+                                            '--engines', 'objects', '--max-animals', '50', '--format', 'json')
+
+        self.assertEqual(0, status)
+        self.assertEqual([], json.loads(output)['results'])
+
+
+if __name__ == '__main__':
+    main()
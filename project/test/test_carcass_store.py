@@ -0,0 +1,101 @@
+from unittest import TestCase, main
+
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.animal.scavenger import Scavenger
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+from project.terrain_cell.mountain import Mountain
+
+
+class CarcassStoreTests(TestCase):
+    def test_carcass_store_lookup_by_cell(self):
+        store = CarcassStore()
+        herbivore = Herbivore()
+
+        store.add(herbivore, (1, 2), 0)
+
+        self.assertEqual([herbivore], list(store.carcasses_at((1, 2))))
+        self.assertEqual((1, 2), store.remove(herbivore))
+        self.assertEqual([], list(store.carcasses_at((1, 2))))
+
+    def test_carcass_store_expires_after_ttl(self):
+        store = CarcassStore(ttl=2)
+        old, new = Herbivore(), Herbivore()
+
+        store.add(old, (0, 0), 1)
+        store.add(new, (0, 0), 2)
+        store.expire(3)
+
+        self.assertEqual([new], list(store))
+        self.assertEqual(1, store.decomposed_count)
+
+    def test_carcass_store_caps_count_oldest_first(self):
+        store = CarcassStore(max_carcasses=2)
+        animals = [Herbivore() for _ in range(3)]
+
+        for day, animal in enumerate(animals):
+            store.add(animal, (0, day), day)
+        store.expire(3)
+
+        self.assertEqual(animals[1:], list(store))
+
+    def test_terrain_dead_animal_moves_to_carcass_store(self):
+        terrain = Terrain(1, 1, 1)
+        terrain.terrain_map = [[Mountain('MOUNTAIN'), ], ]
+        herbivore = Herbivore()
+        herbivore.hunger_rate = 1
+        terrain.animals_locations = {herbivore: (0, 0)}
+
+        terrain.activate_animals()
+
+        self.assertEqual({}, terrain.animals_locations)
+        self.assertEqual((0, 0), terrain.carcass_store.position_of(herbivore))
+        self.assertEqual([], list(terrain.occupancy_index.animals_at((0, 0))))
+
+    def test_terrain_scavenger_eats_carcass_from_store(self):
+        terrain = Terrain(1, 1, 2)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        carcass = Carnivore()
+        carcass.status = 'dead'
+        scavenger = Scavenger()
+        scavenger.hunger_rate = 3
+        terrain.animals_locations = {scavenger: (0, 0), carcass: (0, 0)}
+
+        terrain.activate_animals()
+
+        self.assertEqual(4, scavenger.hunger_rate)
+        self.assertEqual(0, len(terrain.carcass_store))
+
+    def test_terrain_setting_animals_replaces_the_carcasses_too(self):
+        terrain = Terrain(1, 1, 3, carcass_store=CarcassStore(max_carcasses=1))
+        terrain.terrain_map = [[Mountain('MOUNTAIN'), ], ]
+        older, old, new = Carnivore(), Carnivore(), Herbivore()
+        older.status = old.status = 'dead'
+        terrain.animals_locations = {older: (0, 0), old: (0, 0)}
+        terrain.carcass_store.expire(0)
+        self.assertEqual(([old], 1), (list(terrain.carcass_store), terrain.carcass_store.decomposed_count))
+
+        terrain.animals_locations = {new: (0, 0)}
+
+        self.assertEqual(([], 0), (list(terrain.carcass_store), terrain.carcass_store.decomposed_count))
+        self.assertEqual(1, terrain.carcass_store.max_carcasses)
+        self.assertEqual((1, 0, 0), (terrain.stats()['alive_total'], terrain.dead_animals_count,
+                                     terrain.stats()['carcasses']))
+
+    def test_terrain_live_set_holds_only_living_animals(self):
+        terrain = Terrain(6, 6, 60, carcass_store=CarcassStore(ttl=3, max_carcasses=10), seed=8)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+
+        for day in range(40):
+            terrain.activate_animals()
+
+            for animal in terrain.animals_locations:
+                self.assertEqual('alive', animal.status)
+            self.assertTrue(len(terrain.carcass_store) <= 10)
+
+
+if __name__ == '__main__':
+    main()
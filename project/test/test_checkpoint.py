@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+
+
+def terrain_state(terrain):
+    return (terrain.stats(), terrain.counters.cells, terrain.counters.deaths,
+            [(animal.animal_type, position, animal.hunger_rate, animal.status)
+             for animal, position in terrain.animals_locations.items()],
+            [(animal.animal_type, position, terrain.carcass_store.died_on[animal])
+             for animal, position in terrain.carcass_store.items()])
+
+
+@skipIf(np is None, 'numpy is not installed')
+class CheckpointTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'run.ckpt')
+
+    def make_terrain(self, grid_mode=False):
+        terrain = Terrain(8, 9, 200, carcass_store=CarcassStore(ttl=3, max_carcasses=30), track_cell_counts=True,
+                          seed=12)
+        terrain.create_terrain(grid_mode=grid_mode)
+        terrain.fill_with_animals()
+        for day in range(6):
+            terrain.activate_animals()
+        return terrain
+
+    def assert_resumes_identically(self, original, resumed, days=12):
+        self.assertEqual(terrain_state(original), terrain_state(resumed))
+        for day in range(days):
+            original.activate_animals()
+            resumed.activate_animals()
+            self.assertEqual(terrain_state(original), terrain_state(resumed))
+
+    def test_checkpoint_terrain_resumes_bit_for_bit(self):
+        from project.checkpoint.checkpoint import load_checkpoint, save_checkpoint
+
+        terrain = self.make_terrain()
+        save_checkpoint(self.path, terrain)
+        resumed = load_checkpoint(self.path)
+
+        self.assertIsNone(resumed.grid)
+        self.assertEqual(terrain.carcass_store.decomposed_count, resumed.carcass_store.decomposed_count)
+        self.assert_resumes_identically(terrain, resumed)
+
+    def test_checkpoint_grid_terrain_resumes_from_a_memory_map(self):
+        from project.checkpoint.checkpoint import Checkpoint
+
+        terrain = self.make_terrain(grid_mode=True)
+        Checkpoint.from_terrain(terrain).write(self.path)
+        resumed = Checkpoint.read(self.path, mmap=True).to_terrain()
+
+        self.assertIsInstance(resumed.grid.cells.base, np.memmap)
+        self.assert_resumes_identically(terrain, resumed)
+
+    def test_checkpoint_engine_resumes_from_a_memory_map_without_touching_the_file(self):
+        from project.checkpoint.checkpoint import load_checkpoint, save_checkpoint
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+
+        engine = VectorizedTickEngine.from_terrain(self.make_terrain(grid_mode=True))
+        engine.tick()
+        save_checkpoint(self.path, engine)
+        with open(self.path, 'rb') as file:
+            saved = file.read()
+
+        resumed = load_checkpoint(self.path, mmap=True)
+        self.assertIsInstance(resumed.population.hunger, np.memmap)
+        self.assertEqual((3, 30), (resumed.carcass_ttl, resumed.max_carcasses))
+
+        for day in range(8):
+            engine.tick()
+            resumed.tick()
+            self.assertEqual(engine.stats(), resumed.stats())
+            self.assertEqual(engine.population.rows.tolist(), resumed.population.rows.tolist())
+
+        with open(self.path, 'rb') as file:
+            self.assertEqual(saved, file.read())
+
+    def test_checkpoint_is_compact(self):
+        from project.checkpoint.checkpoint import save_checkpoint
+
+        terrain = Terrain(100, 100, 20000, seed=1)
+        terrain.create_terrain(grid_mode=True)
+        terrain.fill_with_animals()
+        save_checkpoint(self.path, terrain)
+
+        # One byte per cell, 17 bytes per animal, plus a small header.
+        self.assertLess(os.path.getsize(self.path), 100 * 100 + 20000 * 17 + 16384)
+
+    def test_checkpoint_rejects_other_files(self):
+        from project.checkpoint.checkpoint import Checkpoint
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a checkpoint at all')
+
+        with self.assertRaises(ValueError):
+            Checkpoint.read(self.path)
+
+    def test_cli_resume_continues_the_run(self):
+        from project.__main__ import main as cli_main
+
+        def run_cli(*argv):
+            stdout = io.StringIO()
+            cli_main(list(argv) + ['--format', 'json'], stdout=stdout)
+            return json.loads(stdout.getvalue())['days']
+
+        options = ['--rows', '6', '--cols', '6', '--animals', '60', '--seed', '4']
+        straight = run_cli(*options, '--days', '10')
+        first = run_cli(*options, '--days', '4', '--checkpoint', self.path, '--checkpoint-every', '2')
+        second = run_cli('--resume', self.path, '--days', '6')
+
+        self.assertEqual(straight, first + second)
+
+
+if __name__ == '__main__':
+    main()
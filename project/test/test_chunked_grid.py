@@ -0,0 +1,113 @@
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+
+
+def run_chunked_world(max_bytes, days=25):
+    from project.generation.biome_generator import BiomeGenerator
+
+    side = 10 ** 9
+    terrain = Terrain(side, side, 400, carcass_store=CarcassStore(ttl=2), seed=5)
+    terrain.create_terrain_chunked(BiomeGenerator(scale=6), chunk_size=8, max_bytes=max_bytes)
+    terrain.fill_with_animals(area=(side // 2, side // 2, 60, 60))
+    summaries = list(terrain.run(days))
+    return terrain, summaries
+
+
+@skipIf(np is None, 'numpy is not installed')
+class ChunkedGridTests(TestCase):
+    def test_chunked_grid_cells_come_from_the_generator_region(self):
+        from project.generation.biome_generator import BiomeGenerator
+        from project.grid.chunked_grid import ChunkedGrid
+
+        generator = BiomeGenerator(scale=5)
+        grid = ChunkedGrid(10 ** 6, 10 ** 6, generator, key=42, chunk_size=16)
+        expected = generator.region(42, 1000, 2000, 40, 40)
+
+        cells = [[grid.cell_code(1000 + row, 2000 + col) for col in range(40)] for row in range(40)]
+
+        self.assertEqual(expected.tolist(), cells)
+        self.assertEqual(9, len(grid.chunks))
+        self.assertEqual(Terrain.terrain_cell_types[int(expected[3, 4])], grid.cell_type(1003, 2004))
+
+    def test_chunked_grid_regenerates_evicted_chunks_identically(self):
+        from project.generation.uniform_generator import UniformGenerator
+        from project.grid.chunked_grid import ChunkedGrid
+
+        grid = ChunkedGrid(1000, 1000, UniformGenerator(), key=7, chunk_size=10, max_bytes=100)
+        first = grid.chunk(3, 4)
+        grid.chunk(0, 0)
+
+        self.assertEqual(1, grid.evict(lambda: [(5, 5)]))
+        self.assertEqual([(0, 0)], list(grid.chunks))
+        self.assertEqual(first, grid.chunk(3, 4))
+        self.assertEqual(3, grid.generated_count)
+
+    def test_chunked_grid_evicts_least_recently_used_empty_chunks(self):
+        from project.generation.uniform_generator import UniformGenerator
+        from project.grid.chunked_grid import ChunkedGrid
+
+        grid = ChunkedGrid(100, 100, UniformGenerator(), key=1, chunk_size=4, max_bytes=3 * 2 * 16)
+        for chunk in [(0, 0), (0, 1), (0, 2), (0, 3), (0, 4)]:
+            grid.chunk(*chunk)
+        grid.chunk(0, 1)
+
+        occupied_calls = []
+
+        def occupied():
+            occupied_calls.append(True)
+            return [(1, 1)]
+
+        self.assertEqual(2, grid.evict(occupied))
+        self.assertEqual([(0, 0), (0, 4), (0, 1)], list(grid.chunks))
+        self.assertEqual(0, grid.evict(occupied))
+        self.assertEqual(1, len(occupied_calls))
+        self.assertEqual(3 * 16, grid.nbytes)
+
+    def test_terrain_chunked_world_is_unaffected_by_eviction(self):
+        roomy, roomy_summaries = run_chunked_world(max_bytes=1 << 30)
+        tight, tight_summaries = run_chunked_world(max_bytes=64 * 20)
+
+        self.assertEqual(roomy_summaries, tight_summaries)
+        self.assertEqual(0, roomy.chunked_grid.evicted_count)
+        self.assertGreater(tight.chunked_grid.evicted_count, 0)
+
+        # Memory follows the occupied area: at most the budget, or the chunks that still hold something.
+        occupied = {tight.chunked_grid.chunk_of(*position) for position in tight.occupied_positions()}
+        self.assertLessEqual(len(tight.chunked_grid.chunks), max(tight.chunked_grid.max_chunks, len(occupied)))
+
+    def test_terrain_fill_with_animals_inside_an_area(self):
+        terrain = Terrain(50, 60, 300, seed=3)
+        terrain.create_terrain()
+        terrain.fill_with_animals(area=(10, 20, 5, 6))
+
+        positions = list(terrain.animals_locations.values()) + [position for _, position in
+                                                                 terrain.carcass_store.items()]
+        self.assertEqual(300, len(positions))
+        self.assertTrue(all(10 <= row < 15 and 20 <= col < 26 for row, col in positions))
+
+        with self.assertRaises(ValueError):
+            terrain.fill_with_animals(area=(48, 0, 5, 5))
+
+    def test_terrain_chunked_world_cannot_be_checkpointed_or_converted(self):
+        from project.checkpoint.checkpoint import Checkpoint
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+        from project.tiled.tiled_simulation import TiledSimulation
+
+        terrain = Terrain(1000, 1000, 10, seed=1)
+        terrain.create_terrain(chunked=True)
+        terrain.fill_with_animals()
+
+        for convert in (Checkpoint.from_terrain, VectorizedTickEngine.from_terrain, TiledSimulation.from_terrain):
+            with self.assertRaises(ValueError):
+                convert(terrain)
+
+
+if __name__ == '__main__':
+    main()
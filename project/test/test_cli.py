@@ -0,0 +1,61 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase, main
+
+from project.__main__ import main as cli_main
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CliTests(TestCase):
+    def run_cli(self, *argv):
+        stdout = io.StringIO()
+        self.assertEqual(0, cli_main(list(argv), stdout=stdout))
+        return stdout.getvalue()
+
+    def test_cli_json_output_reports_each_day(self):
+        result = json.loads(self.run_cli('--rows', '4', '--cols', '4', '--animals', '7', '--days', '3',
+                                         '--seed', '5', '--format', 'json'))
+
+        self.assertEqual(4, result['rows'])
+        self.assertEqual(7, result['animals_count'])
+        self.assertEqual(result['days_run'], len(result['days']))
+
+        for day in result['days']:
+            total = sum(status['alive'] + status['dead'] for status in day['animals'].values())
+            self.assertEqual(7, total)
+
+    def test_cli_reports_the_last_day_once(self):
+        result = json.loads(self.run_cli('--rows', '3', '--cols', '3', '--animals', '4', '--days', '40',
+                                         '--seed', '2', '--format', 'json'))
+
+        self.assertTrue(result['all_animals_dead'])
+        self.assertEqual(list(range(1, result['days_run'] + 1)), [day['day'] for day in result['days']])
+
+        result = json.loads(self.run_cli('--animals', '0', '--days', '3', '--format', 'json'))
+        self.assertEqual((0, []), (result['days_run'], result['days']))
+
+    def test_cli_same_seed_same_result(self):
+        argv = ('--rows', '5', '--cols', '5', '--animals', '10', '--days', '8', '--seed', '11', '--format', 'json')
+
+        self.assertEqual(self.run_cli(*argv), self.run_cli(*argv))
+
+    def test_cli_text_output(self):
+        output = self.run_cli('--days', '2', '--seed', '3')
+
+        self.assertTrue(output.startswith('Terrain 3x4 with 3 animals'))
+
+    def test_cli_importing_terrain_has_no_side_effects(self):
+        code = 'import sys, project.terrain; print("numpy" in sys.modules)'
+        completed = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL,
+                                   capture_output=True, text=True, timeout=30)
+
+        self.assertEqual(0, completed.returncode, completed.stderr)
+        self.assertEqual('False\n', completed.stdout)
+
+
+if __name__ == '__main__':
+    main()
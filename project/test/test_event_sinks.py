@@ -0,0 +1,87 @@
+import contextlib
+import io
+from unittest import TestCase, main
+
+from project.animal.carnivore import Carnivore
+from project.animal.scavenger import Scavenger
+from project.events.counting_event_sink import CountingEventSink
+from project.events.ring_buffer_event_sink import RingBufferEventSink
+from project.events.simulation_event import ALL_ANIMALS_DEAD, BORDER_BLOCKED, HUNGER_DEATH, WATER_DEATH, format_event
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+from project.terrain_cell.water import Water
+
+
+class EventSinkTests(TestCase):
+    def test_ring_buffer_event_sink_keeps_latest_events(self):
+        sink = RingBufferEventSink(capacity=3)
+
+        for col in range(5):
+            sink.record(WATER_DEATH, 'Carnivore', (0, col))
+
+        events = sink.drain()
+
+        self.assertEqual([(0, 2), (0, 3), (0, 4)], [event.position for event in events])
+        self.assertEqual(2, sink.dropped)
+        self.assertEqual([], sink.drain())
+
+    def test_ring_buffer_event_sink_records_day(self):
+        terrain = Terrain(1, 1, 1, event_sink=RingBufferEventSink())
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        terrain.animals_locations = {Scavenger(): (0, 0)}
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 3
+
+        terrain.activate_animals()
+        event = terrain.event_sink.drain()[0]
+
+        self.assertEqual(1, event.day)
+        self.assertEqual(BORDER_BLOCKED, event.kind)
+        self.assertTrue(format_event(event).startswith('Scavenger cannot go to this direction. There is a border '))
+
+    def test_counting_event_sink_aggregates_per_day(self):
+        terrain = Terrain(1, 2, 2, event_sink=CountingEventSink())
+        terrain.terrain_map = [[Grass('GRASS'), Water('WATER')], ]
+        terrain.animals_locations = {Carnivore(): (0, 0), Carnivore(): (0, 0)}
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 1
+
+        terrain.activate_animals()
+
+        self.assertEqual([(1, {HUNGER_DEATH: 2})], terrain.event_sink.drain())
+        self.assertEqual({HUNGER_DEATH: 2}, terrain.event_sink.totals)
+
+    def test_counting_event_sink_counts_the_end_of_the_run_under_the_last_day(self):
+        terrain = Terrain(1, 1, 1, event_sink=CountingEventSink())
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        terrain.animals_locations = {Carnivore(): (0, 0)}
+        next(iter(terrain.animals_locations)).hunger_rate = 1
+
+        terrain.activate_animals()
+        terrain.activate_animals()
+
+        self.assertEqual([(1, {HUNGER_DEATH: 1, ALL_ANIMALS_DEAD: 1})], terrain.event_sink.drain())
+        self.assertEqual({HUNGER_DEATH: 1, ALL_ANIMALS_DEAD: 1}, terrain.event_sink.totals)
+
+        terrain.activate_animals()
+        self.assertEqual([(1, {ALL_ANIMALS_DEAD: 1})], terrain.event_sink.drain())
+        self.assertEqual(2, terrain.event_sink.totals[ALL_ANIMALS_DEAD])
+
+    def test_terrain_without_event_sink_writes_nothing(self):
+        terrain = Terrain(4, 4, 20, seed=3)
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            terrain.create_terrain()
+            terrain.fill_with_animals()
+
+            for day in range(12):
+                terrain.activate_animals()
+
+        self.assertEqual('', output.getvalue())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import io
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+
+
+def make_terrain(history_recorder=None):
+    terrain = Terrain(25, 25, 250, carcass_store=CarcassStore(ttl=4), seed=8, history_recorder=history_recorder)
+    terrain.create_terrain()
+    terrain.fill_with_animals()
+    return terrain
+
+
+@skipIf(np is None, 'numpy is not installed')
+class HistoryRecorderTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'run.hist')
+
+    def test_days_read_back_as_the_terrain_counted_them(self):
+        from project.history.history_file import HistoryFile
+        from project.history.history_recorder import HistoryRecorder
+
+        summaries = list(make_terrain().run(12))
+        with HistoryRecorder(self.path, buffer_days=5) as history:
+            terrain = make_terrain(history)
+            for _ in range(12):
+                terrain.activate_animals()
+                self.assertLess(len(history), 5)
+
+        days = HistoryFile(self.path).days()
+        self.assertEqual(3, history.blocks_written)
+        self.assertEqual([summary.day for summary in summaries], days['day'].tolist())
+        for animal_type in Terrain.animal_types.values():
+            self.assertEqual([getattr(summary.alive, animal_type) for summary in summaries],
+                             days[f'alive_{animal_type}'].tolist())
+            self.assertEqual([getattr(summary.eaten, animal_type) for summary in summaries],
+                             days[f'eaten_{animal_type}'].tolist())
+        # Deaths are running totals; a day's own deaths are the difference.
+        self.assertEqual([summary.deaths.hunger for summary in summaries[1:]],
+                         np.diff(days['deaths_hunger']).tolist())
+        self.assertEqual([summary.carcasses for summary in summaries], days['carcasses'].tolist())
+
+    def test_single_block_columns_are_views_of_the_mapped_file(self):
+        from project.history.history_file import HistoryFile
+        from project.history.history_recorder import HistoryRecorder
+
+        with HistoryRecorder(self.path) as history:
+            terrain = make_terrain(history)
+            for _ in range(6):
+                terrain.activate_animals()
+
+        history_file = HistoryFile(self.path)
+        days = history_file.days()
+        self.assertEqual(['DAYS'], [block.kind for block in history_file.blocks])
+        self.assertIsNotNone(days['alive_Herbivore'].base)
+        self.assertFalse(days['alive_Herbivore'].flags.writeable)
+        self.assertEqual(0, days['day'].ctypes.data % HistoryRecorder.alignment)
+
+    def test_snapshots_hold_every_animal_and_carcass(self):
+        from project.history.history_file import HistoryFile
+        from project.history.history_recorder import HistoryRecorder
+
+        expected = {}
+        with HistoryRecorder(self.path, buffer_days=4, snapshot_every=3) as history:
+            terrain = make_terrain(history)
+            for _ in range(9):
+                terrain.activate_animals()
+                animals = [(HistoryRecorder.species_codes[animal.animal_type], 1, position) for animal, position in
+                           terrain.animals_locations.items()]
+                animals += [(HistoryRecorder.species_codes[animal.animal_type], 0, position) for animal, position in
+                            terrain.carcass_store.items()]
+                expected[terrain.day] = sorted(animals)
+
+        history_file = HistoryFile(self.path)
+        self.assertEqual([3, 6, 9], history_file.snapshot_days())
+        for day in (3, 6, 9):
+            snapshot = history_file.snapshot(day)
+            self.assertEqual(expected[day], sorted(zip(snapshot['species'].tolist(), snapshot['alive'].tolist(),
+                                                       zip(snapshot['rows'].tolist(), snapshot['cols'].tolist()))))
+        with self.assertRaises(KeyError):
+            history_file.snapshot(4)
+
+    def test_reopening_appends_and_a_torn_block_is_dropped(self):
+        from project.history.history_file import HistoryFile
+        from project.history.history_recorder import HistoryRecorder
+
+        terrain = make_terrain()
+        with HistoryRecorder(self.path, buffer_days=2) as history:
+            terrain.history_recorder = history
+            for _ in range(4):
+                terrain.activate_animals()
+        # A crash in the middle of writing the next block.
+        with open(self.path, 'ab') as file:
+            file.write(HistoryRecorder.block_header.pack(b'DAYS', 2, 5, 0, 4096) + bytes(100))
+        self.assertEqual([1, 2, 3, 4], HistoryFile(self.path).days()['day'].tolist())
+
+        with HistoryRecorder(self.path, buffer_days=2) as history:
+            terrain.history_recorder = history
+            for _ in range(3):
+                terrain.activate_animals()
+
+        self.assertEqual(list(range(1, 8)), HistoryFile(self.path).days()['day'].tolist())
+
+        with open(self.path, 'r+b') as file:
+            file.write(b'NOTAHIST')
+        with self.assertRaises(ValueError):
+            HistoryRecorder(self.path)
+
+    def test_cli_history(self):
+        from project.__main__ import main as cli_main
+        from project.history.history_file import HistoryFile
+
+        cli_main(['--rows', '10', '--cols', '10', '--animals', '60', '--days', '5', '--seed', '2',
+                  '--history', self.path, '--history-snapshot-every', '5'], stdout=io.StringIO())
+
+        history_file = HistoryFile(self.path)
+        self.assertEqual([1, 2, 3, 4, 5], history_file.days()['day'].tolist())
+        self.assertEqual([5], history_file.snapshot_days())
+
+    def test_cli_history_keeps_the_days_before_a_failure(self):
+        from project.__main__ import main as cli_main
+        from project.history.history_file import HistoryFile
+
+        # The checkpoint directory does not exist, so saving it fails at the end of day 3.
+        with self.assertRaises(OSError):
+            cli_main(['--rows', '10', '--cols', '10', '--animals', '60', '--days', '5', '--seed', '2',
+                      '--history', self.path, '--checkpoint', os.path.join(self.path, 'missing', 'run.ckpt'),
+                      '--checkpoint-every', '3'], stdout=io.StringIO())
+
+        self.assertEqual([1, 2, 3], HistoryFile(self.path).days()['day'].tolist())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import io
+import json
+import pickle
+from unittest import TestCase, main
+
+from project.montecarlo.__main__ import main as montecarlo_main
+from project.montecarlo.monte_carlo_runner import MonteCarloRunner
+from project.montecarlo.run_summary import RunSummary, SimulationParameters, run_replicate
+from project.montecarlo.survival_curves import SurvivalCurves
+
+
+class MonteCarloRunnerTests(TestCase):
+    parameters = SimulationParameters(5, 5, 30, 15)
+
+    def test_run_replicate_summary_is_compact_and_reproducible(self):
+        summary = run_replicate(self.parameters, 3)
+
+        self.assertEqual(summary, run_replicate(self.parameters, 3))
+        self.assertEqual(16, len(summary.alive['Carnivore']))
+        self.assertLess(len(pickle.dumps(summary)), 1000)
+
+    def test_run_replicate_pads_the_curve_after_extinction(self):
+        summary = run_replicate(SimulationParameters(1, 1, 3, 10), 0)
+
+        for counts in summary.alive.values():
+            self.assertEqual(11, len(counts))
+        if summary.days_run < 10:
+            self.assertEqual(0, sum(counts[-1] for counts in summary.alive.values()))
+
+    def test_survival_curves_aggregate_runs(self):
+        curves = SurvivalCurves(['Carnivore', 'Herbivore', 'Scavenger'], 2)
+        curves.add(RunSummary(0, 2, {'Carnivore': (2, 1, 0), 'Herbivore': (1, 1, 1), 'Scavenger': (0, 0, 0)}, 0, 0))
+        curves.add(RunSummary(1, 2, {'Carnivore': (4, 3, 2), 'Herbivore': (1, 0, 0), 'Scavenger': (1, 0, 0)}, 0, 0))
+
+        self.assertEqual([1.0, 1.0, 0.5], curves.survival_rate('Carnivore'))
+        self.assertEqual([3.0, 2.0, 1.0], curves.mean_alive('Carnivore'))
+        self.assertEqual([1.0, 0.5, 0.5], curves.survival_rate('Herbivore'))
+        self.assertEqual([0.5, 0.0, 0.0], curves.survival_rate('Scavenger'))
+
+    def test_monte_carlo_runner_pool_matches_serial_run(self):
+        seeds = range(24)
+
+        serial = MonteCarloRunner(self.parameters, workers=1).run(seeds)
+        pooled_runner = MonteCarloRunner(self.parameters, workers=2, chunksize=3)
+        summaries = list(pooled_runner.summaries(seeds))
+
+        self.assertEqual(list(seeds), sorted(summary.seed for summary in summaries))
+        self.assertEqual(serial.snapshot(), pooled_runner.curves.snapshot())
+
+    def test_monte_carlo_cli_reports_survival_curves(self):
+        stdout = io.StringIO()
+        montecarlo_main(['--rows', '4', '--cols', '4', '--animals', '10', '--days', '6', '--runs', '5',
+                         '--workers', '1', '--format', 'json'], stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(5, result['runs'])
+        self.assertEqual(7, len(result['survival_rate']['Herbivore']))
+
+
+if __name__ == '__main__':
+    main()
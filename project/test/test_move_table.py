@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.move_table import MoveTable
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+from project.terrain_cell.water import Water
+
+
+def expected_move(terrain, row, col, direction):
+    target = (row + MoveTable.row_steps[direction], col + MoveTable.col_steps[direction])
+    if not (0 <= target[0] < terrain.x and 0 <= target[1] < terrain.y):
+        return None, True, False
+    return target, False, terrain.cell_type_at(*target) == 'WATER'
+
+
+class MoveTableTests(TestCase):
+    def test_move_table_matches_the_map_cell_by_cell(self):
+        for x, y in ((1, 1), (1, 6), (5, 1), (9, 13)):
+            terrain = Terrain(x, y, 0, seed=x * y)
+            terrain.create_terrain()
+            table = MoveTable.from_terrain_map(terrain.terrain_map)
+
+            self.assertEqual(x * y, len(table.flags))
+            for row in range(x):
+                for col in range(y):
+                    for direction in Terrain.directions:
+                        self.assertEqual(expected_move(terrain, row, col, direction), table.move(row, col, direction))
+
+    def test_terrain_builds_the_table_at_the_first_tick_after_the_map_changes(self):
+        terrain = Terrain(1, 2, 1)
+        terrain.terrain_map = [[Grass('GRASS'), Grass('GRASS')], ]
+        terrain.fill_with_animals()
+        self.assertIsNone(terrain.move_table)
+
+        terrain.activate_animals()
+        self.assertEqual((None, True, False), terrain.move_table.move(0, 0, 1))
+        self.assertEqual(((0, 1), False, False), terrain.move_table.move(0, 0, 4))
+
+        terrain.terrain_map = [[Grass('GRASS'), Water('WATER')], ]
+        self.assertIsNone(terrain.move_table)
+        self.assertEqual(((0, 1), False, True), terrain.build_move_table().move(0, 0, 4))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_grid_and_file_maps_give_the_same_table(self):
+        objects = Terrain(30, 20, 0, seed=4)
+        objects.create_terrain()
+        grid = Terrain(30, 20, 0, seed=4)
+        grid.create_terrain(grid_mode=True)
+
+        expected = bytes(MoveTable.from_terrain_map(objects.terrain_map).flags)
+        self.assertEqual(expected, bytes(grid.build_move_table().flags))
+        with tempfile.TemporaryDirectory() as directory:
+            mapped = Terrain(30, 20, 0, seed=4)
+            mapped.create_terrain(terrain_file=os.path.join(directory, 'map.npy'))
+            table = mapped.move_table
+            self.assertEqual({}, dict(table.bands))
+            self.assertEqual(expected, bytes(table.flags_at(row, col) for row in range(30) for col in range(20)))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_banded_table_builds_and_drops_bands_as_they_are_used(self):
+        from project.grid.banded_move_table import BandedMoveTable
+
+        terrain = Terrain(11, 6, 0, seed=8)
+        terrain.create_terrain(grid_mode=True)
+        expected = bytes(terrain.build_move_table().flags)
+
+        # Bands of three rows, at most two of them kept; the last band is shorter.
+        table = BandedMoveTable(terrain.grid, band_rows=3, max_bytes=2 * 3 * 6)
+        self.assertEqual(expected[7 * 6:8 * 6], bytes(table.flags_at(7, col) for col in range(6)))
+        self.assertEqual([2], list(table.bands))
+        self.assertEqual(expected, bytes(table.flags_at(row, col) for row in range(11) for col in range(6)))
+        self.assertEqual([2, 3], list(table.bands))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_chunked_grid_flags_match_a_whole_map_table(self):
+        from project.generation.biome_generator import BiomeGenerator
+        from project.generation.uniform_generator import UniformGenerator
+        from project.grid.chunked_grid import ChunkedGrid
+
+        for generator in (UniformGenerator(), BiomeGenerator(scale=4)):
+            grid = ChunkedGrid(37, 23, generator, key=5, chunk_size=8)
+            water_rows = [bytes([grid.cell_code(row, col) == 1 for col in range(23)]) for row in range(37)]
+            table = MoveTable.from_water_rows(37, 23, water_rows)
+
+            self.assertEqual([table.flags_at(row, col) for row in range(37) for col in range(23)],
+                             [grid.flags_at(row, col) for row in range(37) for col in range(23)])
+            self.assertEqual(len(grid.chunks), len(grid.move_flags))
+            self.assertEqual(2 * sum(len(chunk) for chunk in grid.chunks.values()), grid.nbytes)
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_movement_benchmark_methods_agree(self):
+        from project.benchmark.movement import main as benchmark_main
+
+        stdout = io.StringIO()
+        benchmark_main(['--side', '30', '--steps', '2000', '--repeats', '1', '--format', 'json'], stdout=stdout)
+        results = json.loads(stdout.getvalue())
+
+        self.assertEqual(['branches', 'move table', 'move table, gathered'], [result['method'] for result in results])
+        self.assertEqual(1, len({(result['moves'], result['drowned']) for result in results}))
+        self.assertGreater(results[0]['drowned'], 0)
+
+        stdout = io.StringIO()
+        benchmark_main(['--side', '30', '--steps', '2000', '--repeats', '1', '--methods', 'move table', 'branches'],
+                       stdout=stdout)
+        header, _, branches = stdout.getvalue().splitlines()
+        self.assertTrue(header.endswith('speed-up over branches'))
+        self.assertTrue(branches.endswith(' 1.0x'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import time
+from unittest import TestCase, main
+
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.core.occupancy_index import OccupancyIndex
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+
+
+class OccupancyIndexTests(TestCase):
+    def setUp(self) -> None:
+        self.index = OccupancyIndex()
+
+    def test_occupancy_index_add_and_lookup(self):
+        carnivore = Carnivore()
+        herbivore = Herbivore()
+
+        self.index.add(carnivore, (0, 0))
+        self.index.add(herbivore, (0, 0))
+
+        self.assertEqual([carnivore, herbivore], list(self.index.animals_at((0, 0))))
+        self.assertEqual([], list(self.index.animals_at((1, 1))))
+
+    def test_occupancy_index_move_drops_empty_cell(self):
+        carnivore = Carnivore()
+
+        self.index.add(carnivore, (0, 0))
+        self.index.move(carnivore, (0, 0), (0, 1))
+
+        self.assertEqual(1, len(self.index))
+        self.assertEqual([carnivore], list(self.index.animals_at((0, 1))))
+
+    def test_occupancy_index_buckets_batches_before_later_changes(self):
+        carnivore, herbivore, other = Carnivore(), Herbivore(), Herbivore()
+
+        self.index.add_many([carnivore, herbivore], [(0, 0), (0, 0)])
+        self.index.add(other, (0, 0))
+        self.index.move(carnivore, (0, 0), (1, 0))
+
+        self.assertEqual([herbivore, other], list(self.index.animals_at((0, 0))))
+        self.assertEqual({(0, 0), (1, 0)}, set(self.index.cells))
+
+    def test_occupancy_index_follows_terrain_after_animals_are_eaten(self):
+        terrain = Terrain(1, 1, 3)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        terrain.animals_locations = {Carnivore(): (0, 0), Herbivore(): (0, 0), Herbivore(): (0, 0)}
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 2
+
+        terrain.activate_animals()
+
+        self.assertEqual(list(terrain.animals_locations), list(terrain.occupancy_index.animals_at((0, 0))))
+
+    def test_occupancy_index_tick_time_close_to_linear_in_population(self):
+        def tick_time(animals_count):
+            side = int(animals_count ** 0.5)
+            best = None
+
+            for _ in range(3):
+                terrain = Terrain(side, side, animals_count, seed=animals_count)
+                terrain.terrain_map = [[Grass('GRASS') for _ in range(side)] for _ in range(side)]
+
+                terrain.fill_with_animals()
+
+                for animal in terrain.animals_locations:
+                    animal.hunger_rate = 4
+
+                start = time.perf_counter()
+                terrain.activate_animals()
+                elapsed = time.perf_counter() - start
+
+                best = elapsed if best is None else min(best, elapsed)
+
+            return best
+
+        small = tick_time(2500)
+        large = tick_time(10000)
+
+        # Four times the animals at the same density: linear is ~4x, the old full scan was ~16x.
+        self.assertLess(large / small, 8)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+from unittest import TestCase, main
+
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.animal.scavenger import Scavenger
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+
+
+class PopulationCountersTests(TestCase):
+    def test_population_counters_scavenger_eating_carcass_is_not_a_second_death(self):
+        terrain = Terrain(1, 1, 2)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        herbivore = Herbivore()
+        herbivore.status = 'dead'
+        scavenger = Scavenger()
+        scavenger.hunger_rate = 3
+        terrain.animals_locations = {scavenger: (0, 0), herbivore: (0, 0)}
+
+        terrain.activate_animals()
+        stats = terrain.stats()
+
+        self.assertEqual(1, terrain.dead_animals_count)
+        self.assertEqual(1, stats['eaten']['Herbivore'])
+        self.assertEqual(1, stats['alive']['Scavenger'])
+
+    def test_population_counters_carnivore_and_scavenger_share_a_meal(self):
+        terrain = Terrain(1, 1, 3)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        terrain.animals_locations = {Carnivore(): (0, 0), Scavenger(): (0, 0), Herbivore(): (0, 0)}
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 2
+
+        terrain.activate_animals()
+        stats = terrain.stats()
+
+        self.assertEqual({'Carnivore': 1, 'Herbivore': 0, 'Scavenger': 0}, stats['alive'])
+        self.assertEqual({'Carnivore': 0, 'Herbivore': 1, 'Scavenger': 1}, stats['dead'])
+        self.assertEqual(2, stats['eaten_total'])
+
+    def test_population_counters_match_a_recount_over_a_long_run(self):
+        terrain = Terrain(8, 8, 150, carcass_store=CarcassStore(ttl=5), track_cell_counts=True, seed=21)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+
+        for day in range(40):
+            terrain.activate_animals()
+            stats = terrain.stats()
+
+            alive = dict.fromkeys(Terrain.animal_types.values(), 0)
+            for animal in terrain.animals_locations:
+                alive[animal.animal_type] += 1
+
+            self.assertEqual(alive, stats['alive'])
+            self.assertEqual(150, stats['alive_total'] + stats['dead_total'])
+
+            for position, animals in terrain.occupancy_index.cells.items():
+                cell = dict.fromkeys(Terrain.animal_types.values(), 0)
+                for animal in animals:
+                    cell[animal.animal_type] += 1
+                self.assertEqual(cell, terrain.counters.cell(position))
+
+    def test_population_counters_all_animals_dead_fires_when_last_animal_dies(self):
+        terrain = Terrain(1, 1, 5)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        scavenger = Scavenger()
+        scavenger.hunger_rate = 1
+        terrain.animals_locations = {scavenger: (0, 0)}
+
+        terrain.activate_animals()
+        terrain.activate_animals()
+
+        self.assertTrue(terrain.all_animals_dead)
+
+
+if __name__ == '__main__':
+    main()
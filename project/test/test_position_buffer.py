@@ -0,0 +1,73 @@
+import gc
+import tracemalloc
+from unittest import TestCase, main
+
+from project.animal.herbivore import Herbivore
+from project.core.position_buffer import PositionBuffer
+from project.terrain import Terrain
+
+
+class PositionBufferTests(TestCase):
+    def test_position_buffer_drains_in_write_order_and_keeps_capacity(self):
+        buffer = PositionBuffer()
+        animals = [Herbivore() for _ in range(3)]
+        for i, animal in enumerate(animals):
+            buffer.write(animal, (i, i))
+
+        self.assertEqual(3, len(buffer))
+        self.assertEqual(list(zip(animals, [(0, 0), (1, 1), (2, 2)])), list(buffer.drain()))
+        self.assertEqual(0, len(buffer))
+        self.assertEqual([None] * 3, buffer.animals)
+
+        slots = buffer.animals
+        buffer.write(animals[1], (5, 5))
+        self.assertIs(slots, buffer.animals)
+        self.assertEqual([(animals[1], (5, 5))], list(buffer.drain()))
+
+    def test_position_buffer_clear_drops_references(self):
+        buffer = PositionBuffer()
+        buffer.write(Herbivore(), (0, 0))
+
+        buffer.clear()
+
+        self.assertEqual(0, len(buffer))
+        self.assertEqual([], list(buffer.drain()))
+        self.assertEqual([None], buffer.animals)
+
+    def test_terrain_tick_updates_locations_in_place(self):
+        terrain = Terrain(10, 10, 300, seed=2)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+        locations = terrain.animals_locations
+
+        for day in range(5):
+            terrain.activate_animals()
+            self.assertIs(locations, terrain.animals_locations)
+            self.assertEqual(0, len(terrain.next_locations))
+
+        for position, animals in terrain.occupancy_index.cells.items():
+            for animal in animals:
+                self.assertEqual(position, locations[animal])
+
+    def test_terrain_tick_without_moves_allocates_nothing_per_animal(self):
+        terrain = Terrain(100, 100, 20000, seed=3)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 10
+        terrain.activate_animals()
+        gc.collect()
+
+        tracemalloc.start()
+        try:
+            # Every animal is digesting, so nothing moves, dies or gets eaten.
+            terrain.activate_animals()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, 4096)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.simulation_random import SimulationRandom
+from project.terrain import Terrain
+
+
+def run_terrain(seed, grid_mode=False, days=15):
+    terrain = Terrain(6, 6, 80, seed=seed)
+    terrain.create_terrain(grid_mode=grid_mode)
+    terrain.fill_with_animals()
+
+    history = [[terrain.cell_type_at(row, col) for row in range(6) for col in range(6)]]
+    for day in range(days):
+        terrain.activate_animals()
+        history.append(terrain.stats())
+        history.append(sorted((animal.animal_type, position, animal.hunger_rate)
+                              for animal, position in terrain.animals_locations.items()))
+    return history
+
+
+class SimulationRandomTests(TestCase):
+    def test_simulation_random_same_seed_same_stream(self):
+        first = SimulationRandom(5)
+        second = SimulationRandom(5)
+
+        self.assertEqual([first.randint(1, 4) for _ in range(100)], [second.randint(1, 4) for _ in range(100)])
+        self.assertEqual(first.integers(10, 50), second.integers(10, 50))
+
+    def test_simulation_random_draws_stay_in_range(self):
+        rng = SimulationRandom(1)
+
+        self.assertEqual({1, 2, 3, 4}, {rng.randint(1, 4) for _ in range(1000)})
+        self.assertEqual(set(range(7)), set(rng.integers(7, 1000)))
+
+    def test_simulation_random_scalar_and_bulk_draws_share_one_stream(self):
+        scalar = SimulationRandom(9, block_size=16)
+        bulk = SimulationRandom(9)
+
+        expected = bulk.integers(4, 3) + bulk.integers(4, 40) + bulk.integers(4, 5)
+        drawn = [scalar.below(4) for _ in range(3)] + scalar.integers(4, 40) + [scalar.below(4) for _ in range(5)]
+
+        self.assertEqual(expected, drawn)
+
+    def test_simulation_random_state_round_trip_mid_block(self):
+        rng = SimulationRandom(11)
+        rng.integers(3, 10)
+        rng.below(3)
+        state = rng.getstate()
+        expected = [rng.below(100) for _ in range(5000)]
+
+        restored = SimulationRandom()
+        restored.setstate(state)
+
+        self.assertEqual(expected, [restored.below(100) for _ in range(5000)])
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_simulation_random_array_draws_match_list_draws(self):
+        self.assertEqual(SimulationRandom(4).integers(13, 500), SimulationRandom(4).integers_array(13, 500).tolist())
+
+    def test_terrain_species_weights_skew_the_fill(self):
+        terrain = Terrain(5, 5, 200, seed=3)
+        terrain.create_terrain()
+        terrain.fill_with_animals(species_weights=(0, 1, 0))
+
+        animals = list(terrain.animals_locations) + list(terrain.carcass_store)
+        self.assertEqual({'Herbivore'}, {animal.animal_type for animal in animals})
+
+    def test_terrain_same_seed_reproduces_the_run(self):
+        self.assertEqual(run_terrain(17), run_terrain(17))
+        self.assertNotEqual(run_terrain(17), run_terrain(18))
+
+    def test_terrains_in_one_process_do_not_share_a_stream(self):
+        expected = run_terrain(2)
+
+        first = Terrain(6, 6, 80, seed=2)
+        other = Terrain(6, 6, 80, seed=3)
+        for terrain in (first, other):
+            terrain.create_terrain()
+            terrain.fill_with_animals()
+
+        history = [[first.cell_type_at(row, col) for row in range(6) for col in range(6)]]
+        for day in range(15):
+            other.activate_animals()
+            first.activate_animals()
+            history.append(first.stats())
+            history.append(sorted((animal.animal_type, position, animal.hunger_rate)
+                                  for animal, position in first.animals_locations.items()))
+
+        self.assertEqual(expected, history)
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_terrain_grid_mode_draws_the_same_map_and_animals(self):
+        self.assertEqual(run_terrain(6), run_terrain(6, grid_mode=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.animal_factory import AnimalFactory
+from project.core.simulation_random import SimulationRandom
+from project.events.ring_buffer_event_sink import RingBufferEventSink
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+from project.terrain_cell.water import Water
+
+
+def spawned(terrain):
+    return [(animal.animal_type, position) for animal, position in terrain.animals_locations.items()]
+
+
+class SpawningTests(TestCase):
+    def test_animal_factory_create_many_keeps_the_order(self):
+        names = ['Scavenger', 'Carnivore', 'Carnivore', 'Herbivore']
+        animals = AnimalFactory().create_many(names)
+
+        self.assertEqual(names, [animal.animal_type for animal in animals])
+        self.assertEqual(4, len(set(map(id, animals))))
+        self.assertTrue(all(animal.status == 'alive' and animal.hunger_rate == 10 for animal in animals))
+
+    def test_fill_places_every_animal_on_land(self):
+        terrain = Terrain(20, 30, 2000, track_cell_counts=True, seed=6)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+
+        self.assertEqual(0, len(terrain.carcass_store))
+        self.assertEqual(2000, len(terrain.animals_locations))
+        self.assertTrue(all(terrain.cell_type_at(*position) != 'WATER'
+                            for position in terrain.animals_locations.values()))
+        self.assertEqual(sorted(terrain.occupancy_index.cells), sorted(set(terrain.animals_locations.values())))
+        for position, animals in terrain.occupancy_index.cells.items():
+            cell = dict.fromkeys(Terrain.animal_types.values(), 0)
+            for animal in animals:
+                cell[animal.animal_type] += 1
+            self.assertEqual(cell, terrain.counters.cell(position))
+
+        # Every land cell can be drawn: the index numbers all of them, in row-major order.
+        land = terrain.land_index
+        self.assertEqual([(row, col) for row in range(20) for col in range(30)
+                          if terrain.cell_type_at(row, col) != 'WATER'], land.positions(range(len(land))))
+
+    def test_land_index_resolves_draws_band_by_band(self):
+        from project.core.land_index import LandIndex
+
+        terrain = Terrain(23, 17, 0, seed=3)
+        terrain.create_terrain()
+        whole = terrain.build_land_index(area=(2, 3, 19, 11))
+        land_cells = whole.positions(range(len(whole)))
+        self.assertEqual([(row, col) for row in range(2, 21) for col in range(3, 14)
+                          if terrain.cell_type_at(row, col) != 'WATER'], land_cells)
+
+        # Bands of two rows, so that draws fall in different bands and come back in their own order.
+        banded = LandIndex(17, 2, 19, 2, whole.land_in_rows)
+        self.assertEqual(11, len(banded.starts))
+        picks = SimulationRandom(5).integers(len(banded), 300)
+        self.assertEqual([land_cells[pick] for pick in picks], banded.positions(picks))
+
+    def test_drown_on_spawn_keeps_the_old_behaviour(self):
+        sink = RingBufferEventSink()
+        terrain = Terrain(10, 10, 400, event_sink=sink, seed=9)
+        terrain.create_terrain()
+        terrain.fill_with_animals(drown_on_spawn=True)
+
+        # The same draws as before the batch fill: species, then every row, then every column.
+        rng = SimulationRandom(9)
+        rng.integers(4, 100)
+        species = rng.integers(3, 400)
+        positions = list(zip(rng.integers(10, 400), rng.integers(10, 400)))
+        on_water = [terrain.cell_type_at(*position) == 'WATER' for position in positions]
+
+        expected = [(Terrain.animal_types[code + 1], position)
+                    for code, position, water in zip(species, positions, on_water) if not water]
+        self.assertEqual(expected, spawned(terrain))
+        self.assertEqual(sum(on_water), len(terrain.carcass_store))
+        self.assertEqual(sum(on_water), terrain.counters.deaths['water'])
+        self.assertEqual([position for position, water in zip(positions, on_water) if water],
+                         [event.position for event in sink.drain()])
+
+    def test_fill_drowns_everybody_on_a_map_without_land(self):
+        terrain = Terrain(1, 2, 3, seed=1)
+        terrain.terrain_map = [[Water('WATER'), Water('WATER')], ]
+        terrain.fill_with_animals()
+        self.assertEqual({}, terrain.animals_locations)
+        self.assertEqual(3, terrain.counters.deaths['water'])
+        self.assertEqual(3, len(terrain.carcass_store))
+        self.assertEqual([], list(terrain.run(5)))
+
+        terrain = Terrain(1, 2, 3)
+
+        terrain.terrain_map = [[Water('WATER'), Grass('GRASS')], ]
+        terrain.fill_with_animals()
+        self.assertEqual([(0, 1)] * 3, list(terrain.animals_locations.values()))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_land_index_of_a_grid_resolves_array_draws_band_by_band(self):
+        from project.core.land_index import LandIndex
+
+        terrain = Terrain(23, 17, 0, seed=3)
+        terrain.create_terrain(grid_mode=True)
+        whole = terrain.build_land_index(area=(2, 3, 19, 11))
+        rows, cols = whole.position_arrays(np.arange(len(whole)))
+        land_cells = list(zip(rows.tolist(), cols.tolist()))
+        self.assertEqual([(row, col) for row in range(2, 21) for col in range(3, 14)
+                          if terrain.cell_type_at(row, col) != 'WATER'], land_cells)
+
+        banded = LandIndex(17, 2, 19, 2, whole.land_in_rows)
+        picks = SimulationRandom(5).integers_array(len(banded), 300)
+        rows, cols = banded.position_arrays(picks)
+        self.assertEqual([land_cells[pick] for pick in picks.tolist()], list(zip(rows.tolist(), cols.tolist())))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_every_map_kind_and_the_columnar_fill_draw_the_same_animals(self):
+        from project.columnar.columnar_population import ColumnarPopulation
+        from project.grid.terrain_grid import TerrainGrid
+
+        objects = Terrain(40, 25, 3000, seed=2)
+        objects.create_terrain()
+        objects.fill_with_animals(species_weights=(1, 3, 2))
+        grid = Terrain(40, 25, 3000, seed=2)
+        grid.create_terrain(grid_mode=True)
+        grid.fill_with_animals(species_weights=(1, 3, 2))
+        self.assertEqual(spawned(objects), spawned(grid))
+
+        rng = SimulationRandom(2)
+        population = ColumnarPopulation.random(40, 25, 3000, TerrainGrid.random(40, 25, rng), rng,
+                                               species_weights=(1, 3, 2))
+        self.assertEqual(spawned(objects),
+                         [(Terrain.animal_types[species], (row, col)) for species, row, col in
+                          zip(population.species.tolist(), population.rows.tolist(), population.cols.tolist())])
+
+        water = TerrainGrid(np.full((3, 3), TerrainGrid.cell_codes['WATER'], dtype=np.uint8))
+        population = ColumnarPopulation.random(3, 3, 5, water, SimulationRandom(1))
+        self.assertEqual([ColumnarPopulation.DEAD] * 5, population.status.tolist())
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_chunked_world_draws_land_cells_one_by_one(self):
+        from project.generation.biome_generator import BiomeGenerator
+        from project.generation.weighted_generator import WeightedGenerator
+
+        terrain = Terrain(10 ** 9, 10 ** 9, 10, seed=1)
+        terrain.create_terrain_chunked(chunk_size=16)
+        with self.assertRaises(ValueError):
+            terrain.build_land_index()
+        terrain.fill_with_animals()
+        self.assertEqual(10, len(terrain.animals_locations))
+        self.assertTrue(all(terrain.cell_type_at(*position) != 'WATER'
+                            for position in terrain.animals_locations.values()))
+        self.assertLessEqual(terrain.chunked_grid.generated_count, 40)
+
+        terrain = Terrain(10 ** 6, 10 ** 6, 500, seed=4)
+        terrain.create_terrain_chunked(BiomeGenerator(scale=5), chunk_size=16)
+        terrain.fill_with_animals(area=(1000, 2005, 40, 37))
+        self.assertEqual(500, len(terrain.animals_locations))
+        self.assertTrue(all(1000 <= row < 1040 and 2005 <= col < 2042 and terrain.cell_type_at(row, col) != 'WATER'
+                            for row, col in terrain.animals_locations.values()))
+
+        terrain = Terrain(10 ** 6, 10 ** 6, 1, seed=4)
+        terrain.create_terrain_chunked(WeightedGenerator((1, 0, 0, 0)), chunk_size=16)
+        terrain.fill_with_animals(area=(0, 0, 4, 4))
+        self.assertEqual(1, len(terrain.carcass_store))
+        self.assertTrue(all(row < 4 and col < 4 for _, (row, col) in terrain.carcass_store.items()))
+
+
+if __name__ == '__main__':
+    main()
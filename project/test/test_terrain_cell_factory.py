@@ -0,0 +1,71 @@
+import io
+import json
+import tracemalloc
+from unittest import TestCase, main
+
+from project.benchmark.cell_memory import main as cell_memory_main
+from project.core.terrain_cell_factory import TerrainCellFactory
+from project.terrain import Terrain
+
+
+class TerrainCellFactoryTests(TestCase):
+    def test_terrain_cell_factory_flyweight_shares_one_cell_per_type(self):
+        factory = TerrainCellFactory(flyweight=True)
+
+        self.assertIs(factory.create_terrain_cell('GRASS'), factory.create_terrain_cell('GRASS'))
+        self.assertIs(factory.create_terrain_cell('WATER'),
+                      TerrainCellFactory(flyweight=True).create_terrain_cell('WATER'))
+        self.assertIsNot(factory.create_terrain_cell('GRASS'), factory.create_terrain_cell('DESERT'))
+
+        instances = TerrainCellFactory()
+        self.assertIsNot(instances.create_terrain_cell('GRASS'), instances.create_terrain_cell('GRASS'))
+
+    def test_terrain_cells_are_slotted_and_immutable(self):
+        cell = TerrainCellFactory(flyweight=True).create_terrain_cell('MOUNTAIN')
+
+        self.assertFalse(hasattr(cell, '__dict__'))
+        with self.assertRaises(AttributeError):
+            cell.cell_type = 'WATER'
+        with self.assertRaises(AttributeError):
+            cell.height = 3
+        self.assertEqual('MOUNTAIN', cell.cell_type)
+
+    def test_terrain_flyweight_map_reads_and_runs_like_the_instance_map(self):
+        terrains = []
+        for flyweight_cells in (False, True):
+            terrain = Terrain(9, 11, 120, seed=5, flyweight_cells=flyweight_cells)
+            terrain.create_terrain()
+            terrain.fill_with_animals()
+            for day in range(10):
+                terrain.activate_animals()
+            terrains.append(terrain)
+
+        instances, flyweights = terrains
+        self.assertEqual([[cell.cell_type for cell in row] for row in instances.terrain_map],
+                         [[cell.cell_type for cell in row] for row in flyweights.terrain_map])
+        self.assertEqual(instances.stats(), flyweights.stats())
+        self.assertEqual(4, len({id(cell) for row in flyweights.terrain_map for cell in row}))
+
+    def test_terrain_flyweight_map_uses_far_less_memory(self):
+        def traced_map_bytes(flyweight_cells):
+            terrain = Terrain(200, 200, 0, seed=1, flyweight_cells=flyweight_cells)
+            tracemalloc.start()
+            try:
+                terrain.create_terrain()
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(traced_map_bytes(True) * 4, traced_map_bytes(False))
+
+    def test_cell_memory_benchmark_reports_one_mode(self):
+        stdout = io.StringIO()
+        cell_memory_main(['--side', '20', '--single', 'flyweight'], stdout=stdout)
+
+        result = json.loads(stdout.getvalue())
+        self.assertEqual('flyweight', result['mode'])
+        self.assertEqual(20, result['side'])
+
+
+if __name__ == '__main__':
+    main()
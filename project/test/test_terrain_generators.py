@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.core.simulation_random import SimulationRandom
+from project.terrain import Terrain
+
+
+@skipIf(np is None, 'numpy is not installed')
+class TerrainGeneratorTests(TestCase):
+    def test_uniform_generator_matches_the_default_map(self):
+        from project.generation.uniform_generator import UniformGenerator
+        from project.grid.terrain_grid import TerrainGrid
+
+        default = Terrain(13, 17, 0, seed=4)
+        default.create_terrain()
+        generated = Terrain(13, 17, 0, seed=4)
+        generated.create_terrain(generator=UniformGenerator())
+
+        self.assertEqual([[cell.cell_type for cell in row] for row in default.terrain_map],
+                         [[cell.cell_type for cell in row] for row in generated.terrain_map])
+        self.assertEqual(TerrainGrid.random(13, 17, SimulationRandom(4)).cells.tolist(),
+                         UniformGenerator().generate(13, 17, SimulationRandom(4)).tolist())
+
+    def test_generators_give_the_same_map_in_any_band_size(self):
+        from project.generation.biome_generator import BiomeGenerator
+        from project.generation.uniform_generator import UniformGenerator
+        from project.generation.weighted_generator import WeightedGenerator
+
+        for generator in (UniformGenerator(), WeightedGenerator((1, 0, 3, 2)), BiomeGenerator(scale=5)):
+            whole = generator.generate(30, 11, SimulationRandom(2))
+            bands = list(generator.bands(30, 11, SimulationRandom(2), 7))
+
+            self.assertEqual([7, 7, 7, 7, 2], [len(band) for band in bands])
+            self.assertEqual(whole.tolist(), np.concatenate(bands).tolist())
+            self.assertEqual(np.uint8, whole.dtype)
+
+    def test_generator_without_bands_cannot_be_created(self):
+        from project.generation.terrain_generator import TerrainGenerator
+
+        class RegionOnly(TerrainGenerator):
+            def region(self, key, row, col, rows, cols):
+                return np.ones((rows, cols), dtype=np.uint8)
+
+        with self.assertRaises(TypeError):
+            RegionOnly()
+
+    def test_weighted_generator_follows_its_weights(self):
+        from project.generation.weighted_generator import WeightedGenerator
+
+        cells = WeightedGenerator((1, 0, 0, 3)).generate(200, 200, SimulationRandom(1))
+        counts = np.bincount(cells.ravel(), minlength=5)
+
+        self.assertEqual([0, 0], counts[[2, 3]].tolist())
+        self.assertAlmostEqual(0.25, counts[1] / cells.size, delta=0.01)
+
+        for weights in ((1, 2, 3), (0, 0, 0, 0), (1, -1, 1, 1)):
+            with self.assertRaises(ValueError):
+                WeightedGenerator(weights)
+
+    def test_biome_generator_makes_contiguous_regions_of_every_type(self):
+        from project.generation.biome_generator import BiomeGenerator
+        from project.generation.uniform_generator import UniformGenerator
+
+        def same_as_neighbour(cells):
+            return ((cells[1:] == cells[:-1]).mean() + (cells[:, 1:] == cells[:, :-1]).mean()) / 2
+
+        biomes = BiomeGenerator().generate(300, 300, SimulationRandom(3))
+        uniform = UniformGenerator().generate(300, 300, SimulationRandom(3))
+
+        self.assertEqual({1, 2, 3, 4}, set(np.unique(biomes).tolist()))
+        self.assertGreater(same_as_neighbour(biomes), 0.9)
+        self.assertLess(same_as_neighbour(uniform), 0.3)
+
+    def test_biome_generator_regions_line_up(self):
+        from project.generation.biome_generator import BiomeGenerator
+
+        generator = BiomeGenerator(scale=8)
+        whole = generator.region(99, -20, 5, 60, 50)
+
+        self.assertEqual(whole[25:37, 10:19].tolist(), generator.region(99, 5, 15, 12, 9).tolist())
+        self.assertNotEqual(whole.tolist(), generator.region(100, -20, 5, 60, 50).tolist())
+
+    def test_terrain_generators_in_grid_and_file_mode(self):
+        from project.generation.biome_generator import BiomeGenerator
+
+        expected = BiomeGenerator().generate(40, 30, SimulationRandom(7)).tolist()
+
+        grid_terrain = Terrain(40, 30, 0, seed=7)
+        grid_terrain.create_terrain(grid_mode=True, generator=BiomeGenerator())
+        self.assertEqual(expected, grid_terrain.grid.cells.tolist())
+
+        object_terrain = Terrain(40, 30, 0, seed=7, flyweight_cells=True)
+        object_terrain.create_terrain(generator=BiomeGenerator())
+        codes = {cell_type: code for code, cell_type in Terrain.terrain_cell_types.items()}
+        self.assertEqual(expected, [[codes[cell.cell_type] for cell in row] for row in object_terrain.terrain_map])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_terrain = Terrain(40, 30, 0, seed=7)
+            file_terrain.create_terrain(terrain_file=os.path.join(directory, 'map.npy'), generator=BiomeGenerator())
+            self.assertEqual(expected, file_terrain.grid.cells.tolist())
+
+    def test_cli_terrain_weights(self):
+        from project.__main__ import main as cli_main
+
+        stdout = io.StringIO()
+        cli_main(['--rows', '6', '--cols', '6', '--animals', '40', '--days', '2', '--seed', '1',
+                  '--terrain-weights', '0', '0', '0', '1', '--format', 'json'], stdout=stdout)
+        result = json.loads(stdout.getvalue())
+
+        # All grass: nobody drowns at spawn, and nobody is hungry enough to die within two days.
+        self.assertEqual(0, sum(status['dead'] for status in result['days'][0]['animals'].values()))
+
+    def test_terrain_generation_benchmark_times_each_method(self):
+        from project.benchmark.terrain_generation import main as benchmark_main
+
+        stdout = io.StringIO()
+        benchmark_main(['--side', '20', '--repeats', '1', '--format', 'json'], stdout=stdout)
+        results = json.loads(stdout.getvalue())
+
+        self.assertEqual(['object loop', 'uniform', 'weighted', 'biomes', 'biomes, object map'],
+                         [result['method'] for result in results])
+        self.assertTrue(all(result['seconds'] > 0 for result in results))
+
+    def test_terrain_generation_benchmark_speed_up_is_over_the_object_loop(self):
+        from project.benchmark.terrain_generation import main as benchmark_main
+
+        stdout = io.StringIO()
+        benchmark_main(['--side', '20', '--repeats', '1', '--methods', 'uniform', 'object loop'], stdout=stdout)
+        header, uniform, object_loop = stdout.getvalue().splitlines()
+        self.assertTrue(header.endswith('speed-up over object loop'))
+        self.assertTrue(object_loop.endswith(' 1.0x'))
+
+        stdout = io.StringIO()
+        benchmark_main(['--side', '20', '--repeats', '1', '--methods', 'uniform', 'biomes'], stdout=stdout)
+        self.assertFalse(any(line.endswith('x') for line in stdout.getvalue().splitlines()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.terrain import Terrain
+
+
+@skipIf(np is None, 'numpy is not installed')
+class TerrainGridTests(TestCase):
+    def setUp(self) -> None:
+        self.x = 5
+        self.y = 7
+        self.animals_count = 10
+        self.terrain = Terrain(self.x, self.y, self.animals_count)
+
+    def test_terrain_grid_codes_match_terrain_cell_types(self):
+        from project.grid.terrain_grid import TerrainGrid
+
+        self.assertEqual(Terrain.terrain_cell_types, TerrainGrid.cell_types)
+
+    def test_terrain_grid_mode_stores_uint8_cells(self):
+        self.terrain.create_terrain(grid_mode=True)
+
+        self.assertEqual((self.x, self.y), self.terrain.grid.cells.shape)
+        self.assertEqual(np.uint8, self.terrain.grid.cells.dtype)
+        self.assertTrue(((self.terrain.grid.cells >= 1) & (self.terrain.grid.cells <= 4)).all())
+
+    def test_terrain_grid_mode_object_view_matches_grid(self):
+        self.terrain.create_terrain(grid_mode=True)
+
+        self.assertEqual(self.x, len(self.terrain.terrain_map))
+        self.assertEqual(self.y, len(self.terrain.terrain_map[0]))
+
+        for row in range(self.x):
+            for col in range(self.y):
+                cell = self.terrain.terrain_map[row][col]
+                self.assertEqual(self.terrain.grid.cell_type(row, col), cell.cell_type)
+                self.assertEqual(cell.cell_type.capitalize(), cell.__class__.__name__)
+
+    def test_terrain_grid_water_mask(self):
+        self.terrain.create_terrain(grid_mode=True)
+
+        mask = self.terrain.grid.water_mask()
+
+        for row in range(self.x):
+            for col in range(self.y):
+                self.assertEqual(mask[row, col], self.terrain.cell_type_at(row, col) == 'WATER')
+
+    def test_terrain_grid_round_trip_from_terrain_map(self):
+        from project.grid.terrain_grid import TerrainGrid
+
+        self.terrain.create_terrain()
+        grid = TerrainGrid.from_terrain_map(self.terrain.terrain_map)
+
+        for row in range(self.x):
+            for col in range(self.y):
+                self.assertEqual(self.terrain.terrain_map[row][col].cell_type, grid.cell_type(row, col))
+
+    def test_terrain_to_grid_reuses_a_grid_and_copies_an_object_map(self):
+        self.terrain.create_terrain()
+        grid = self.terrain.to_grid()
+        self.assertEqual([[cell.cell_type for cell in row] for row in self.terrain.terrain_map],
+                         [[grid.cell_type(row, col) for col in range(self.y)] for row in range(self.x)])
+
+        self.terrain.create_terrain(grid_mode=True)
+        self.assertIs(self.terrain.grid, self.terrain.to_grid())
+
+    def test_terrain_grid_mode_runs_a_day(self):
+        self.terrain.create_terrain(grid_mode=True)
+        self.terrain.fill_with_animals()
+
+        for animal in self.terrain.animals_locations:
+            animal.hunger_rate = 4
+
+        self.terrain.activate_animals()
+
+        for row, col in self.terrain.animals_locations.values():
+            self.assertTrue(0 <= row < self.x and 0 <= col < self.y)
+
+    def make_terrain_file_path(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return os.path.join(directory.name, 'terrain.npy')
+
+    def test_terrain_grid_file_matches_in_memory_generation(self):
+        from project.core.simulation_random import SimulationRandom
+        from project.grid.terrain_grid import TerrainGrid
+
+        path = self.make_terrain_file_path()
+        mapped = TerrainGrid.create_file(path, 23, 17, SimulationRandom(3), chunk_cells=40)
+
+        self.assertIsInstance(mapped.cells.base, np.memmap)
+        self.assertEqual(TerrainGrid.random(23, 17, SimulationRandom(3)).cells.tolist(), mapped.cells.tolist())
+
+    def test_terrain_file_is_generated_once_then_reopened(self):
+        path = self.make_terrain_file_path()
+        first = Terrain(self.x, self.y, self.animals_count, seed=1)
+        first.create_terrain(terrain_file=path)
+        second = Terrain(self.x, self.y, self.animals_count, seed=2)
+        second.create_terrain(terrain_file=path)
+
+        self.assertEqual(first.grid.cells.tolist(), second.grid.cells.tolist())
+        with self.assertRaises(ValueError):
+            Terrain(self.x + 1, self.y, self.animals_count).create_terrain(terrain_file=path)
+
+    def test_terrain_file_runs_like_a_grid_terrain(self):
+        path = self.make_terrain_file_path()
+        in_memory = Terrain(12, 12, 150, seed=8)
+        in_memory.create_terrain(grid_mode=True)
+        mapped = Terrain(12, 12, 150, seed=8)
+        mapped.create_terrain(terrain_file=path)
+
+        for terrain in (in_memory, mapped):
+            terrain.fill_with_animals()
+            for day in range(10):
+                terrain.activate_animals()
+
+        self.assertEqual(in_memory.stats(), mapped.stats())
+        self.assertEqual(list(in_memory.animals_locations.values()), list(mapped.animals_locations.values()))
+
+
+if __name__ == '__main__':
+    main()
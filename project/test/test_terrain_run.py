@@ -0,0 +1,99 @@
+import pickle
+from itertools import islice
+from unittest import TestCase, main
+
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.animal.scavenger import Scavenger
+from project.core.carcass_store import CarcassStore
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+
+
+class TerrainRunTests(TestCase):
+    def make_terrain(self, seed=8):
+        terrain = Terrain(8, 8, 150, carcass_store=CarcassStore(ttl=4), seed=seed)
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+        return terrain
+
+    def test_terrain_run_yields_the_same_counts_as_a_manual_loop(self):
+        manual = self.make_terrain()
+        streamed = self.make_terrain()
+
+        days = 0
+        for summary in streamed.run(30):
+            manual.activate_animals()
+            stats = manual.stats()
+            days += 1
+
+            self.assertEqual(stats['day'], summary.day)
+            self.assertEqual(stats['alive'], summary.alive._asdict())
+            self.assertEqual(stats['dead'], summary.dead._asdict())
+            self.assertEqual(stats['eaten'], summary.eaten._asdict())
+            self.assertEqual(stats['carcasses'], summary.carcasses)
+
+        self.assertEqual(days, streamed.day)
+
+    def test_terrain_run_deaths_by_cause_add_up_to_the_dead(self):
+        terrain = self.make_terrain()
+        deaths_at_spawn = terrain.counters.deaths['water']
+
+        summaries = list(terrain.run(60))
+        deaths = [sum(summary.deaths) for summary in summaries]
+
+        self.assertEqual(terrain.counters.dead_total, deaths_at_spawn + sum(deaths))
+        for previous, summary, died in zip(summaries, summaries[1:], deaths[1:]):
+            self.assertEqual(sum(summary.dead) - sum(previous.dead), died)
+
+    def test_terrain_run_counts_predation(self):
+        terrain = Terrain(1, 1, 3)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        terrain.animals_locations = {Carnivore(): (0, 0), Scavenger(): (0, 0), Herbivore(): (0, 0)}
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 2
+
+        summary = next(terrain.run(1))
+
+        self.assertEqual((0, 0, 2, 0), (summary.deaths.water, summary.deaths.hunger, summary.deaths.predation,
+                                        summary.deaths.external))
+        self.assertEqual(1, summary.alive.Carnivore)
+
+    def test_terrain_run_is_lazy_and_can_stop_early(self):
+        terrain = self.make_terrain()
+
+        first = list(islice(terrain.run(30), 3))
+        self.assertEqual([1, 2, 3], [summary.day for summary in first])
+        self.assertEqual(3, terrain.day)
+
+        for summary in terrain.run(30):
+            if summary.alive.Herbivore < 10:
+                break
+        self.assertEqual(summary.day, terrain.day)
+
+    def test_terrain_run_stops_once_every_animal_is_dead(self):
+        terrain = Terrain(1, 1, 5)
+        terrain.terrain_map = [[Grass('GRASS'), ], ]
+        scavenger = Scavenger()
+        scavenger.hunger_rate = 1
+        terrain.animals_locations = {scavenger: (0, 0)}
+
+        summaries = list(terrain.run(10))
+
+        self.assertEqual([1], [summary.day for summary in summaries])
+        self.assertEqual(1, summaries[0].deaths.hunger)
+        self.assertTrue(terrain.all_animals_dead)
+        self.assertEqual([], list(terrain.run(10)))
+
+    def test_terrain_run_summaries_are_immutable_and_picklable(self):
+        summary = next(self.make_terrain().run(1))
+
+        with self.assertRaises(AttributeError):
+            summary.alive.Herbivore = 0
+        with self.assertRaises(TypeError):
+            summary.deaths[0] = 0
+        self.assertEqual(summary, pickle.loads(pickle.dumps(summary)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import tempfile
+from collections import Counter
+from unittest import TestCase, main, skipIf
+
+from project.core.carcass_store import CarcassStore
+from project.streaming.tick_delta import DeltaMirror, KEYFRAME, decode_frame, encode_frame, frame_header
+from project.streaming.tick_delta_publisher import TickDeltaPublisher, read_frames
+from project.streaming.tick_delta_recorder import TickDeltaRecorder
+from project.terrain import Terrain
+
+
+def make_terrain(animals=300, seed=11):
+    terrain = Terrain(30, 30, animals, carcass_store=CarcassStore(ttl=3), seed=seed)
+    terrain.create_terrain()
+    return terrain
+
+
+def terrain_state(terrain):
+    """What an observer should see: (species code, position, alive) for every animal and carcass."""
+    codes = TickDeltaRecorder.species_codes
+    state = Counter((codes[animal.animal_type], position, True) for animal, position in
+                    terrain.animals_locations.items())
+    state.update((codes[animal.animal_type], position, False) for animal, position in terrain.carcass_store.items())
+    return state
+
+
+def mirror_state(mirror):
+    return Counter((species, position, alive) for species, position, alive in mirror.animals.values())
+
+
+class TickDeltaPublisherTests(TestCase):
+    def test_frame_roundtrip(self):
+        frame = encode_frame(7, ([1, 2], [3, 4], [5, 6], [1, 3]), ([2], [9], [8]), ([1], [3], [5]), [4], [],
+                             flags=KEYFRAME)
+        delta = decode_frame(frame)
+
+        self.assertEqual(7, delta.day)
+        self.assertTrue(delta.keyframe)
+        self.assertEqual([(1, 3, 5, 1), (2, 4, 6, 3)], delta.spawned)
+        self.assertEqual([(2, 9, 8)], delta.moved)
+        self.assertEqual([(1, 3, 5)], delta.died)
+        self.assertEqual([4], delta.eaten)
+        self.assertEqual([], delta.decomposed)
+
+        with self.assertRaises(ValueError):
+            decode_frame(b'XXXX' + frame[4:])
+        with self.assertRaises(ValueError):
+            decode_frame(frame + b'\0')
+
+    def test_frames_are_compact(self):
+        # Twelve bytes per move, four per meal, on a fixed header.
+        frame = encode_frame(1, ((), (), (), b''), (range(100), range(100), range(100)), ((), (), ()), range(10), ())
+        self.assertEqual(frame_header.size + 100 * 12 + 10 * 4, len(frame))
+
+    def test_recorded_frames_rebuild_the_terrain_every_tick(self):
+        terrain = Terrain(30, 30, 300, carcass_store=CarcassStore(ttl=3), seed=11, delta_recorder=TickDeltaRecorder())
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+        mirror = DeltaMirror()
+        mirror.apply(terrain.delta_recorder.flush(terrain.day))
+        self.assertEqual(terrain_state(terrain), mirror_state(mirror))
+
+        kinds = Counter()
+        for summary in terrain.run(15):
+            delta = mirror.apply(terrain.delta_recorder.flush(summary.day))
+            kinds.update(kind for kind in ('moved', 'died', 'eaten', 'decomposed') if getattr(delta, kind))
+            self.assertEqual(summary.day, mirror.day)
+            self.assertEqual(terrain_state(terrain), mirror_state(mirror))
+
+        self.assertEqual({'moved', 'died', 'eaten', 'decomposed'}, set(kinds))
+        # Ids are released with the animal, so the table never outgrows the map.
+        self.assertEqual(len(mirror.animals), len(terrain.delta_recorder.ids))
+
+    def test_recorder_does_not_change_the_simulation(self):
+        plain = make_terrain()
+        plain.fill_with_animals()
+        recorded = Terrain(30, 30, 300, carcass_store=CarcassStore(ttl=3), seed=11, delta_recorder=TickDeltaRecorder())
+        recorded.create_terrain()
+        recorded.fill_with_animals()
+
+        self.assertEqual(list(plain.run(10)), list(recorded.run(10)))
+
+    def test_queue_subscribers_get_the_same_frames(self):
+        async def scenario():
+            terrain = make_terrain()
+            publisher = TickDeltaPublisher(terrain)
+            first = publisher.subscribe(max_frames=100)
+            terrain.fill_with_animals()
+            second = publisher.subscribe(max_frames=100)
+            days = await publisher.run(10)
+            publisher.close()
+            return terrain, days, [frame async for frame in first], [frame async for frame in second]
+
+        terrain, days, first, second = asyncio.run(scenario())
+
+        # The first subscriber joined on an empty map and sees the spawn; the second starts from a keyframe.
+        self.assertEqual(10, days)
+        self.assertEqual(first[2:], second[1:])
+        self.assertTrue(decode_frame(second[0]).keyframe)
+        for frames in (first, second):
+            mirror = DeltaMirror()
+            for frame in frames:
+                mirror.apply(frame)
+            self.assertEqual(terrain_state(terrain), mirror_state(mirror))
+
+    def test_slow_subscribers_are_dropped_or_sampled_without_stalling(self):
+        async def scenario():
+            terrain = make_terrain()
+            terrain.fill_with_animals()
+            publisher = TickDeltaPublisher(terrain)
+            dropped = publisher.subscribe(max_frames=3, policy='drop')
+            sampled = publisher.subscribe(max_frames=3, policy='sample')
+            mirror = DeltaMirror()
+            frames = []
+            run = asyncio.create_task(publisher.run(20))
+            while not run.done():
+                # A reader that wakes up only every few ticks.
+                for _ in range(5):
+                    await asyncio.sleep(0)
+                for frame in sampled.drain():
+                    frames.append(mirror.apply(frame))
+            publisher.close()
+            async for frame in sampled:
+                frames.append(mirror.apply(frame))
+            return terrain, run.result(), dropped, sampled, mirror, frames, [frame async for frame in dropped]
+
+        terrain, days, dropped, sampled, mirror, frames, dropped_frames = asyncio.run(scenario())
+
+        self.assertEqual(20, days)
+        self.assertTrue(dropped.dropped)
+        self.assertEqual([], dropped_frames)
+        self.assertFalse(sampled.dropped)
+        self.assertGreater(sampled.skipped, 0)
+        self.assertTrue(any(delta.keyframe for delta in frames[1:]))
+        self.assertEqual(terrain.day, mirror.day)
+        self.assertEqual(terrain_state(terrain), mirror_state(mirror))
+
+        with self.assertRaises(ValueError):
+            TickDeltaPublisher(terrain).subscribe(policy='block')
+
+    @skipIf(not hasattr(asyncio, 'start_unix_server'), 'Unix sockets are not available')
+    def test_socket_subscriber(self):
+        async def scenario(path):
+            terrain = make_terrain()
+            terrain.fill_with_animals()
+            publisher = TickDeltaPublisher(terrain)
+            server = await publisher.serve(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            while not publisher.subscribers:
+                await asyncio.sleep(0)
+            await publisher.run(8)
+            publisher.close()
+            mirror = DeltaMirror()
+            frames = [mirror.apply(frame) async for frame in read_frames(reader)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return terrain, mirror, frames
+
+        with tempfile.TemporaryDirectory() as directory:
+            terrain, mirror, frames = asyncio.run(scenario(os.path.join(directory, 'ticks.sock')))
+
+        self.assertTrue(frames[0].keyframe)
+        self.assertEqual(list(range(1, 9)), [delta.day for delta in frames[1:]])
+        self.assertEqual(terrain_state(terrain), mirror_state(mirror))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import io
+from unittest import TestCase, main
+
+from project.__main__ import main as cli_main
+from project.animal.carnivore import Carnivore
+from project.animal.herbivore import Herbivore
+from project.animal.scavenger import Scavenger
+from project.profiling.tick_profiler import TickProfiler
+from project.terrain import Terrain
+from project.terrain_cell.grass import Grass
+
+
+class TickProfilerTests(TestCase):
+    def test_tick_profiler_counts_items_per_phase(self):
+        terrain = Terrain(1, 2, 4, profiler=TickProfiler())
+        terrain.terrain_map = [[Grass('GRASS'), Grass('GRASS')], ]
+        herbivore = Herbivore()
+        carnivore = Carnivore()
+        scavenger = Scavenger()
+        full = Scavenger()
+        for animal in (herbivore, carnivore, scavenger):
+            animal.hunger_rate = 3
+        terrain.animals_locations = {herbivore: (0, 0), carnivore: (0, 0), scavenger: (0, 1), full: (0, 1)}
+
+        terrain.activate_animals()
+        tick = terrain.profiler.ticks[-1]
+
+        self.assertEqual(1, tick.day)
+        self.assertEqual(1, tick.items['herbivore_feeding'])
+        self.assertEqual(1, tick.items['predation'])
+        self.assertEqual(1, tick.items['scavenging'])
+        self.assertEqual(1, tick.items['digestion'])
+        self.assertEqual(3, tick.items['movement'])
+        self.assertEqual(1, tick.items['removal'])
+        self.assertEqual(1, tick.items['carcasses'])
+
+    def test_tick_profiler_phase_times_add_up_to_the_tick(self):
+        terrain = Terrain(20, 20, 400, seed=4, profiler=TickProfiler())
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 4
+
+        for day in range(5):
+            terrain.activate_animals()
+
+        totals = terrain.profiler.totals()
+        self.assertEqual(5, totals['ticks'])
+        self.assertTrue(all(seconds >= 0 for seconds in totals['seconds'].values()))
+        self.assertLessEqual(sum(totals['seconds'].values()), totals['total_seconds'])
+        self.assertGreater(sum(totals['seconds'].values()), totals['total_seconds'] * 0.5)
+
+    def test_tick_profiler_keeps_at_most_max_ticks(self):
+        terrain = Terrain(3, 3, 10, seed=1, profiler=TickProfiler(max_ticks=2))
+        terrain.create_terrain()
+        terrain.fill_with_animals()
+
+        for day in range(4):
+            terrain.activate_animals()
+
+        self.assertEqual([3, 4], [tick.day for tick in terrain.profiler.ticks])
+
+    def test_tick_profiler_summary_table_lists_every_phase(self):
+        profiler = TickProfiler()
+        profiler.start_tick(1)
+        profiler.enter('movement', 3)
+        profiler.enter('commit')
+        profiler.end_tick()
+
+        table = profiler.summary_table().splitlines()
+
+        self.assertEqual(['phase', 'total', 'ms', 'ms/tick', 'share', 'items', 'ns/item'], table[0].split())
+        self.assertEqual(len(TickProfiler.phases) + 2, len(table))
+        self.assertEqual('3', table[1 + TickProfiler.phases.index('movement')].split()[4])
+
+    def test_cli_profile_prints_the_summary_table(self):
+        stderr = io.StringIO()
+        cli_main(['--days', '3', '--seed', '2', '--profile'], stdout=io.StringIO(), stderr=stderr)
+
+        self.assertIn('predation', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    main()
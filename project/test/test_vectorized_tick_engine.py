@@ -0,0 +1,124 @@
+import random
+import time
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from project.terrain import Terrain
+
+
+@skipIf(np is None, 'numpy is not installed')
+class VectorizedTickEngineTests(TestCase):
+    def make_terrain(self, seed, x, y, animals_count, grid_mode=False, carcass_store=None):
+        terrain = Terrain(x, y, animals_count, carcass_store=carcass_store, seed=seed)
+
+        terrain.create_terrain(grid_mode=grid_mode)
+        # Some of the tiny maps are all water; drowning on spawn also puts carcasses in the comparison.
+        terrain.fill_with_animals(drown_on_spawn=True)
+
+        return terrain
+
+    def assert_same_outcome(self, terrain, animals, engine):
+        from project.columnar.columnar_population import ColumnarPopulation
+
+        population = engine.population
+
+        self.assertEqual(terrain.dead_animals_count, engine.dead_animals_count)
+        self.assertEqual(terrain.all_animals_dead, engine.all_animals_dead)
+        self.assertEqual(terrain.stats(), engine.stats())
+
+        for i, animal in enumerate(animals):
+            if animal in terrain.animals_locations:
+                self.assertEqual(ColumnarPopulation.ALIVE, population.status[i])
+                self.assertEqual(animal.hunger_rate, population.hunger[i])
+                self.assertEqual(terrain.animals_locations[animal], (population.rows[i], population.cols[i]))
+            elif animal in terrain.carcass_store:
+                self.assertEqual(ColumnarPopulation.DEAD, population.status[i])
+                self.assertEqual(terrain.carcass_store.position_of(animal), (population.rows[i], population.cols[i]))
+            else:
+                self.assertIn(population.status[i], (ColumnarPopulation.EATEN, ColumnarPopulation.DECOMPOSED))
+
+    def test_vectorized_tick_engine_matches_activate_animals_for_fixed_seed(self):
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+
+        from project.core.carcass_store import CarcassStore
+
+        for seed, (x, y, animals_count) in enumerate([(1, 1, 8), (3, 7, 40), (6, 5, 120)] * 10):
+            carcass_store = CarcassStore(ttl=seed % 4 if seed % 2 else None,
+                                         max_carcasses=seed % 7 if seed % 3 == 0 else None)
+            terrain = self.make_terrain(seed, x, y, animals_count, carcass_store=carcass_store)
+
+            # Mix hunger rates so feeding, predation, scavenging and movement all happen early.
+            hunger_rates = random.Random(seed)
+            for animal in terrain.animals_locations:
+                animal.hunger_rate = hunger_rates.randint(1, 7)
+
+            animals = list(terrain.animals_locations) + list(terrain.carcass_store)
+            engine = VectorizedTickEngine.from_terrain(terrain)
+
+            for day in range(12):
+                terrain.activate_animals()
+                engine.tick()
+
+                self.assert_same_outcome(terrain, animals, engine)
+
+    def test_vectorized_tick_engine_border_keeps_animal_in_place(self):
+        from project.columnar.columnar_population import ColumnarPopulation
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+        from project.grid.terrain_grid import TerrainGrid
+
+        grid = TerrainGrid(np.full((1, 1), TerrainGrid.cell_codes['GRASS'], dtype=np.uint8))
+        population = ColumnarPopulation.empty(1)
+        population.species[0] = ColumnarPopulation.SCAVENGER
+        population.hunger[0] = 3
+
+        VectorizedTickEngine(population, grid).tick()
+
+        self.assertEqual((0, 0), (population.rows[0], population.cols[0]))
+        self.assertEqual(2, population.hunger[0])
+
+    def test_vectorized_tick_engine_animal_dies_when_stepping_on_water(self):
+        from project.columnar.columnar_population import ColumnarPopulation
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+        from project.grid.terrain_grid import TerrainGrid
+
+        cells = np.full((1, 2), TerrainGrid.cell_codes['WATER'], dtype=np.uint8)
+        cells[0, 0] = TerrainGrid.cell_codes['DESERT']
+        population = ColumnarPopulation.empty(1)
+        population.species[0] = ColumnarPopulation.CARNIVORE
+        population.hunger[0] = 3
+
+        engine = VectorizedTickEngine(population, TerrainGrid(cells), direction_source=lambda count: np.full(count, 4))
+        engine.tick()
+
+        self.assertEqual((0, 1), (population.rows[0], population.cols[0]))
+        self.assertEqual(ColumnarPopulation.DEAD, population.status[0])
+        self.assertEqual(1, engine.dead_animals_count)
+
+    def test_vectorized_tick_engine_is_much_faster_than_activate_animals(self):
+        from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+
+        terrain = self.make_terrain(1, 300, 300, 100000, grid_mode=True)
+
+        for animal in terrain.animals_locations:
+            animal.hunger_rate = 4
+
+        engine = VectorizedTickEngine.from_terrain(terrain)
+
+        start = time.perf_counter()
+        engine.tick()
+        vectorized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        terrain.activate_animals()
+        objects = time.perf_counter() - start
+
+        # ~10x at 100k and ~13x at one million animals; keep a margin for noisy machines.
+        self.assertGreater(objects / vectorized, 5)
+
+
+if __name__ == '__main__':
+    main()
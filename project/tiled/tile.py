@@ -0,0 +1,97 @@
+from collections import namedtuple
+
+import numpy as np
+
+from project.columnar.columnar_population import ColumnarPopulation
+from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+from project.grid.terrain_grid import TerrainGrid
+
+# Animals leaving a tile (global coordinates) plus the tile's counters after the day.
+TileReport = namedtuple('TileReport', ['emigrants', 'emigrant_ids', 'alive', 'dead', 'eaten', 'carcasses'])
+
+
+class Tile:
+    """One rectangle of the world, ticked by its own VectorizedTickEngine.
+
+    The engine's grid is the tile plus a one-cell halo of the neighbouring
+    tiles' terrain, clipped at the world border. Animals start every day
+    inside the tile, and move at most one cell per day. So a step over the
+    boundary lands in the halo, where it can drown on the right terrain,
+    while the world border still blocks as usual. After the tick, every
+    present animal in the halo (alive or a fresh carcass) is handed back as
+    an emigrant.
+
+    ``ids`` are the animals' indices in the original population. The tile
+    keeps its animals sorted by id. Within one cell they are then processed
+    in the same order as in a single-engine run.
+    """
+
+    def __init__(self, bounds, grid, population, ids, rng=None, direction_source=None, carcass_ttl=None, day=0):
+        self.bounds = bounds
+        row_start, row_stop, col_start, col_stop = bounds
+        self.halo_origin = (max(row_start - 1, 0), max(col_start - 1, 0))
+        halo_row_stop = min(row_stop + 1, grid.x)
+        halo_col_stop = min(col_stop + 1, grid.y)
+
+        halo_grid = TerrainGrid(np.ascontiguousarray(grid.cells[self.halo_origin[0]:halo_row_stop,
+                                                                self.halo_origin[1]:halo_col_stop]))
+        self.ids = ids
+        self.engine = VectorizedTickEngine(self._to_local(population), halo_grid, rng, direction_source, carcass_ttl,
+                                           day)
+
+    def _to_local(self, population):
+        population.rows -= self.halo_origin[0]
+        population.cols -= self.halo_origin[1]
+        return population
+
+    def _to_global(self, population):
+        population.rows += self.halo_origin[0]
+        population.cols += self.halo_origin[1]
+        return population
+
+    def step(self, day, immigrants=None, immigrant_ids=None):
+        """Take in ``immigrants``, tick ``day``, and return a TileReport with this day's emigrants."""
+        engine = self.engine
+
+        if immigrants is not None and len(immigrants):
+            population = ColumnarPopulation.concatenate((engine.population, self._to_local(immigrants)))
+            ids = np.concatenate((self.ids, immigrant_ids))
+            order = np.argsort(ids, kind='stable')
+            engine.population = population.take(order)
+            self.ids = ids[order]
+
+        population = engine.population
+        alive = population.status == ColumnarPopulation.ALIVE
+        engine.alive_counts = np.bincount(population.species[alive], minlength=4)
+
+        engine.day = day - 1
+        if engine.alive_counts.any():
+            engine.tick()
+        else:
+            # Nothing alive here, but carcasses age exactly as in a single-engine run.
+            engine.day = day
+            engine.expire_carcasses()
+
+        report_counts = (engine.alive_counts.copy(), engine.dead_counts.copy(), engine.eaten_counts.copy(),
+                         population.count(ColumnarPopulation.DEAD))
+
+        row_start, row_stop, col_start, col_stop = self.bounds
+        origin_row, origin_col = self.halo_origin
+        rows = population.rows + origin_row
+        cols = population.cols + origin_col
+        present = population.status <= ColumnarPopulation.DEAD
+        inside = (rows >= row_start) & (rows < row_stop) & (cols >= col_start) & (cols < col_stop)
+
+        leaving = np.flatnonzero(present & ~inside)
+        staying = np.flatnonzero(present & inside)
+        emigrants = self._to_global(population.take(leaving))
+        emigrant_ids = self.ids[leaving]
+        engine.population = population.take(staying)
+        self.ids = self.ids[staying]
+
+        return TileReport(emigrants, emigrant_ids, *report_counts)
+
+    def snapshot(self):
+        """The tile's present animals in global coordinates, with their ids."""
+        population = self.engine.population
+        return self._to_global(population.take(np.arange(len(population)))), self.ids.copy()
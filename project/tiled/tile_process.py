@@ -0,0 +1,66 @@
+from multiprocessing import Pipe, Process
+
+
+def serve_tile(connection, tile):
+    """Worker loop: answer ``step`` and ``snapshot`` requests for one tile until ``stop``."""
+    while True:
+        request = connection.recv()
+        command = request[0]
+        if command == 'step':
+            connection.send(tile.step(*request[1:]))
+        elif command == 'snapshot':
+            connection.send(tile.snapshot())
+        else:
+            break
+    connection.close()
+
+
+class TileProcess:
+    """A Tile living in its own worker process, driven over a pipe.
+
+    ``send_step`` and ``receive`` are split so the coordinator can start
+    every tile on a day before waiting for any of them.
+    """
+
+    def __init__(self, tile):
+        self.connection, worker_connection = Pipe()
+        self.process = Process(target=serve_tile, args=(worker_connection, tile), daemon=True)
+        self.process.start()
+        worker_connection.close()
+
+    def send_step(self, day, immigrants=None, immigrant_ids=None):
+        self.connection.send(('step', day, immigrants, immigrant_ids))
+
+    def receive(self):
+        return self.connection.recv()
+
+    def snapshot(self):
+        self.connection.send(('snapshot',))
+        return self.connection.recv()
+
+    def close(self):
+        if self.process.is_alive():
+            self.connection.send(('stop',))
+            self.process.join()
+        self.connection.close()
+
+
+class LocalTile:
+    """Same interface as TileProcess, but runs the tile in this process."""
+
+    def __init__(self, tile):
+        self.tile = tile
+        self.report = None
+
+    def send_step(self, day, immigrants=None, immigrant_ids=None):
+        self.report = self.tile.step(day, immigrants, immigrant_ids)
+
+    def receive(self):
+        report, self.report = self.report, None
+        return report
+
+    def snapshot(self):
+        return self.tile.snapshot()
+
+    def close(self):
+        pass
@@ -0,0 +1,145 @@
+import numpy as np
+
+from project.columnar.columnar_population import ColumnarPopulation
+from project.columnar.vectorized_tick_engine import VectorizedTickEngine
+from project.core.simulation_random import SimulationRandom
+from project.tiled.tile import Tile
+from project.tiled.tile_process import LocalTile, TileProcess
+
+
+def tile_edges(size, count):
+    return np.array([size * i // count for i in range(count + 1)], dtype=np.int64)
+
+
+class TiledSimulation:
+    """One world split into a grid of tiles, each ticked by its own worker process.
+
+    Within one day cells never affect each other, because every lookup uses
+    start-of-day positions. So tiles can tick the same day independently.
+    At the end of the day each tile returns the animals that stepped into
+    its halo. The coordinator routes them to the tile that owns their new
+    cell, and they join it before the next day.
+
+    With a ``direction_source`` that does not depend on animal order,
+    results are identical to a single VectorizedTickEngine run. With random
+    directions each tile draws from its own stream (seeded from ``seed``
+    and the tile index). The run is then statistically equivalent to a
+    single-process one, and reproducible for a fixed seed and tiling.
+    ``processes=False`` runs the tiles in this process, with the same
+    results.
+    """
+
+    def __init__(self, population, grid, tiles=(2, 2), seed=None, direction_source=None, carcass_ttl=None, day=0,
+                 counts=None, processes=True):
+        self.grid = grid
+        self.day = day
+        self.all_animals_dead = False
+        self.tile_rows, self.tile_cols = tiles
+        self.row_edges = tile_edges(grid.x, self.tile_rows)
+        self.col_edges = tile_edges(grid.y, self.tile_cols)
+
+        # Counters carried over from before the split (decomposed carcasses are no longer in the population).
+        recount = VectorizedTickEngine.count_population(population)
+        if counts is None:
+            counts = recount
+        self.dead_offset = counts[1] - recount[1]
+        self.eaten_offset = counts[2] - recount[2]
+        self.alive_counts = np.array(counts[0])
+        self.dead_counts = np.array(counts[1])
+        self.eaten_counts = np.array(counts[2])
+        self.carcasses = population.count(ColumnarPopulation.DEAD)
+
+        tile_of_animal = self.tile_of(population.rows, population.cols)
+        order = np.argsort(tile_of_animal, kind='stable')
+        starts = np.searchsorted(tile_of_animal[order], np.arange(self.tile_rows * self.tile_cols + 1))
+
+        self.tiles = []
+        for index in range(self.tile_rows * self.tile_cols):
+            tile_row, tile_col = divmod(index, self.tile_cols)
+            bounds = (int(self.row_edges[tile_row]), int(self.row_edges[tile_row + 1]),
+                      int(self.col_edges[tile_col]), int(self.col_edges[tile_col + 1]))
+            members = order[starts[index]:starts[index + 1]]
+            rng = SimulationRandom(None if seed is None else f'{seed}/{index}')
+            tile = Tile(bounds, grid, population.take(members), members, rng, direction_source, carcass_ttl, day)
+            self.tiles.append(TileProcess(tile) if processes else LocalTile(tile))
+
+        self.immigrants = [(None, None)] * len(self.tiles)
+
+    @classmethod
+    def from_terrain(cls, terrain, tiles=(2, 2), seed=None, direction_source=None, processes=True):
+        # Each tile only sees its own carcasses, so it cannot tell which are the oldest of the whole world.
+        if terrain.carcass_store.max_carcasses is not None:
+            raise ValueError('max_carcasses caps the whole world, so a tiled run cannot apply it')
+
+        return cls(ColumnarPopulation.from_terrain(terrain), terrain.to_grid(), tiles, seed, direction_source,
+                   terrain.carcass_store.ttl, terrain.day, VectorizedTickEngine.counts_from_counters(terrain.counters),
+                   processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for tile in self.tiles:
+            tile.close()
+
+    def tile_of(self, rows, cols):
+        tile_rows = np.searchsorted(self.row_edges, rows, side='right') - 1
+        tile_cols = np.searchsorted(self.col_edges, cols, side='right') - 1
+        return tile_rows * self.tile_cols + tile_cols
+
+    @property
+    def dead_animals_count(self):
+        return int(self.dead_counts.sum())
+
+    def tick(self):
+        if not self.alive_counts.any():
+            self.all_animals_dead = True
+            return
+
+        self.day += 1
+        for tile, (immigrants, immigrant_ids) in zip(self.tiles, self.immigrants):
+            tile.send_step(self.day, immigrants, immigrant_ids)
+        reports = [tile.receive() for tile in self.tiles]
+
+        self.alive_counts = sum(report.alive for report in reports)
+        self.dead_counts = sum(report.dead for report in reports) + self.dead_offset
+        self.eaten_counts = sum(report.eaten for report in reports) + self.eaten_offset
+        self.carcasses = sum(report.carcasses for report in reports)
+        self.immigrants = self._route([report.emigrants for report in reports],
+                                      [report.emigrant_ids for report in reports])
+
+    def _route(self, emigrants, emigrant_ids):
+        emigrants = ColumnarPopulation.concatenate(emigrants)
+        emigrant_ids = np.concatenate(emigrant_ids)
+        destinations = self.tile_of(emigrants.rows, emigrants.cols)
+
+        routed = []
+        for index in range(len(self.tiles)):
+            members = np.flatnonzero(destinations == index)
+            routed.append((emigrants.take(members), emigrant_ids[members]) if len(members) else (None, None))
+        return routed
+
+    def snapshot(self):
+        """Every present animal in global coordinates, sorted by its index in the original population."""
+        parts = [tile.snapshot() for tile in self.tiles]
+        parts += [pending for pending in self.immigrants if pending[0] is not None]
+        population = ColumnarPopulation.concatenate([part[0] for part in parts])
+        ids = np.concatenate([part[1] for part in parts])
+        order = np.argsort(ids)
+        return population.take(order), ids[order]
+
+    def stats(self):
+        species_codes = ColumnarPopulation.species_codes
+        return {
+            'day': self.day,
+            'alive': {animal_type: int(self.alive_counts[code]) for animal_type, code in species_codes.items()},
+            'dead': {animal_type: int(self.dead_counts[code]) for animal_type, code in species_codes.items()},
+            'eaten': {animal_type: int(self.eaten_counts[code]) for animal_type, code in species_codes.items()},
+            'alive_total': int(self.alive_counts.sum()),
+            'dead_total': int(self.dead_counts.sum()),
+            'eaten_total': int(self.eaten_counts.sum()),
+            'carcasses': self.carcasses,
+        }